@@ -4,51 +4,101 @@ CDK application for deploying Amazon Connect flows.
 """
 import os
 import logging
+from pathlib import Path
 
-import aws_cdk as cdk
-
-from stacks import ConnectFlowStack
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-app = cdk.App()
-
-# Get environment from context or default to 'dev'
-environment = app.node.try_get_context("environment") or os.getenv("ENVIRONMENT", "dev")
-
-# Get AWS account and region
-account = os.getenv('CDK_DEFAULT_ACCOUNT')
-region = os.getenv('CDK_DEFAULT_REGION', 'us-east-1')
-
-logger.info(f"Deploying to environment: {environment}")
-logger.info(f"Account: {account}, Region: {region}")
-
-# Define CDK environment
-env = cdk.Environment(account=account, region=region)
 
-# Sales flows stack
-sales_stack = ConnectFlowStack(
-    app,
-    f"SalesFlowsStack-{environment}",
-    environment=environment,
-    config_filename="sales_flows_config.json",
-    env=env,
-    description=f"Amazon Connect Sales flows for {environment} environment"
-)
+def main() -> None:
+    """Build and synthesize the CDK app."""
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    # aws_cdk loads every service module and starts the jsii runtime; import
+    # it here so tools can import this module without paying for that
+    import aws_cdk as cdk
+    
+    from stacks import ConnectFlowStack
+    from utils.connect_flows.discovery import CONFIG_SUFFIX, load_configs, lob_name, resolve_environments, stack_id
+    from utils.connect_flows.flow_cache import get_flow_cache
+    from utils.connect_flows.incremental import (
+        MANIFEST_FILENAME,
+        RELEVANT_CONTEXT_KEYS,
+        diff_stacks,
+        fingerprint_environment,
+        load_manifest
+    )
+    
+    app = cdk.App()
+    
+    project_root = Path(__file__).parent
+    
+    # Get environments from context: 'environments' (e.g. dev,prod or all)
+    # synthesizes several in one pass, otherwise 'environment' or 'dev'
+    config_root = project_root / 'config' / 'connect_flows'
+    selection = app.node.try_get_context("environments")
+    if selection:
+        environments = resolve_environments(selection, config_root)
+    else:
+        environments = [app.node.try_get_context("environment") or os.getenv("ENVIRONMENT", "dev")]
+    
+    # Get AWS account and region
+    account = os.getenv('CDK_DEFAULT_ACCOUNT')
+    region = os.getenv('CDK_DEFAULT_REGION', 'us-east-1')
+    
+    logger.info(f"Deploying to environments: {', '.join(environments)}")
+    logger.info(f"Account: {account}, Region: {region}")
+    
+    # Define CDK environment
+    env = cdk.Environment(account=account, region=region)
+    
+    # With onlyChanged, stacks whose hash matches the manifest of the last
+    # deploy are left out of the app, so `cdk deploy --all` skips them
+    only_changed = str(app.node.try_get_context("onlyChanged")).lower() == 'true'
+    if only_changed:
+        manifest_path = Path(app.node.try_get_context("flowManifest") or project_root / MANIFEST_FILENAME)
+        recorded = load_manifest(manifest_path)
+        context = {key: app.node.try_get_context(key) for key in RELEVANT_CONTEXT_KEYS}
+    
+    # One stack per <lob>_flows_config.json and environment. Stacks never
+    # reference each other, so `cdk deploy --all --concurrency N` deploys
+    # them in parallel. Parsed and rendered flows are cached per process,
+    # so environments sharing a flow and its updates render it once.
+    for environment in environments:
+        config_dir = config_root / environment
+        configs = load_configs(config_dir)
+        
+        if not configs:
+            raise FileNotFoundError(f"No *{CONFIG_SUFFIX} files found in {config_dir}")
+        
+        if only_changed:
+            current = fingerprint_environment(project_root, environment, context, configs)
+            changed = diff_stacks(current, recorded)
+            logger.info(f"{environment}: {len(changed)} of {len(current)} stacks changed")
+            configs = {
+                config_filename: config for config_filename, config in configs.items()
+                if stack_id(config_filename, environment) in changed
+            }
+        
+        for config_filename, config in configs.items():
+            ConnectFlowStack(
+                app,
+                stack_id(config_filename, environment),
+                environment=environment,
+                config_filename=config_filename,
+                config=config,
+                env=env,
+                description=f"Amazon Connect {lob_name(config_filename)} flows for {environment} environment"
+            )
+    
+    flow_cache_stats = get_flow_cache().stats()
+    logger.info(f"Flow cache: {flow_cache_stats['hits']} hits, {flow_cache_stats['misses']} misses")
+    
+    app.synth()
 
-# Support flows stack
-support_stack = ConnectFlowStack(
-    app,
-    f"SupportFlowsStack-{environment}",
-    environment=environment,
-    config_filename="support_flows_config.json",
-    env=env,
-    description=f"Amazon Connect Support flows for {environment} environment"
-)
 
-app.synth()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Performance benchmarks for Amazon Connect flow utilities."""
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark FlowParameterUpdater.update_multiple_blocks on synthetic flows.
+
+Block and update counts grow together, so a linear implementation keeps the
+time per block roughly constant while a quadratic one grows with the size.
+
+Usage:
+    python benchmarks/bench_flow_updater.py [--sizes 1000 10000 20000] [--update-ratio 0.1]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import generate_flow, generate_updates  # noqa: E402
+from utils.connect_flows.flow_updater import FlowParameterUpdater  # noqa: E402
+
+
+def time_updates(block_count: int, update_count: int, repeat: int) -> float:
+    """Return the best wall-clock time of update_multiple_blocks over `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        flow = generate_flow(block_count)
+        updates = generate_updates(block_count, update_count)
+        start = time.perf_counter()
+        FlowParameterUpdater(flow).update_multiple_blocks(updates)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and print a scaling table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000, 10000, 20000, 40000])
+    parser.add_argument('--update-ratio', type=float, default=0.1,
+                        help="Number of updates as a fraction of the block count")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    
+    logging.disable(logging.CRITICAL)
+    
+    print(f"{'blocks':>8} {'updates':>8} {'seconds':>10} {'us/block':>10}")
+    baseline = None
+    for size in args.sizes:
+        update_count = max(int(size * args.update_ratio), 1)
+        elapsed = time_updates(size, update_count, args.repeat)
+        per_block = elapsed / size * 1e6
+        baseline = baseline or per_block
+        print(f"{size:>8} {update_count:>8} {elapsed:>10.4f} {per_block:>10.3f}  ({per_block / baseline:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Compare flow content serialization: legacy json.dumps vs the canonical backends.
+
+Usage:
+    python benchmarks/bench_serialization.py [--blocks 2000] [--depth 2] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import generate_flow  # noqa: E402
+from utils.connect_flows import serialization  # noqa: E402
+
+
+def best_time(func: Callable[[], str], repeat: int) -> float:
+    """Return the best wall-clock time of func over `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def with_backend(backend: str, content: Dict[str, Any]) -> Callable[[], str]:
+    """Build a callable serializing content with a forced canonical backend."""
+    def run() -> str:
+        os.environ[serialization.BACKEND_ENV_VAR] = backend
+        return serialization.dumps_flow(content)
+    return run
+
+
+def main() -> None:
+    """Run the benchmark and print size and time per serializer."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blocks', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+    
+    content = generate_flow(args.blocks, args.depth)
+    serializers = {
+        'legacy json.dumps': lambda: json.dumps(content),
+        'canonical stdlib': with_backend('stdlib', content)
+    }
+    if serialization.orjson is not None:
+        serializers['canonical orjson'] = with_backend('orjson', content)
+    
+    legacy_size = len(json.dumps(content).encode('utf-8'))
+    legacy_time = best_time(serializers['legacy json.dumps'], args.repeat)
+    
+    print(f"{args.blocks} blocks, parameter depth {args.depth}\n")
+    print(f"{'serializer':<20} {'bytes':>10} {'size':>7} {'ms':>9} {'speed':>7}")
+    for name, func in serializers.items():
+        size = len(func().encode('utf-8'))
+        elapsed = best_time(func, args.repeat)
+        print(f"{name:<20} {size:>10} {size / legacy_size:>6.0%} {elapsed * 1000:>9.2f} "
+              f"{legacy_time / elapsed:>6.2f}x")
+
+
+if __name__ == '__main__':
+    main()
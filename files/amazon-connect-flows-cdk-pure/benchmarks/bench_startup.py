@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark app.py startup: import time and synth wall-clock.
+
+Runs `python -X importtime app.py` to break down where import time goes,
+then times full synths of the app into a temporary output directory.
+
+Usage:
+    python benchmarks/bench_startup.py [--env dev] [--repeat 3] [--top 15]
+    python benchmarks/bench_startup.py --forbid boto3 --max-import-ms 8000 --max-synth-s 20
+
+Exits non-zero when a forbidden module is imported during synth or a budget
+is exceeded, so import-time regressions can be caught in CI.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# A fixed instance ARN keeps the ListInstances lookup out of the measurement
+INSTANCE_ARN = 'arn:aws:connect:us-east-1:123456789012:instance/benchmark'
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def run_app(environment: str, importtime: bool) -> Tuple[float, str]:
+    """
+    Run app.py once in a fresh interpreter.
+    
+    Args:
+        environment: Environment passed through CDK context
+        importtime: Whether to run with -X importtime
+    
+    Returns:
+        Tuple of wall-clock seconds and captured stderr
+    
+    Raises:
+        RuntimeError: If the app exits with an error
+    """
+    command = [sys.executable]
+    if importtime:
+        command += ['-X', 'importtime']
+    command.append(str(PROJECT_ROOT / 'app.py'))
+    
+    with tempfile.TemporaryDirectory() as outdir:
+        env = dict(
+            os.environ,
+            CDK_OUTDIR=outdir,
+            CDK_CONTEXT_JSON=json.dumps({'environment': environment, 'connectInstanceArn': INSTANCE_ARN})
+        )
+        start = time.perf_counter()
+        result = subprocess.run(command, cwd=PROJECT_ROOT, env=env, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+    
+    if result.returncode != 0:
+        raise RuntimeError(f"app.py failed with exit code {result.returncode}:\n{result.stderr[-2000:]}")
+    
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Parse -X importtime output.
+    
+    Args:
+        stderr: Captured stderr of a -X importtime run
+    
+    Returns:
+        List of modules with self and cumulative import time in microseconds
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                'module': module,
+                'self_us': int(self_us),
+                'cumulative_us': int(cumulative_us),
+                'top_level': len(indent) == 1
+            })
+    return modules
+
+
+def main() -> None:
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--env', default='dev', help="Environment to synthesize")
+    parser.add_argument('--repeat', type=int, default=3, help="Number of timed synth runs")
+    parser.add_argument('--top', type=int, default=15, help="Number of slowest imports to show")
+    parser.add_argument('--forbid', nargs='*', default=[], help="Modules that must not be imported")
+    parser.add_argument('--max-import-ms', type=float, help="Budget for total import time")
+    parser.add_argument('--max-synth-s', type=float, help="Budget for the best synth wall-clock time")
+    parser.add_argument('--json', type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+    
+    _, stderr = run_app(args.env, importtime=True)
+    modules = parse_importtime(stderr)
+    total_import_ms = sum(module['cumulative_us'] for module in modules if module['top_level']) / 1000
+    
+    print(f"Total import time: {total_import_ms:.0f} ms ({len(modules)} modules)\n")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for module in sorted(modules, key=lambda m: m['cumulative_us'], reverse=True)[:args.top]:
+        print(f"{module['cumulative_us'] / 1000:>14.1f} {module['self_us'] / 1000:>9.1f}  {module['module']}")
+    
+    synth_times = [run_app(args.env, importtime=False)[0] for _ in range(args.repeat)]
+    print(f"\nSynth wall-clock over {args.repeat} runs: "
+          f"best {min(synth_times):.2f}s, worst {max(synth_times):.2f}s")
+    
+    imported = {module['module'] for module in modules}
+    failures = [
+        f"forbidden module imported: {name}"
+        for name in args.forbid
+        if name in imported or any(module.startswith(f"{name}.") for module in imported)
+    ]
+    if args.max_import_ms is not None and total_import_ms > args.max_import_ms:
+        failures.append(f"import time {total_import_ms:.0f} ms exceeds budget of {args.max_import_ms:.0f} ms")
+    if args.max_synth_s is not None and min(synth_times) > args.max_synth_s:
+        failures.append(f"synth time {min(synth_times):.2f}s exceeds budget of {args.max_synth_s:.2f}s")
+    
+    if args.json:
+        args.json.write_text(json.dumps({
+            'environment': args.env,
+            'total_import_ms': total_import_ms,
+            'synth_seconds': synth_times,
+            'slowest_imports': sorted(modules, key=lambda m: m['cumulative_us'], reverse=True)[:args.top],
+            'failures': failures
+        }, indent=2))
+    
+    if failures:
+        print()
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the flow utilities.
+
+Measures ConfigurationLoader.load_config, FlowParameterUpdater.update_multiple_blocks,
+FlowParameterUpdater.get_content_json, FlowRenderer.render_flow and, when aws_cdk is
+installed, ConnectFlowStack.create_flow on synthetic flows and configs.
+
+Usage:
+    python benchmarks/run.py                                 # Default size profile
+    python benchmarks/run.py --blocks 10000 --updates 1000 --depth 3
+    python benchmarks/run.py --save benchmarks/baseline.json # Record a baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json --threshold 1.5
+
+--compare exits non-zero when any case's median is slower than the baseline
+by more than the threshold factor. Baselines are only meaningful on the same
+machine, so record one before a change and compare after it.
+"""
+import argparse
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import SYNTH_CONTEXT, generate_flow, generate_project, generate_updates  # noqa: E402
+from utils.connect_flows.config_loader import ConfigurationLoader  # noqa: E402
+from utils.connect_flows.flow_cache import FlowCache  # noqa: E402
+from utils.connect_flows.flow_updater import FlowParameterUpdater  # noqa: E402
+from utils.connect_flows.render import FlowRenderer  # noqa: E402
+
+
+def measure(func: Callable[[Any], Any], setup: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    """
+    Time func(setup()) for a number of rounds, excluding setup time.
+    
+    Args:
+        func: Function to benchmark, called with the result of setup
+        setup: Function producing fresh input for each round
+        rounds: Number of timed rounds
+    
+    Returns:
+        Dictionary with min, median and mean time in milliseconds
+    """
+    timings = []
+    for _ in range(rounds):
+        arg = setup()
+        start = time.perf_counter()
+        func(arg)
+        timings.append((time.perf_counter() - start) * 1000)
+    
+    return {
+        'min_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'mean_ms': statistics.mean(timings),
+        'rounds': rounds
+    }
+
+
+def case_name(name: str, **params: Any) -> str:
+    """Build a stable case name from a benchmark name and its parameters."""
+    return f"{name}[{','.join(f'{key}={value}' for key, value in params.items())}]"
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: Path) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark case and return results keyed by case name."""
+    results: Dict[str, Dict[str, float]] = {}
+    
+    flow_json = json.dumps(generate_flow(args.blocks, args.depth))
+    updates = generate_updates(args.blocks, args.updates)
+    
+    # ConfigurationLoader.load_config
+    generate_project(
+        workdir,
+        config_count=args.configs,
+        flows_per_config=args.flows_per_config,
+        block_count=args.blocks,
+        update_count=args.updates,
+        nesting_depth=args.depth
+    )
+    config_dir = workdir / 'config' / 'connect_flows' / 'dev'
+    config_filenames = sorted(path.name for path in config_dir.glob('*.json'))
+    loader = ConfigurationLoader(config_dir)
+    
+    def load_configs(_: Any) -> None:
+        for config_filename in config_filenames:
+            loader.load_config(config_filename)
+    
+    results[case_name('load_config', configs=args.configs, flows=args.flows_per_config, updates=args.updates)] = \
+        measure(load_configs, lambda: None, args.rounds)
+    
+    # FlowParameterUpdater.update_multiple_blocks
+    results[case_name('update_multiple_blocks', blocks=args.blocks, updates=args.updates, depth=args.depth)] = measure(
+        lambda flow: FlowParameterUpdater(flow).update_multiple_blocks(updates),
+        lambda: json.loads(flow_json),
+        args.rounds
+    )
+    
+    # FlowParameterUpdater.get_content_json
+    results[case_name('get_content_json', blocks=args.blocks, depth=args.depth)] = measure(
+        lambda updater: updater.get_content_json(),
+        lambda: FlowParameterUpdater(json.loads(flow_json)).update_multiple_blocks(updates),
+        args.rounds
+    )
+    
+    # FlowRenderer.render_flow with a cold parsed-flow cache and no render cache
+    flow_config = loader.load_config(config_filenames[0])['flows'][0]
+    results[case_name('render_flow', blocks=args.blocks, updates=args.updates, depth=args.depth)] = measure(
+        lambda renderer: renderer.render_flow(flow_config),
+        lambda: FlowRenderer(workdir / 'flows', flow_cache=FlowCache()),
+        args.rounds
+    )
+    
+    create_flow = benchmark_create_flow(workdir, flow_config, args.rounds)
+    if create_flow is not None:
+        results[case_name('create_flow', blocks=args.blocks, updates=args.updates, depth=args.depth)] = create_flow
+    
+    return results
+
+
+def benchmark_create_flow(workdir: Path, flow_config: Dict[str, Any], rounds: int) -> Optional[Dict[str, float]]:
+    """
+    Time ConnectFlowStack.create_flow, including construct creation.
+    
+    Returns:
+        Timing results, or None if aws_cdk is not installed
+    """
+    try:
+        import aws_cdk as cdk
+        from stacks.connect_flow_stack import ConnectFlowStack
+    except ImportError:
+        print("aws_cdk not installed, skipping create_flow")
+        return None
+    
+    app = cdk.App(context=dict(SYNTH_CONTEXT))
+    stack = ConnectFlowStack(
+        app,
+        'BenchFlowsStack-dev',
+        environment='dev',
+        config_filename=sorted(path.name for path in (workdir / 'config' / 'connect_flows' / 'dev').glob('*.json'))[0],
+        project_root=workdir
+    )
+    counter = iter(range(sys.maxsize))
+    
+    def setup() -> Dict[str, Any]:
+        # Fresh construct IDs and a cold parsed-flow cache for every round
+        stack.renderer.flow_cache = FlowCache()
+        return dict(flow_config, name=f"{flow_config['name']}Bench{next(counter)}")
+    
+    return measure(stack.create_flow, setup, rounds)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Compare results with a baseline and print the ratios.
+    
+    Returns:
+        Descriptions of the cases that regressed beyond the threshold
+    """
+    regressions = []
+    print(f"\n{'case':<70} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    
+    for name, current in results.items():
+        previous = baseline['results'].get(name)
+        if previous is None:
+            print(f"{name:<70} {'-':>12} {current['median_ms']:>12.3f} {'new':>7}")
+            continue
+        
+        ratio = current['median_ms'] / previous['median_ms'] if previous['median_ms'] else float('inf')
+        flag = '  ❌' if ratio > threshold else ''
+        print(f"{name:<70} {previous['median_ms']:>12.3f} {current['median_ms']:>12.3f} {ratio:>6.2f}x{flag}")
+        
+        if ratio > threshold:
+            regressions.append(f"{name}: {ratio:.2f}x slower than baseline")
+    
+    return regressions
+
+
+def git_revision() -> Optional[str]:
+    """Get the current git commit, if available."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--blocks', type=int, default=2000, help="Blocks per flow")
+    parser.add_argument('--updates', type=int, default=200, help="Parameter updates per flow")
+    parser.add_argument('--depth', type=int, default=2, help="Nesting depth of block parameters")
+    parser.add_argument('--configs', type=int, default=10, help="Number of config files")
+    parser.add_argument('--flows-per-config', type=int, default=20, help="Flows per config file")
+    parser.add_argument('--rounds', type=int, default=7, help="Timed rounds per case")
+    parser.add_argument('--save', type=Path, help="Write results to this JSON file")
+    parser.add_argument('--compare', type=Path, help="Compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=1.5, help="Allowed slowdown factor for --compare")
+    args = parser.parse_args()
+    
+    logging.disable(logging.CRITICAL)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_benchmarks(args, Path(tmp))
+    
+    print(f"{'case':<70} {'min ms':>10} {'median ms':>10} {'mean ms':>10}")
+    for name, result in results.items():
+        print(f"{name:<70} {result['min_ms']:>10.3f} {result['median_ms']:>10.3f} {result['mean_ms']:>10.3f}")
+    
+    if args.save:
+        args.save.write_text(json.dumps({
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results
+        }, indent=2) + '\n')
+        print(f"\nSaved results to {args.save}")
+    
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print()
+            for regression in regressions:
+                print(f"❌ {regression}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+End-to-end synth scaling harness for ConnectFlowStack.
+
+Each step generates a synthetic project with STACKS config files of FLOWS
+flows each, and synthesizes every stack with aws_cdk.assertions.Template in a
+fresh interpreter. For each step it records:
+wall-clock time, peak RSS of the Python process, total and largest template
+size, and the largest resource and output counts of a single stack. Counts
+are also checked against CloudFormation limits.
+
+A metric grows superlinearly when its marginal cost per flow in the last
+interval exceeds its marginal cost in the first interval by more than the
+budget factor. Marginal costs ignore fixed startup overhead such as jsii.
+
+Usage:
+    python benchmarks/synth_scaling.py                              # 1x50 1x100 1x250 1x500
+    python benchmarks/synth_scaling.py --steps 6x100 12x100 24x100
+    python benchmarks/synth_scaling.py --budget seconds=2.0 --budget template_bytes=1.1
+    python benchmarks/synth_scaling.py --enforce-limits --json scaling.json
+
+Peak RSS covers the Python process only; the jsii Node runtime runs in a
+separate process.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic import SYNTH_CONTEXT, generate_project  # noqa: E402
+from utils.connect_flows.discovery import stack_id  # noqa: E402
+
+# CloudFormation quotas per template
+CFN_LIMITS = {
+    'max_template_bytes': 1024 * 1024,
+    'max_resources': 500,
+    'max_outputs': 200
+}
+
+# Allowed growth of the marginal cost per flow, last interval vs first interval
+DEFAULT_BUDGETS = {
+    'seconds': 1.5,
+    'peak_rss_kb': 1.5,
+    'template_bytes': 1.25,
+    'max_resources': 1.25,
+    'max_outputs': 1.25
+}
+
+
+def synth_step(stacks: int, flows: int, blocks: int, updates: int) -> Dict[str, Any]:
+    """
+    Generate a project and synthesize all of its stacks in this process.
+    
+    Returns:
+        Metrics for the step
+    """
+    import aws_cdk as cdk
+    from aws_cdk.assertions import Template
+    from stacks.connect_flow_stack import ConnectFlowStack
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        project_root = Path(tmp)
+        config_filenames = generate_project(
+            project_root,
+            config_count=stacks,
+            flows_per_config=flows,
+            block_count=blocks,
+            update_count=updates
+        )
+        
+        start = time.perf_counter()
+        app = cdk.App(context=dict(SYNTH_CONTEXT))
+        templates = []
+        for config_filename in config_filenames:
+            stack = ConnectFlowStack(
+                app,
+                stack_id(config_filename, 'dev'),
+                environment='dev',
+                config_filename=config_filename,
+                project_root=project_root
+            )
+            templates.append(Template.from_stack(stack).to_json())
+        seconds = time.perf_counter() - start
+    
+    sizes = [len(json.dumps(template).encode('utf-8')) for template in templates]
+    
+    return {
+        'stacks': stacks,
+        'flows_per_stack': flows,
+        'total_flows': stacks * flows,
+        'seconds': seconds,
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'template_bytes': sum(sizes),
+        'max_template_bytes': max(sizes),
+        'max_resources': max(len(template.get('Resources', {})) for template in templates),
+        'max_outputs': max(len(template.get('Outputs', {})) for template in templates)
+    }
+
+
+def run_step(stacks: int, flows: int, blocks: int, updates: int) -> Dict[str, Any]:
+    """Run one step in a fresh interpreter so peak RSS is measured per step."""
+    command = [
+        sys.executable, __file__, '--worker',
+        '--steps', f"{stacks}x{flows}",
+        '--blocks', str(blocks),
+        '--updates', str(updates)
+    ]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Step {stacks}x{flows} failed:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def check_growth(steps: List[Dict[str, Any]], budgets: Dict[str, float]) -> List[str]:
+    """
+    Check that no metric's marginal cost per flow grows beyond its budget.
+    
+    Returns:
+        Descriptions of the metrics that grew superlinearly
+    
+    Raises:
+        ValueError: If the total flow counts of the steps don't strictly increase
+    """
+    totals = [step['total_flows'] for step in steps]
+    if any(second <= first for first, second in zip(totals, totals[1:])):
+        raise ValueError(f"Step flow totals must strictly increase, got {totals}")
+    if len(steps) < 3:
+        return []
+    
+    def marginal(metric: str, first: Dict[str, Any], second: Dict[str, Any]) -> float:
+        return (second[metric] - first[metric]) / (second['total_flows'] - first['total_flows'])
+    
+    failures = []
+    for metric, budget in budgets.items():
+        first_interval = marginal(metric, steps[0], steps[1])
+        last_interval = marginal(metric, steps[-2], steps[-1])
+        # A flat or shrinking first interval gives no baseline to compare against
+        if first_interval <= 0:
+            continue
+        growth = last_interval / first_interval
+        if growth > budget:
+            failures.append(
+                f"{metric}: marginal cost per flow grew {growth:.2f}x "
+                f"({first_interval:.4g} -> {last_interval:.4g}), budget {budget:.2f}x"
+            )
+    return failures
+
+
+def check_limits(steps: List[Dict[str, Any]]) -> List[str]:
+    """
+    Check every step against CloudFormation template limits.
+    
+    Returns:
+        Descriptions of the exceeded limits
+    """
+    exceeded = []
+    for step in steps:
+        for metric, limit in CFN_LIMITS.items():
+            if step[metric] > limit:
+                exceeded.append(f"{step['stacks']}x{step['flows_per_stack']}: {metric} {step[metric]} > {limit}")
+    return exceeded
+
+
+def parse_step(value: str) -> Tuple[int, int]:
+    """Parse a STACKSxFLOWS step."""
+    try:
+        stacks, flows = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid step '{value}', expected STACKSxFLOWS")
+    if stacks <= 0 or flows <= 0:
+        raise argparse.ArgumentTypeError(f"Invalid step '{value}', stacks and flows must be positive")
+    return stacks, flows
+
+
+def parse_budget(value: str) -> Tuple[str, float]:
+    """Parse a METRIC=FACTOR budget."""
+    metric, _, factor = value.partition('=')
+    if metric not in DEFAULT_BUDGETS:
+        raise argparse.ArgumentTypeError(f"Unknown metric '{metric}', expected one of {', '.join(DEFAULT_BUDGETS)}")
+    try:
+        return metric, float(factor)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid budget '{value}', expected METRIC=FACTOR")
+
+
+def main() -> None:
+    """Run the scaling harness."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--steps', type=parse_step, nargs='+', default=[(1, 50), (1, 100), (1, 250), (1, 500)],
+                        help="Steps as STACKSxFLOWS, in increasing size")
+    parser.add_argument('--blocks', type=int, default=20, help="Blocks per flow")
+    parser.add_argument('--updates', type=int, default=2, help="Parameter updates per flow")
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[],
+                        help="Override a growth budget, e.g. seconds=2.0")
+    parser.add_argument('--enforce-limits', action='store_true', help="Fail when a CloudFormation limit is exceeded")
+    parser.add_argument('--json', type=Path, help="Write results to this JSON file")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        stacks, flows = args.steps[0]
+        print(json.dumps(synth_step(stacks, flows, args.blocks, args.updates)))
+        return
+    
+    totals = [stacks * flows for stacks, flows in args.steps]
+    if any(second <= first for first, second in zip(totals, totals[1:])):
+        parser.error(f"steps must have strictly increasing total flows, got {', '.join(map(str, totals))}")
+    
+    budgets = dict(DEFAULT_BUDGETS, **dict(args.budget))
+    
+    print(f"{'step':>10} {'flows':>7} {'seconds':>9} {'rss MB':>8} {'tmpl KB':>9} "
+          f"{'max KB':>8} {'resources':>10} {'outputs':>8}")
+    steps = []
+    for stacks, flows in args.steps:
+        step = run_step(stacks, flows, args.blocks, args.updates)
+        steps.append(step)
+        print(f"{stacks:>4}x{flows:<5} {step['total_flows']:>7} {step['seconds']:>9.2f} "
+              f"{step['peak_rss_kb'] / 1024:>8.1f} {step['template_bytes'] / 1024:>9.1f} "
+              f"{step['max_template_bytes'] / 1024:>8.1f} {step['max_resources']:>10} {step['max_outputs']:>8}")
+    
+    growth_failures = check_growth(steps, budgets)
+    exceeded = check_limits(steps)
+    
+    for limit in exceeded:
+        print(f"⚠️  CloudFormation limit exceeded: {limit}")
+    for failure in growth_failures:
+        print(f"❌ Superlinear growth: {failure}")
+    
+    if args.json:
+        args.json.write_text(json.dumps({
+            'steps': steps,
+            'budgets': budgets,
+            'growth_failures': growth_failures,
+            'limits_exceeded': exceeded
+        }, indent=2))
+    
+    if growth_failures or (args.enforce_limits and exceeded):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Synthetic flow and configuration generator for benchmarks.
+"""
+import json
+from pathlib import Path
+from typing import Dict, Any, List
+
+# CDK context for benchmark apps: no render cache, and a fixed instance ARN
+# instead of a ListInstances lookup
+SYNTH_CONTEXT = {
+    'flowCache': 'false',
+    'connectInstanceArn': 'arn:aws:connect:us-east-1:123456789012:instance/benchmark'
+}
+
+
+def generate_parameters(idx: int, nesting_depth: int) -> Dict[str, Any]:
+    """
+    Generate block parameters nested nesting_depth levels deep.
+    
+    Args:
+        idx: Block index, used to vary values
+        nesting_depth: Number of nested dictionary levels below Parameters
+    
+    Returns:
+        Parameters dictionary
+    """
+    parameters: Dict[str, Any] = {"Text": f"Message {idx}"}
+    level = parameters
+    for depth in range(nesting_depth):
+        child: Dict[str, Any] = {"Value": f"{idx}-{depth}", "Items": [depth, idx]}
+        level["Nested"] = child
+        level = child
+    return parameters
+
+
+def generate_flow(block_count: int, nesting_depth: int = 0) -> Dict[str, Any]:
+    """
+    Generate a linear flow with designer metadata.
+    
+    Args:
+        block_count: Number of actions in the flow
+        nesting_depth: Nesting depth of each action's parameters
+    
+    Returns:
+        Flow content dictionary
+    """
+    actions: List[Dict[str, Any]] = []
+    action_metadata: Dict[str, Any] = {}
+    
+    for idx in range(block_count):
+        identifier = f"block-{idx}"
+        transitions: Dict[str, Any] = {"Errors": [], "Conditions": []}
+        if idx + 1 < block_count:
+            transitions["NextAction"] = f"block-{idx + 1}"
+        
+        actions.append({
+            "Identifier": identifier,
+            "Type": "MessageParticipant",
+            "Parameters": generate_parameters(idx, nesting_depth),
+            "Transitions": transitions
+        })
+        action_metadata[identifier] = {"position": {"x": 100 + 200 * (idx % 10), "y": 100 * (idx // 10)}}
+    
+    return {
+        "Version": "2019-10-30",
+        "StartAction": "block-0",
+        "Metadata": {
+            "entryPointPosition": {"x": 20, "y": 20},
+            "snapToGrid": False,
+            "ActionMetadata": action_metadata
+        },
+        "Actions": actions
+    }
+
+
+def generate_updates(block_count: int, update_count: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate parameter updates spread evenly across a generated flow.
+    
+    Args:
+        block_count: Number of actions in the flow
+        update_count: Number of blocks to update
+    
+    Returns:
+        Parameter updates keyed by block identifier
+    """
+    update_count = min(update_count, block_count)
+    if update_count <= 0:
+        return {}
+    
+    step = max(block_count // update_count, 1)
+    identifiers = [f"block-{idx}" for idx in range(block_count - 1, -1, -step)][:update_count]
+    return {identifier: {"Text": f"$.Attributes.{identifier.replace('-', '')}"} for identifier in identifiers}
+
+
+def generate_project(
+    root: Path,
+    environment: str = 'dev',
+    config_count: int = 1,
+    flows_per_config: int = 3,
+    block_count: int = 50,
+    update_count: int = 5,
+    nesting_depth: int = 0
+) -> List[str]:
+    """
+    Write a synthetic flows/ and config/connect_flows/<environment>/ tree.
+    
+    Every config references its own flow files, so configs are independent.
+    
+    Args:
+        root: Project root to write into
+        environment: Environment directory name
+        config_count: Number of *_flows_config.json files
+        flows_per_config: Number of flows in each config
+        block_count: Number of actions in each flow
+        update_count: Number of parameter updates per flow
+        nesting_depth: Nesting depth of action parameters
+    
+    Returns:
+        Names of the generated config files
+    """
+    config_dir = root / 'config' / 'connect_flows' / environment
+    config_dir.mkdir(parents=True, exist_ok=True)
+    
+    flow_json = json.dumps(generate_flow(block_count, nesting_depth), indent=2)
+    updates = generate_updates(block_count, update_count)
+    config_filenames = []
+    
+    for config_idx in range(config_count):
+        lob = f"lob{config_idx}"
+        flows_dir = root / 'flows' / lob
+        flows_dir.mkdir(parents=True, exist_ok=True)
+        flows = []
+        
+        for flow_idx in range(flows_per_config):
+            filename = f"{lob}/flow_{flow_idx}.json"
+            (root / 'flows' / filename).write_text(flow_json)
+            flow_config: Dict[str, Any] = {
+                "filename": filename,
+                "name": f"Lob{config_idx}Flow{flow_idx}",
+                "type": "CONTACT_FLOW",
+                "description": f"Synthetic flow {flow_idx} of {lob}"
+            }
+            if updates:
+                flow_config["parameter_updates"] = updates
+            flows.append(flow_config)
+        
+        config_filename = f"{lob}_flows_config.json"
+        (config_dir / config_filename).write_text(json.dumps({
+            "instance_name": f"{environment}-connect-instance",
+            "flows": flows
+        }, indent=2))
+        config_filenames.append(config_filename)
+    
+    return config_filenames
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Validate all configuration and flow files in one run.
+
+Each file is parsed once. Config entries are also checked against the flow
+files that exist. Unchanged files are skipped using the cached results of
+the previous run.
+
+Usage:
+    python scripts/validate.py [--workers 4] [--format json|junit] [--output report.xml]
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.connect_flows.validation import main  # noqa: E402
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,9 @@ setup(
         "constructs>=10.0.0,<11.0.0",
         "boto3>=1.34.0",
     ],
+    extras_require={
+        "fast": ["orjson>=3.8.0"],
+    },
     python_requires=">=3.8",
     classifiers=[
         "Development Status :: 4 - Beta",
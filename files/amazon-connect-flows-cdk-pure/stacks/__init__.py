@@ -1,4 +1,12 @@
 """CDK Stacks for Amazon Connect Flows."""
-from .connect_flow_stack import ConnectFlowStack
+from typing import Any
 
 __all__ = ['ConnectFlowStack']
+
+
+def __getattr__(name: str) -> Any:
+    """Import stacks on first use, so importing the package does not load aws_cdk."""
+    if name == 'ConnectFlowStack':
+        from .connect_flow_stack import ConnectFlowStack
+        return ConnectFlowStack
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,28 +1,35 @@
 """
 CDK Stack for deploying Amazon Connect flows.
 """
-import json
 import logging
+import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
-import boto3
 from aws_cdk import (
+    NestedStack,
     Stack,
+    Token,
     aws_connect as connect,
     CfnOutput,
     Tags
 )
 from constructs import Construct
 
-from utils.connect_flows.flow_updater import FlowParameterUpdater
 from utils.connect_flows.config_loader import ConfigurationLoader
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+from utils.connect_flows.flow_cache import get_flow_cache
+from utils.connect_flows.render import FlowRenderer
+from utils.connect_flows.render_cache import DEFAULT_CACHE_DIRNAME, RenderCache, get_render_cache
+from utils.connect_flows.resources import get_resource_resolver
+from utils.connect_flows.settings import CONTEXT_KEYS, instance_name, render_options, resolve_instance_arn
+from utils.connect_flows.sharding import (
+    DEFAULT_FLOWS_PER_SHARD,
+    DEFAULT_SHARD_BYTES,
+    check_template_limits,
+    estimate_flow_bytes,
+    plan_shards
 )
+
 logger = logging.getLogger(__name__)
 
 
@@ -38,6 +45,8 @@ class ConnectFlowStack(Stack):
         construct_id: str,
         environment: str,
         config_filename: str,
+        project_root: Optional[Path] = None,
+        config: Optional[Dict[str, Any]] = None,
         **kwargs
     ) -> None:
         """
@@ -48,14 +57,17 @@ class ConnectFlowStack(Stack):
             construct_id: Unique identifier for this stack
             environment: Environment name (dev, staging, prod)
             config_filename: Name of the configuration file
+            project_root: Directory containing flows/ and config/ (defaults to this project)
+            config: Already loaded and validated configuration (loaded from config_filename if None)
             **kwargs: Additional stack arguments
         """
         super().__init__(scope, construct_id, **kwargs)
         
-        self.environment = environment
+        # Stack.environment is a read-only CDK property, so keep the name separately
+        self.environment_name = environment
         
         # Get project root directory
-        project_root = Path(__file__).parent.parent
+        project_root = project_root or Path(__file__).parent.parent
         
         # Define directory paths
         self.flows_dir = project_root / 'flows'
@@ -67,10 +79,23 @@ class ConnectFlowStack(Stack):
         
         # Load configuration
         self.config_loader = ConfigurationLoader(self.config_dir)
-        self.load_configuration()
+        self.load_configuration(config)
+        
+        # Flows are rendered by the CDK-independent engine; parsed flow files
+        # are shared with every other stack in the process
+        self.render_cache = self._get_render_cache(project_root)
+        self.renderer = FlowRenderer(
+            self.flows_dir,
+            flow_cache=get_flow_cache(),
+            render_cache=self.render_cache,
+            **self.render_options
+        )
         
         # Lookup instance ARN from instance name
-        self.lookup_instance_arn()
+        self.lookup_instance_arn(project_root)
+        
+        # Replace {"ref": "queue:Name"} style references with ARNs
+        self.resolve_resource_refs()
         
         # Add stack tags
         self._add_stack_tags()
@@ -91,26 +116,60 @@ class ConnectFlowStack(Stack):
         if not self.config_dir.exists():
             raise FileNotFoundError(f"Config directory not found: {self.config_dir}")
     
+    def _get_render_cache(self, project_root: Path) -> Optional[RenderCache]:
+        """
+        Get the on-disk render cache unless it is disabled.
+        
+        The cache lives in <project_root>/.flowcache by default. Set the
+        'flowCacheDir' context value to move it, or 'flowCache' to false to
+        disable it.
+        
+        Args:
+            project_root: Project root directory
+        
+        Returns:
+            The shared RenderCache, or None if caching is disabled
+        """
+        enabled = self.node.try_get_context("flowCache")
+        if str(enabled).lower() == 'false':
+            return None
+        
+        cache_dir = self.node.try_get_context("flowCacheDir") or project_root / DEFAULT_CACHE_DIRNAME
+        return get_render_cache(Path(cache_dir))
+    
     def _add_stack_tags(self) -> None:
         """Add tags to all resources in the stack."""
-        Tags.of(self).add("Environment", self.environment)
+        Tags.of(self).add("Environment", self.environment_name)
         Tags.of(self).add("ManagedBy", "CDK")
         Tags.of(self).add("Application", "AmazonConnect")
     
-    def load_configuration(self) -> None:
+    def load_configuration(self, config: Optional[Dict[str, Any]] = None) -> None:
         """
         Load flow configuration from the specified config file.
+        
+        Args:
+            config: Already loaded and validated configuration (loaded from config_filename if None)
         """
         try:
-            config = self.config_loader.load_config(self.config_filename)
+            if config is None:
+                config = self.config_loader.load_config(self.config_filename)
             
             # Extract configuration values
             self.instance_name = config.get('instance_name')
             self.queue_arn = config.get('queue_arn')
             self.flow_configs = config.get('flows', [])
             
+            # Post-processing: flow setting, then config file, then environment context
+            # (shared with fast deploy and drift detection, see utils.connect_flows.settings)
+            self.config = config
+            self.context = {key: self.node.try_get_context(key) for key in CONTEXT_KEYS}
+            self.render_options = render_options(config, self.context)
+            self.strip_metadata = self.render_options['strip_metadata']
+            self.prune_orphan_metadata = self.render_options['prune_orphan_metadata']
+            self.prune_unreachable = self.render_options['prune_unreachable']
+            
             # Allow CDK context to override configuration file values
-            self.instance_name = self.node.try_get_context("connectInstanceName") or self.instance_name
+            self.instance_name = instance_name(config, self.context)
             self.queue_arn = self.node.try_get_context("queueArn") or self.queue_arn
             
             logger.info(f"Loaded configuration for {len(self.flow_configs)} flows from {self.config_filename}")
@@ -119,21 +178,38 @@ class ConnectFlowStack(Stack):
             logger.error(f"Failed to load configuration: {str(e)}")
             raise
     
-    def lookup_instance_arn(self) -> None:
+    def lookup_instance_arn(self, project_root: Optional[Path] = None) -> None:
         """
         Lookup the Connect instance ARN using the instance alias/name.
         
-        In production, this should use boto3 to lookup the actual instance ID.
-        For now, we construct the ARN using the instance alias.
+        The 'connectInstanceArn' context value is used as-is when set.
+        Otherwise the alias is resolved with ListInstances in the stack's
+        region; results are cached for the process and on disk in
+        <flowCacheDir>/instances.json for 'instanceCacheTtl' seconds
+        (default one day, 0 to always call the API).
+        
+        Args:
+            project_root: Project root directory holding the cache directory
+        
+        Raises:
+            ValueError: If the stack has no explicit region and no ARN override,
+                or no instance has the alias
         """
         try:
-            # TODO: In production, use boto3 to lookup actual instance ID
-            # connect_client = boto3.client('connect', region_name=self.region)
-            # response = connect_client.list_instances()
-            # Find instance by alias and get actual instance ID
+            if not self.context.get("connectInstanceArn") and Token.is_unresolved(self.region):
+                raise ValueError(
+                    "Cannot look up the Connect instance of an environment-agnostic stack; "
+                    "pass a region in env or set the 'connectInstanceArn' context value"
+                )
             
-            # For now, construct ARN using instance alias
-            self.instance_arn = f"arn:aws:connect:{self.region}:{self.account}:instance/{self.instance_name}"
+            account = None if Token.is_unresolved(self.account) else self.account
+            self.instance_arn = resolve_instance_arn(
+                project_root or Path(__file__).parent.parent,
+                self.config,
+                self.context,
+                None if Token.is_unresolved(self.region) else self.region,
+                account
+            )
             
             logger.info(f"Using Connect instance ARN: {self.instance_arn}")
             
@@ -141,17 +217,171 @@ class ConnectFlowStack(Stack):
             logger.error(f"Failed to lookup instance ARN: {str(e)}")
             raise
     
+    def resolve_resource_refs(self) -> None:
+        """
+        Replace symbolic resource references in parameter_updates with ARNs.
+        
+        References are resolved in the stack's instance with one list sweep
+        per resource type, shared by every stack in the app (see
+        utils.connect_flows.resources). Flows without references are unchanged.
+        
+        Raises:
+            ValueError: If a reference is invalid or names no existing resource
+        """
+        resolver = get_resource_resolver()
+        
+        try:
+            self.flow_configs = [
+                dict(
+                    flow_config,
+                    parameter_updates=resolver.resolve(flow_config['parameter_updates'], self.instance_arn)
+                ) if flow_config.get('parameter_updates') else flow_config
+                for flow_config in self.flow_configs
+            ]
+        except Exception as e:
+            logger.error(f"Failed to resolve resource references: {str(e)}")
+            raise
+    
+    def _get_flow_workers(self) -> int:
+        """
+        Get the number of worker threads used to prepare flows.
+        
+        Read from the 'flowWorkers' context value, then the
+        CONNECT_FLOWS_WORKERS environment variable. Defaults to 1, which
+        prepares flows sequentially.
+        
+        Returns:
+            Number of workers (at least 1)
+        
+        Raises:
+            ValueError: If the configured value is not a positive integer
+        """
+        value = self.node.try_get_context("flowWorkers")
+        if value is None:
+            value = os.getenv("CONNECT_FLOWS_WORKERS")
+        if value is None:
+            value = 1
+        
+        try:
+            workers = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid flow worker count: {value}")
+        
+        if workers < 1:
+            raise ValueError(f"Flow worker count must be at least 1, got {workers}")
+        
+        return workers
+    
+    def _get_sharding(self) -> Optional[Dict[str, int]]:
+        """
+        Get the sharding settings from CDK context.
+        
+        'flowSharding' is 'off' (default) or 'nested'. With 'nested', flows
+        are hashed by name into 'flowShardCount' nested stacks, and shards
+        over 'flowShardBytes' estimated template bytes or 'flowsPerShard'
+        flows are reported.
+        
+        The shard count has no default: it decides where every flow lives, so
+        it must be chosen once, in cdk.json, before the stack is first
+        deployed. Sharding a stack that is already deployed unsharded (or
+        changing the count) would recreate its flows under new logical IDs,
+        which Connect rejects as duplicate names.
+        
+        Returns:
+            Dictionary with 'shard_count', 'max_bytes' and 'max_flows', or
+            None if sharding is off
+        
+        Raises:
+            ValueError: If the sharding mode is unknown, or flowShardCount is
+                missing or not a positive integer
+        """
+        mode = str(self.node.try_get_context("flowSharding") or 'off').lower()
+        
+        if mode == 'off':
+            return None
+        if mode != 'nested':
+            raise ValueError(f"Invalid flowSharding '{mode}'. Must be one of: off, nested")
+        
+        shard_count = self.node.try_get_context("flowShardCount")
+        if shard_count is None:
+            raise ValueError(
+                "flowSharding=nested needs a flowShardCount context value, set once in cdk.json. "
+                "Only shard stacks that are not deployed yet: sharding a deployed stack replaces its flows"
+            )
+        
+        max_bytes = self.node.try_get_context("flowShardBytes")
+        max_flows = self.node.try_get_context("flowsPerShard")
+        try:
+            return {
+                'shard_count': int(shard_count),
+                'max_bytes': DEFAULT_SHARD_BYTES if max_bytes is None else int(max_bytes),
+                'max_flows': DEFAULT_FLOWS_PER_SHARD if max_flows is None else int(max_flows)
+            }
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid sharding settings: {shard_count}, {max_bytes}, {max_flows}")
+    
     def create_all_flows(self) -> None:
         """
         Create all flows based on configuration.
         Flows with parameter_updates will be updated, others loaded directly.
+        
+        Flow content is rendered by FlowRenderer, on a thread pool when more
+        than one worker is configured. Constructs are always created on the
+        calling thread, in configuration order, because jsii objects are not
+        thread-safe.
+        
+        With sharding enabled, every flow is rendered first so the shards can
+        be checked against the template limits before nested stacks are created.
+        """
+        sharding = self._get_sharding()
+        sizes = []
+        rendered = []
+        
+        created = 0
+        try:
+            for config, flow in self.renderer.render_all(self.flow_configs, self._get_flow_workers()):
+                sizes.append({
+                    'name': config['name'],
+                    'bytes': estimate_flow_bytes(flow['content']),
+                    'shard': config.get('shard')
+                })
+                if sharding:
+                    rendered.append((config, flow['content']))
+                else:
+                    self._create_flow_resources(config, flow['content'])
+                created += 1
+        except Exception as e:
+            config = self.flow_configs[created]
+            logger.error(f"Error creating flow {config.get('name', 'Unknown')}: {str(e)}")
+            raise
+        
+        if sharding:
+            self._create_sharded_flows(rendered, plan_shards(sizes, **sharding))
+        else:
+            for limit in check_template_limits(sizes):
+                logger.warning(f"Stack {self.stack_name}: {limit}; set the flowSharding=nested context to shard flows")
+        
+        if self.render_cache:
+            logger.info(f"Render cache: {self.render_cache.hits} hits, {self.render_cache.misses} misses")
+    
+    def _create_sharded_flows(self, rendered: List[Tuple[Dict[str, Any], str]], shards: List[List[str]]) -> None:
+        """
+        Create flows inside one nested stack per shard.
+        
+        Args:
+            rendered: (flow configuration, rendered content) pairs in configuration order
+            shards: Flow names per shard index from plan_shards
         """
-        for config in self.flow_configs:
-            try:
-                self.create_flow(config)
-            except Exception as e:
-                logger.error(f"Error creating flow {config.get('name', 'Unknown')}: {str(e)}")
-                raise
+        shard_of = {name: index for index, names in enumerate(shards) for name in names}
+        scopes: Dict[int, NestedStack] = {}
+        
+        for config, content in rendered:
+            index = shard_of[config['name']]
+            if index not in scopes:
+                scopes[index] = NestedStack(self, f"FlowShard{index}")
+            self._create_flow_resources(config, content, scopes[index])
+        
+        logger.info(f"Sharded {len(rendered)} flows into {len(scopes)} nested stacks")
     
     def create_flow(self, config: Dict[str, Any]) -> connect.CfnContactFlow:
         """
@@ -167,45 +397,49 @@ class ConnectFlowStack(Stack):
             FileNotFoundError: If flow file doesn't exist
             Exception: If flow creation fails
         """
-        # Load flow content
-        flow_path = self.flows_dir / config['filename']
+        return self._create_flow_resources(config, self.prepare_flow(config))
+    
+    def prepare_flow(self, config: Dict[str, Any]) -> str:
+        """
+        Render the content of a flow without creating any constructs.
         
-        if not flow_path.exists():
-            raise FileNotFoundError(f"Flow file not found: {flow_path}")
+        Only touches files and the shared caches, so it is safe to call from
+        worker threads.
         
-        logger.info(f"Loading flow from {flow_path}")
+        Args:
+            config: Flow configuration dictionary
         
-        with open(flow_path, 'r') as f:
-            flow_content = json.load(f)
+        Returns:
+            Rendered flow content as a JSON string
         
-        # Check if this flow needs parameter updates
-        if 'parameter_updates' in config and config['parameter_updates']:
-            # Use parameter updates directly (all values are contact attributes)
-            parameter_updates = config['parameter_updates']
-            
-            # Update parameters
-            updater = FlowParameterUpdater(flow_content)
-            updater.update_multiple_blocks(parameter_updates)
-            
-            # Validate
-            validation = updater.validate_updates()
-            logger.info(f"✓ {config['name']}: Updated {validation['updated_blocks']} blocks")
-            
-            if validation['failed_updates'] > 0:
-                logger.warning(
-                    f"Failed to update {validation['failed_updates']} blocks in {config['name']}"
-                )
-                logger.warning(f"Failed identifiers: {validation['failed_identifiers']}")
-            
-            flow_content_json = updater.get_content_json()
-        else:
-            # No updates needed, use flow as-is
-            flow_content_json = json.dumps(flow_content)
-            logger.info(f"✓ {config['name']}: Loaded directly without updates")
+        Raises:
+            FileNotFoundError: If flow file doesn't exist
+        """
+        content: str = self.renderer.render_flow(config)['content']
+        return content
+    
+    def _create_flow_resources(
+        self,
+        config: Dict[str, Any],
+        flow_content_json: str,
+        scope: Optional[Construct] = None
+    ) -> connect.CfnContactFlow:
+        """
+        Create the contact flow and its ARN output.
+        
+        Args:
+            config: Flow configuration dictionary
+            flow_content_json: Rendered flow content from prepare_flow
+            scope: Construct to create the resources in (default: this stack)
+        
+        Returns:
+            Created CfnContactFlow
+        """
+        scope = scope or self
         
         # Create the contact flow
         flow = connect.CfnContactFlow(
-            self,
+            scope,
             config['name'],
             instance_arn=self.instance_arn,
             name=config['name'],
@@ -216,7 +450,7 @@ class ConnectFlowStack(Stack):
             tags=[
                 {
                     'key': 'Environment',
-                    'value': self.environment
+                    'value': self.environment_name
                 },
                 {
                     'key': 'FlowType',
@@ -227,7 +461,7 @@ class ConnectFlowStack(Stack):
         
         # Create output
         CfnOutput(
-            self,
+            scope,
             f"{config['name']}Arn",
             value=flow.attr_contact_flow_arn,
             description=f"ARN of {config['name']}",
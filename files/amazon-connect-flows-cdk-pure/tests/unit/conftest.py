@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the unit tests.
+"""
+import json
+import pytest
+
+
+@pytest.fixture
+def make_project(tmp_path):
+    """
+    Build a project tree in tmp_path.
+    
+    Call it with 'flows', flow file paths relative to flows/ mapped to their
+    content, and 'configs', '<env>/<lob>' mapped to the contents of
+    config/connect_flows/<env>/<lob>_flows_config.json. Strings are written
+    as-is and anything else as JSON. Returns the project root.
+    """
+    def make(flows=None, configs=None):
+        files = {tmp_path / "flows" / filename: content for filename, content in (flows or {}).items()}
+        for name, config in (configs or {}).items():
+            environment, lob = name.split("/")
+            files[tmp_path / "config" / "connect_flows" / environment / f"{lob}_flows_config.json"] = config
+        for path, content in files.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content if isinstance(content, str) else json.dumps(content))
+        return tmp_path
+    
+    return make
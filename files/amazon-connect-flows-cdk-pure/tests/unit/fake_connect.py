@@ -0,0 +1,111 @@
+"""
+In-memory stand-in for the Amazon Connect contact flow APIs.
+"""
+import threading
+from botocore.exceptions import ClientError
+from utils.connect_flows.connect_api import RateLimitedCaller, TokenBucket
+
+ACCOUNT = "123456789012"
+REGION = "eu-west-2"
+INSTANCE_ID = "11111111-1111-1111-1111-111111111111"
+INSTANCE_ARN = f"arn:aws:connect:{REGION}:{ACCOUNT}:instance/{INSTANCE_ID}"
+
+SUMMARY_KEYS = {
+    "list_contact_flows": "ContactFlowSummaryList",
+    "list_queues": "QueueSummaryList",
+    "list_prompts": "PromptSummaryList",
+    "list_hours_of_operations": "HoursOfOperationSummaryList"
+}
+
+
+class FakeConnect:
+    """
+    Connect client holding contact flows in memory.
+    
+    The first 'throttle' calls other than list calls fail with a
+    ThrottlingException. Every call is recorded in 'calls'.
+    """
+    
+    def __init__(self, flows=None, page_size=2, throttle=0):
+        self.flows = {}
+        self.page_size = page_size
+        self.throttle = throttle
+        self.calls = []
+        self.throttled = 0
+        self._lock = threading.Lock()
+        for name, (flow_type, content) in (flows or {}).items():
+            self.add_flow(name, flow_type, content)
+    
+    def add_flow(self, name, flow_type, content):
+        """Create a flow and return its ID."""
+        flow_id = f"flow-{len(self.flows) + 1}"
+        self.flows[flow_id] = {
+            "Id": flow_id,
+            "Arn": f"{INSTANCE_ARN}/contact-flow/{flow_id}",
+            "Name": name,
+            "Type": flow_type,
+            "State": "ACTIVE",
+            "Status": "PUBLISHED",
+            "Content": content
+        }
+        return flow_id
+    
+    def _record(self, operation, instance_id):
+        with self._lock:
+            self.calls.append(operation)
+            if instance_id != INSTANCE_ID:
+                raise ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "No instance"}}, operation)
+            if not operation.startswith("list_") and self.throttle:
+                self.throttle -= 1
+                self.throttled += 1
+                raise ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, operation)
+    
+    def _flow(self, operation, flow_id):
+        if flow_id not in self.flows:
+            raise ClientError({"Error": {"Code": "ResourceNotFoundException", "Message": "No flow"}}, operation)
+        return self.flows[flow_id]
+    
+    def get_paginator(self, operation):
+        return FakePaginator(self, operation)
+    
+    def update_contact_flow_content(self, InstanceId, ContactFlowId, Content):
+        self._record("update_contact_flow_content", InstanceId)
+        self._flow("update_contact_flow_content", ContactFlowId)["Content"] = Content
+        return {}
+    
+    def describe_contact_flow(self, InstanceId, ContactFlowId):
+        self._record("describe_contact_flow", InstanceId)
+        return {"ContactFlow": dict(self._flow("describe_contact_flow", ContactFlowId))}
+
+
+class FakePaginator:
+    """Pages through the summaries of one list operation."""
+    
+    def __init__(self, client, operation):
+        self.client = client
+        self.operation = operation
+    
+    def paginate(self, InstanceId, **kwargs):
+        self.client._record(self.operation, InstanceId)
+        summaries = []
+        if self.operation == "list_contact_flows":
+            summaries = [
+                {
+                    "Id": flow["Id"],
+                    "Arn": flow["Arn"],
+                    "Name": flow["Name"],
+                    "ContactFlowType": flow["Type"],
+                    "ContactFlowState": flow["State"]
+                }
+                for flow in self.client.flows.values()
+                if not kwargs.get("ContactFlowTypes") or flow["Type"] in kwargs["ContactFlowTypes"]
+            ]
+        key = SUMMARY_KEYS[self.operation]
+        size = self.client.page_size
+        return [{key: summaries[i:i + size]} for i in range(0, max(len(summaries), 1), size)]
+
+
+def no_sleep_caller(sleeps=None):
+    """A rate-limited caller that never really sleeps; requested sleeps are appended to 'sleeps'."""
+    sleep = sleeps.append if sleeps is not None else lambda seconds: None
+    return RateLimitedCaller(TokenBucket(rate=1000, burst=1000, sleep=sleep), sleep=sleep)
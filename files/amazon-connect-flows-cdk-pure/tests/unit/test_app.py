@@ -0,0 +1,65 @@
+"""
+Unit tests for the CDK app entry point.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Skips the ListInstances lookup, which needs AWS credentials
+INSTANCE_ARN = "arn:aws:connect:us-east-1:123456789012:instance/test-instance-id"
+
+
+def _synth_stacks(outdir, context):
+    """Synthesize app.py and return its stack artifacts by name."""
+    # The jsii runtime reads CDK_* variables at startup, so synthesize in a fresh process
+    context = dict(context, connectInstanceArn=INSTANCE_ARN)
+    env = dict(os.environ, CDK_OUTDIR=str(outdir), CDK_CONTEXT_JSON=json.dumps(context))
+    subprocess.run([sys.executable, "app.py"], cwd=PROJECT_ROOT, env=env, capture_output=True, check=True)
+    
+    manifest = json.loads((outdir / "manifest.json").read_text())
+    return {
+        name: artifact for name, artifact in manifest["artifacts"].items()
+        if artifact["type"] == "aws:cloudformation:stack"
+    }
+
+
+def test_app_creates_one_independent_stack_per_config(tmp_path):
+    """Test that every discovered config becomes a stack with no dependencies."""
+    stacks = _synth_stacks(tmp_path, {"environment": "dev", "flowCache": "false"})
+    
+    assert sorted(stacks) == ["SalesFlowsStack-dev", "SupportFlowsStack-dev"]
+    for artifact in stacks.values():
+        assert not [dependency for dependency in artifact.get("dependencies", []) if dependency in stacks]
+
+
+def test_app_synthesizes_several_environments(tmp_path):
+    """Test that the environments context creates the stacks of every environment."""
+    stacks = _synth_stacks(tmp_path, {"environments": "all", "flowCache": "false"})
+    
+    assert sorted(stacks) == [
+        f"{lob}FlowsStack-{environment}"
+        for lob in ("Sales", "Support")
+        for environment in ("dev", "prod", "staging")
+    ]
+
+
+def test_app_only_changed_skips_recorded_stacks(tmp_path):
+    """Test that onlyChanged leaves out stacks recorded in the manifest."""
+    manifest_path = tmp_path / "flow-manifest.json"
+    context = {"environment": "dev", "flowCache": "false", "onlyChanged": "true", "flowManifest": str(manifest_path)}
+    
+    assert sorted(_synth_stacks(tmp_path / "first", context)) == ["SalesFlowsStack-dev", "SupportFlowsStack-dev"]
+    
+    subprocess.run(
+        [sys.executable, "-m", "utils.connect_flows.incremental", "record", "--env", "dev",
+         "--manifest", str(manifest_path), "-c", f"connectInstanceArn={INSTANCE_ARN}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        check=True
+    )
+    
+    assert _synth_stacks(tmp_path / "second", context) == {}
@@ -5,6 +5,7 @@ import pytest
 import json
 from pathlib import Path
 from utils.connect_flows.config_loader import ConfigurationLoader
+from utils.connect_flows.schema import ConfigValidationError
 
 
 @pytest.fixture
@@ -125,3 +126,54 @@ def test_validate_flow_missing_required_keys(temp_config_dir):
     
     with pytest.raises(ValueError):
         loader.load_config("invalid_config.json")
+
+
+def test_validate_invalid_strip_metadata(temp_config_dir, valid_config):
+    """Test validation of metadata strip modes on configs and flows."""
+    loader = ConfigurationLoader(temp_config_dir)
+    
+    for config in (
+        dict(valid_config, strip_metadata="everything"),
+        dict(valid_config, flows=[dict(valid_config["flows"][0], strip_metadata="everything")]),
+        dict(valid_config, prune_orphan_metadata="yes"),
+        dict(valid_config, flows=[dict(valid_config["flows"][0], prune_unreachable="yes")])
+    ):
+        config_file = temp_config_dir / "invalid_config.json"
+        with open(config_file, 'w') as f:
+            json.dump(config, f)
+        
+        with pytest.raises(ValueError):
+            loader.load_config("invalid_config.json")
+
+
+def test_validate_invalid_shard(temp_config_dir, valid_config):
+    """Test validation of flow shard pins."""
+    loader = ConfigurationLoader(temp_config_dir)
+    
+    for shard in (-1, "0", True):
+        config = dict(valid_config, flows=[dict(valid_config["flows"][0], shard=shard)])
+        config_file = temp_config_dir / "invalid_config.json"
+        with open(config_file, 'w') as f:
+            json.dump(config, f)
+        
+        with pytest.raises(ValueError):
+            loader.load_config("invalid_config.json")
+
+
+def test_load_config_reports_every_error(temp_config_dir):
+    """Test that all errors of a file are raised together, with their locations."""
+    config_file = temp_config_dir / "invalid_config.json"
+    config_file.write_text(json.dumps({
+        "instance_name": "",
+        "flows": [{"filename": "a.json", "name": "A", "type": "INVALID_TYPE"}, {"name": "B"}]
+    }, indent=2))
+    
+    loader = ConfigurationLoader(temp_config_dir)
+    
+    with pytest.raises(ConfigValidationError) as excinfo:
+        loader.load_config("invalid_config.json")
+    
+    assert [error["path"] for error in excinfo.value.errors] == [
+        "$.instance_name", "$.flows[0].type", "$.flows[1]", "$.flows[1]"
+    ]
+    assert "invalid_config.json:2:20: $.instance_name" in str(excinfo.value)
@@ -0,0 +1,111 @@
+"""
+Unit tests for the rate-limited Connect API plumbing.
+"""
+import pytest
+from botocore.exceptions import ClientError
+from utils.connect_flows.connect_api import RateLimitedCaller, TokenBucket, is_throttling, region_of, resource_id
+
+
+class FakeClock:
+    """Clock that only moves when something sleeps."""
+    
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+    
+    def __call__(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _throttle(operation="UpdateContactFlowContent"):
+    """Build a throttling error."""
+    return ClientError({"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, operation)
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    """Test that a full bucket serves its burst at once and then one token per 1/rate seconds."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock, sleep=clock.sleep)
+    
+    waits = [bucket.acquire() for _ in range(5)]
+    
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3:] == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_up_to_the_burst():
+    """Test that idle time refills at most 'burst' tokens."""
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire()
+    bucket.acquire()
+    clock.now += 60
+    
+    assert [bucket.acquire() for _ in range(3)] == [0, 0, pytest.approx(1.0)]
+
+
+def test_token_bucket_rejects_invalid_settings():
+    """Test bucket validation."""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_throttled_calls_are_retried_with_jittered_backoff():
+    """Test exponential backoff scaled by the jitter."""
+    clock = FakeClock()
+    failures = [_throttle(), _throttle(), _throttle()]
+    
+    def operation(**kwargs):
+        if failures:
+            raise failures.pop()
+        return kwargs
+    
+    caller = RateLimitedCaller(
+        TokenBucket(rate=100, burst=100, clock=clock, sleep=clock.sleep),
+        base_delay=1.0,
+        max_delay=3.0,
+        sleep=clock.sleep,
+        jitter=lambda: 0.5
+    )
+    
+    assert caller.call(operation, Name="x") == ({"Name": "x"}, 4)
+    assert clock.sleeps == [0.5, 1.0, 1.5]
+
+
+def test_other_errors_and_exhausted_retries_are_raised():
+    """Test that only throttling is retried, and only max_attempts times."""
+    clock = FakeClock()
+    caller = RateLimitedCaller(TokenBucket(clock=clock, sleep=clock.sleep), max_attempts=3, sleep=clock.sleep)
+    calls = []
+    
+    def throttled(**kwargs):
+        calls.append(kwargs)
+        raise _throttle()
+    
+    def broken(**kwargs):
+        calls.append(kwargs)
+        raise ValueError("bad content")
+    
+    with pytest.raises(ClientError):
+        caller.call(throttled)
+    assert len(calls) == 3
+    
+    with pytest.raises(ValueError):
+        caller.call(broken)
+    assert len(calls) == 4
+
+
+def test_helpers():
+    """Test the ARN and error helpers."""
+    arn = "arn:aws:connect:eu-west-2:123456789012:instance/abc/contact-flow/def"
+    
+    assert region_of(arn) == "eu-west-2"
+    assert region_of("not-an-arn") is None
+    assert resource_id(arn) == "def"
+    assert is_throttling(_throttle())
+    assert not is_throttling(ValueError("x"))
@@ -1,10 +1,20 @@
 """
 Unit tests for ConnectFlowStack.
 """
+import json
 import pytest
 import aws_cdk as cdk
 from aws_cdk.assertions import Template
+from stacks import connect_flow_stack
 from stacks.connect_flow_stack import ConnectFlowStack
+from utils.connect_flows import instances, resources, settings
+from utils.connect_flows.render import FlowRenderer
+from utils.connect_flows.sharding import shard_for
+
+INSTANCE_ARN = "arn:aws:connect:us-east-1:123456789012:instance/test-instance-id"
+
+# Skips the ListInstances lookup, which needs AWS credentials
+CONTEXT = {"connectInstanceArn": INSTANCE_ARN}
 
 
 def test_connect_flow_stack_initialization():
@@ -30,3 +40,368 @@ def test_connect_flow_stack_has_required_methods():
     
     for method in required_methods:
         assert hasattr(ConnectFlowStack, method), f"Missing method: {method}"
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a minimal project tree with one flow shared by two configs."""
+    flow = {
+        "Version": "2019-10-30",
+        "StartAction": "block-1",
+        "Actions": [
+            {"Identifier": "block-1", "Type": "MessageParticipant", "Parameters": {"Text": "PLACEHOLDER"}}
+        ]
+    }
+    return make_project({"shared/main_flow.json": flow}, {
+        f"dev/{lob}": {
+            "instance_name": "test-instance",
+            "flows": [
+                {
+                    "filename": "shared/main_flow.json",
+                    "name": f"{lob.title()}MainFlow",
+                    "type": "CONTACT_FLOW",
+                    "parameter_updates": {"block-1": {"Text": f"$.Attributes.{lob}Greeting"}}
+                },
+                {
+                    "filename": "shared/main_flow.json",
+                    "name": f"{lob.title()}PlainFlow",
+                    "type": "CONTACT_FLOW"
+                }
+            ]
+        }
+        for lob in ("sales", "support")
+    })
+
+
+def _flow_contents(stack):
+    """Return the parsed content of every contact flow in a stack, keyed by name."""
+    flows = Template.from_stack(stack).find_resources("AWS::Connect::ContactFlow")
+    return {
+        resource["Properties"]["Name"]: json.loads(resource["Properties"]["Content"])
+        for resource in flows.values()
+    }
+
+
+def test_stacks_sharing_a_flow_do_not_leak_updates(project_root):
+    """Test that updates applied in one stack never reach flows in another."""
+    app = cdk.App(context=dict(CONTEXT))
+    stacks = [
+        ConnectFlowStack(
+            app,
+            f"{lob.title()}FlowsStack-dev",
+            environment="dev",
+            config_filename=f"{lob}_flows_config.json",
+            project_root=project_root
+        )
+        for lob in ("sales", "support")
+    ]
+    
+    sales, support = (_flow_contents(stack) for stack in stacks)
+    
+    def text(content):
+        return content["Actions"][0]["Parameters"]["Text"]
+    
+    assert text(sales["SalesMainFlow"]) == "$.Attributes.salesGreeting"
+    assert text(sales["SalesPlainFlow"]) == "PLACEHOLDER"
+    assert text(support["SupportMainFlow"]) == "$.Attributes.supportGreeting"
+    assert text(support["SupportPlainFlow"]) == "PLACEHOLDER"
+
+
+def test_render_cache_skips_parsing_and_updates(project_root, monkeypatch):
+    """Test that a second synth with unchanged inputs is served from the render cache."""
+    def synth():
+        app = cdk.App(context=dict(CONTEXT))
+        stack = ConnectFlowStack(
+            app,
+            "SalesFlowsStack-dev",
+            environment="dev",
+            config_filename="sales_flows_config.json",
+            project_root=project_root
+        )
+        return _flow_contents(stack)
+    
+    first = synth()
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("flow should have been served from the render cache")
+    
+    monkeypatch.setattr(FlowRenderer, "_render", fail)
+    
+    assert synth() == first
+    assert (project_root / ".flowcache" / "rendered").exists()
+
+
+def test_render_cache_can_be_disabled(project_root):
+    """Test that the flowCache context value turns the render cache off."""
+    app = cdk.App(context=dict(CONTEXT, flowCache="false"))
+    stack = ConnectFlowStack(
+        app,
+        "SalesFlowsStack-dev",
+        environment="dev",
+        config_filename="sales_flows_config.json",
+        project_root=project_root
+    )
+    
+    assert stack.render_cache is None
+    assert not (project_root / ".flowcache").exists()
+
+
+def _sales_stack(project_root, context=None):
+    """Build the sales stack from a project tree."""
+    app = cdk.App(context=dict(CONTEXT, **(context or {})))
+    return ConnectFlowStack(
+        app,
+        "SalesFlowsStack-dev",
+        environment="dev",
+        config_filename="sales_flows_config.json",
+        project_root=project_root
+    )
+
+
+def test_parallel_preparation_matches_sequential(project_root):
+    """Test that preparing flows on a thread pool yields the same template."""
+    sequential = Template.from_stack(_sales_stack(project_root, {"flowCache": "false"})).to_json()
+    parallel = Template.from_stack(
+        _sales_stack(project_root, {"flowCache": "false", "flowWorkers": "4"})
+    ).to_json()
+    
+    assert parallel == sequential
+    assert list(parallel["Resources"]) == list(sequential["Resources"])
+
+
+def test_parallel_preparation_reports_failing_flow(project_root, caplog):
+    """Test that the first failing flow in config order is reported by name."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config = json.loads(config_path.read_text())
+    for flow in config["flows"]:
+        flow["filename"] = "shared/missing.json"
+    config_path.write_text(json.dumps(config))
+    
+    with pytest.raises(FileNotFoundError):
+        _sales_stack(project_root, {"flowWorkers": "2"})
+    
+    errors = [record.getMessage() for record in caplog.records if record.levelname == "ERROR"]
+    assert errors == [f"Error creating flow SalesMainFlow: Flow file not found: "
+                      f"{project_root / 'flows' / 'shared' / 'missing.json'}"]
+
+
+def test_invalid_worker_count(project_root, monkeypatch):
+    """Test that a non-positive worker count is rejected, whichever source sets it."""
+    monkeypatch.setenv("CONNECT_FLOWS_WORKERS", "4")
+    with pytest.raises(ValueError):
+        _sales_stack(project_root, {"flowWorkers": "0"})
+    with pytest.raises(ValueError, match="at least 1, got 0"):
+        _sales_stack(project_root, {"flowWorkers": 0})
+    monkeypatch.setenv("CONNECT_FLOWS_WORKERS", "0")
+    with pytest.raises(ValueError, match="at least 1, got 0"):
+        _sales_stack(project_root)
+
+
+def test_strip_metadata_from_context(project_root):
+    """Test that the stripMetadata context value applies to every flow."""
+    flow_path = project_root / "flows" / "shared" / "main_flow.json"
+    content = json.loads(flow_path.read_text())
+    content["Metadata"] = {"entryPointPosition": {"x": 20, "y": 20}}
+    flow_path.write_text(json.dumps(content))
+    
+    flows = _flow_contents(_sales_stack(project_root, {"stripMetadata": "all"}))
+    
+    assert all("Metadata" not in content for content in flows.values())
+
+
+def test_nested_sharding_distributes_flows(project_root):
+    """Test that flowSharding=nested creates each flow in the nested stack its name hashes to."""
+    stack = _sales_stack(project_root, {"flowSharding": "nested", "flowShardCount": 8})
+    
+    nested = {child.node.id: child for child in stack.node.children if isinstance(child, cdk.NestedStack)}
+    expected = {f"FlowShard{shard_for(name, 8)}": name for name in ("SalesMainFlow", "SalesPlainFlow")}
+    
+    assert sorted(nested) == sorted(expected)
+    for shard_id, name in expected.items():
+        assert list(_flow_contents(nested[shard_id])) == [name]
+    assert _flow_contents(stack) == {}
+    
+    outputs = Template.from_stack(nested[f"FlowShard{shard_for('SalesPlainFlow', 8)}"]).find_outputs("*")
+    assert [output["Export"]["Name"] for output in outputs.values()] == ["SalesFlowsStack-dev-SalesPlainFlow-Arn"]
+
+
+def test_nested_sharding_honours_pins(project_root):
+    """Test that a pinned flow lands in its shard regardless of its hash."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config = json.loads(config_path.read_text())
+    config["flows"][0]["shard"] = 1
+    config["flows"][1]["shard"] = 0
+    config_path.write_text(json.dumps(config))
+    
+    stack = _sales_stack(project_root, {"flowSharding": "nested", "flowShardCount": "1"})
+    nested = {child.node.id: child for child in stack.node.children if isinstance(child, cdk.NestedStack)}
+    
+    assert list(_flow_contents(nested["FlowShard0"])) == ["SalesPlainFlow"]
+    assert list(_flow_contents(nested["FlowShard1"])) == ["SalesMainFlow"]
+
+
+def test_nested_sharding_needs_a_shard_count(project_root):
+    """Test that nested sharding refuses to guess the shard count."""
+    with pytest.raises(ValueError, match="flowShardCount"):
+        _sales_stack(project_root, {"flowSharding": "nested"})
+
+
+def test_invalid_sharding_mode(project_root):
+    """Test that an unknown sharding mode is rejected."""
+    with pytest.raises(ValueError):
+        _sales_stack(project_root, {"flowSharding": "sideways"})
+
+
+def test_preloaded_config_is_used(project_root):
+    """Test that a preloaded configuration is used instead of reading the file."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config = json.loads(config_path.read_text())
+    config_path.unlink()
+    
+    stack = ConnectFlowStack(
+        cdk.App(context=dict(CONTEXT)),
+        "SalesFlowsStack-dev",
+        environment="dev",
+        config_filename="sales_flows_config.json",
+        project_root=project_root,
+        config=config
+    )
+    
+    assert sorted(_flow_contents(stack)) == ["SalesMainFlow", "SalesPlainFlow"]
+
+
+def test_environments_in_one_app_share_rendered_flows(project_root, monkeypatch):
+    """Test that a second environment rendering identical flows is served from memory."""
+    config_root = project_root / "config" / "connect_flows"
+    (config_root / "staging").mkdir()
+    for config_path in (config_root / "dev").iterdir():
+        (config_root / "staging" / config_path.name).write_text(config_path.read_text())
+    
+    app = cdk.App(context=dict(CONTEXT))
+    stacks = {}
+    for environment in ("dev", "staging"):
+        if environment == "staging":
+            def fail(*args, **kwargs):
+                raise AssertionError("flow should have been shared with dev")
+            
+            monkeypatch.setattr(FlowRenderer, "_render", fail)
+        
+        stacks[environment] = ConnectFlowStack(
+            app,
+            f"SalesFlowsStack-{environment}",
+            environment=environment,
+            config_filename="sales_flows_config.json",
+            project_root=project_root
+        )
+    
+    assert _flow_contents(stacks["staging"]) == _flow_contents(stacks["dev"])
+    assert stacks["staging"].render_cache.memory_hits >= 2
+
+
+def test_instance_arn_is_looked_up_in_the_stack_region(project_root, monkeypatch):
+    """Test that stacks with a region resolve their instance alias through one shared lookup."""
+    calls = []
+    
+    def list_instances(client):
+        calls.append(client)
+        return {"test-instance": INSTANCE_ARN}
+    
+    monkeypatch.setattr(instances, "list_instance_arns", list_instances)
+    lookup = instances.InstanceLookup(project_root / "instances.json", client_factory=lambda region: region)
+    monkeypatch.setattr(settings, "get_instance_lookup", lambda cache_path, ttl: lookup)
+    
+    app = cdk.App()
+    env = cdk.Environment(account="123456789012", region="eu-west-2")
+    for lob in ("sales", "support"):
+        stack = ConnectFlowStack(
+            app,
+            f"{lob.title()}FlowsStack-dev",
+            environment="dev",
+            config_filename=f"{lob}_flows_config.json",
+            project_root=project_root,
+            env=env
+        )
+        assert stack.instance_arn == INSTANCE_ARN
+    
+    assert calls == ["eu-west-2"]
+
+
+def test_instance_cache_ttl_of_zero_is_kept(project_root, monkeypatch):
+    """Test that instanceCacheTtl 0 from cdk.json disables the cache instead of using the default."""
+    ttls = []
+    
+    def get_lookup(cache_path, ttl):
+        ttls.append(ttl)
+        return instances.InstanceLookup(cache_path, ttl, client_factory=lambda region: region)
+    
+    monkeypatch.setattr(instances, "list_instance_arns", lambda client: {"test-instance": INSTANCE_ARN})
+    monkeypatch.setattr(settings, "get_instance_lookup", get_lookup)
+    
+    for ttl in (0, None):
+        ConnectFlowStack(
+            cdk.App(context={"instanceCacheTtl": ttl} if ttl is not None else {}),
+            "SalesFlowsStack-dev",
+            environment="dev",
+            config_filename="sales_flows_config.json",
+            project_root=project_root,
+            env=cdk.Environment(account="123456789012", region="eu-west-2")
+        )
+    
+    assert ttls == [0.0, instances.DEFAULT_TTL_SECONDS]
+
+
+def test_environment_agnostic_stack_needs_an_instance_arn(project_root):
+    """Test that a stack without a region cannot look up its instance."""
+    with pytest.raises(ValueError, match="connectInstanceArn"):
+        ConnectFlowStack(
+            cdk.App(),
+            "SalesFlowsStack-dev",
+            environment="dev",
+            config_filename="sales_flows_config.json",
+            project_root=project_root
+        )
+
+
+class FakeConnect:
+    """Connect client listing one queue."""
+    
+    def __init__(self):
+        self.sweeps = []
+    
+    def get_paginator(self, operation):
+        self.sweeps.append(operation)
+        return self
+    
+    def paginate(self, InstanceId):
+        return [{"QueueSummaryList": [{"Name": "SalesQueue", "Arn": f"{INSTANCE_ARN}/queue/sales"}]}]
+
+
+def test_resource_refs_are_resolved_once_per_app(project_root, monkeypatch):
+    """Test that queue references become ARNs with one sweep shared by every stack."""
+    config_dir = project_root / "config" / "connect_flows" / "dev"
+    for lob in ("sales", "support"):
+        config_path = config_dir / f"{lob}_flows_config.json"
+        config = json.loads(config_path.read_text())
+        config["flows"][0]["parameter_updates"]["block-1"]["QueueId"] = {"ref": "queue:SalesQueue"}
+        config_path.write_text(json.dumps(config))
+    
+    client = FakeConnect()
+    resolver = resources.ResourceResolver(client_factory=lambda region: client)
+    monkeypatch.setattr(connect_flow_stack, "get_resource_resolver", lambda: resolver)
+    
+    app = cdk.App(context=dict(CONTEXT))
+    stacks = {
+        lob: ConnectFlowStack(
+            app,
+            f"{lob.title()}FlowsStack-dev",
+            environment="dev",
+            config_filename=f"{lob}_flows_config.json",
+            project_root=project_root
+        )
+        for lob in ("sales", "support")
+    }
+    
+    for lob, stack in stacks.items():
+        content = _flow_contents(stack)[f"{lob.title()}MainFlow"]
+        assert content["Actions"][0]["Parameters"]["QueueId"] == f"{INSTANCE_ARN}/queue/sales"
+    assert client.sweeps == ["list_queues"]
@@ -0,0 +1,110 @@
+"""
+Unit tests for the flow dependency index.
+"""
+import json
+import os
+import subprocess
+import pytest
+from utils.connect_flows.dependency_index import DependencyIndex, git_changed_files
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project where dev and prod share a flow file."""
+    return make_project(configs={
+        f"{environment}/{lob}": {
+            "instance_name": "test-instance",
+            "flows": [
+                {"filename": f"{lob}/main.json", "name": f"{lob.title()}MainFlow", "type": "CONTACT_FLOW"},
+                {"filename": "shared/hold.json", "name": f"{lob.title()}HoldFlow", "type": "CUSTOMER_HOLD"}
+            ]
+        }
+        for environment in ("dev", "prod") for lob in ("sales", "support")
+    })
+
+
+def _write_config(project_root, environment, lob, flows):
+    """Rewrite a config file and move its mtime so the change is always seen."""
+    config_path = project_root / "config" / "connect_flows" / environment / f"{lob}_flows_config.json"
+    config_path.write_text(json.dumps({"instance_name": "test-instance", "flows": flows}))
+    stat = config_path.stat()
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_dependents_of_a_flow(project_root):
+    """Test that every use of a flow file is listed."""
+    index = DependencyIndex(project_root)
+    index.refresh()
+    
+    assert index.dependents("sales/main.json") == [
+        {"environment": environment, "config": "sales_flows_config.json",
+         "stack": f"SalesFlowsStack-{environment}", "flow": "SalesMainFlow"}
+        for environment in ("dev", "prod")
+    ]
+    assert len(index.dependents("shared/hold.json")) == 4
+    assert index.dependents("unused.json") == []
+
+
+def test_affected_stacks(project_root):
+    """Test mapping changed project files to stacks."""
+    index = DependencyIndex(project_root)
+    index.refresh()
+    
+    assert index.affected_stacks(["flows/sales/main.json"]) == ["SalesFlowsStack-dev", "SalesFlowsStack-prod"]
+    assert index.affected_stacks(["flows/shared/hold.json"], environments=["prod"]) == [
+        "SalesFlowsStack-prod", "SupportFlowsStack-prod"
+    ]
+    assert index.affected_stacks(["config/connect_flows/dev/support_flows_config.json"]) == ["SupportFlowsStack-dev"]
+    assert index.affected_stacks(["README.md", "tests/unit/test_x.py"]) == []
+    assert len(index.affected_stacks(["stacks/connect_flow_stack.py"])) == 4
+    assert len(index.affected_stacks(["cdk.json"])) == 4
+
+
+def test_refresh_is_incremental_and_cached(project_root):
+    """Test that only changed configs are read again, also across processes."""
+    index = DependencyIndex(project_root)
+    assert len(index.refresh()) == 4
+    assert index.refresh() == []
+    
+    _write_config(project_root, "dev", "sales", [
+        {"filename": "sales/other.json", "name": "SalesOtherFlow", "type": "CONTACT_FLOW"}
+    ])
+    
+    reloaded = DependencyIndex(project_root)
+    assert reloaded.refresh() == ["dev/sales_flows_config.json"]
+    assert [use["stack"] for use in reloaded.dependents("sales/main.json")] == ["SalesFlowsStack-prod"]
+    assert [use["stack"] for use in reloaded.dependents("sales/other.json")] == ["SalesFlowsStack-dev"]
+
+
+def test_removed_and_invalid_configs(project_root, caplog):
+    """Test that removed configs drop out and unreadable ones keep no references."""
+    index = DependencyIndex(project_root)
+    index.refresh()
+    
+    (project_root / "config" / "connect_flows" / "prod" / "sales_flows_config.json").unlink()
+    support_path = project_root / "config" / "connect_flows" / "dev" / "support_flows_config.json"
+    support_path.write_text("{not json")
+    os.utime(support_path, ns=(0, support_path.stat().st_mtime_ns + 1_000_000_000))
+    
+    assert sorted(index.refresh()) == ["dev/support_flows_config.json", "prod/sales_flows_config.json"]
+    assert index.stacks() == ["SalesFlowsStack-dev", "SupportFlowsStack-dev", "SupportFlowsStack-prod"]
+    assert [use["stack"] for use in index.dependents("shared/hold.json")] == [
+        "SalesFlowsStack-dev", "SupportFlowsStack-prod"
+    ]
+    assert "Could not read flow references" in caplog.text
+
+
+def test_git_changed_files(project_root):
+    """Test listing files changed since a revision."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=project_root, check=True, capture_output=True)
+    
+    git("init", "-q")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "add", ".")
+    git("-c", "user.name=test", "-c", "user.email=test@example.com", "commit", "-q", "-m", "base")
+    _write_config(project_root, "prod", "support", [])
+    
+    assert git_changed_files(project_root, "HEAD") == ["config/connect_flows/prod/support_flows_config.json"]
+    
+    with pytest.raises(RuntimeError):
+        git_changed_files(project_root, "no-such-revision")
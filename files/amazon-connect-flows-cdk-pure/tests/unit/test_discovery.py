@@ -0,0 +1,95 @@
+"""
+Unit tests for config discovery and parallel loading.
+"""
+import json
+import logging
+import pytest
+from utils.connect_flows.discovery import discover_configs, load_configs, lob_name, resolve_environments, stack_id
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    """Create an environment config directory with several lines of business."""
+    config_dir = tmp_path / "dev"
+    config_dir.mkdir()
+    for lob in ("support", "sales", "small_business"):
+        (config_dir / f"{lob}_flows_config.json").write_text(json.dumps({
+            "instance_name": "test-instance",
+            "flows": [{"filename": "main.json", "name": f"{lob}Main", "type": "CONTACT_FLOW"}]
+        }))
+    (config_dir / "notes.json").write_text("{}")
+    return config_dir
+
+
+def test_discover_configs(config_dir):
+    """Test that only *_flows_config.json files are discovered, sorted."""
+    assert discover_configs(config_dir) == [
+        "sales_flows_config.json",
+        "small_business_flows_config.json",
+        "support_flows_config.json"
+    ]
+
+
+def test_discover_configs_missing_directory(tmp_path):
+    """Test that a missing directory is reported."""
+    with pytest.raises(FileNotFoundError):
+        discover_configs(tmp_path / "missing")
+
+
+def test_stack_id_preserves_existing_names():
+    """Test that stack IDs match the previously hard-coded stacks."""
+    assert stack_id("sales_flows_config.json", "dev") == "SalesFlowsStack-dev"
+    assert stack_id("support_flows_config.json", "prod") == "SupportFlowsStack-prod"
+    assert stack_id("small_business_flows_config.json", "dev") == "SmallBusinessFlowsStack-dev"
+    assert lob_name("small_business_flows_config.json") == "Small Business"
+
+
+def test_lob_name_invalid_filename():
+    """Test that filenames outside the naming pattern are rejected."""
+    for filename in ("sales.json", "_flows_config.json"):
+        with pytest.raises(ValueError):
+            lob_name(filename)
+
+
+def test_load_configs_parallel_matches_sequential(config_dir):
+    """Test that parallel loading returns the same configs in filename order."""
+    sequential = load_configs(config_dir, workers=1)
+    parallel = load_configs(config_dir, workers=4)
+    
+    assert parallel == sequential
+    assert list(parallel) == discover_configs(config_dir)
+
+
+def test_load_configs_reports_every_invalid_file(config_dir, caplog):
+    """Test that every invalid config is logged and the first one is raised."""
+    for lob in ("sales", "support"):
+        (config_dir / f"{lob}_flows_config.json").write_text(json.dumps({"flows": []}))
+    
+    with caplog.at_level(logging.ERROR):
+        with pytest.raises(ValueError, match="sales_flows_config.json"):
+            load_configs(config_dir, workers=4)
+    
+    errors = [record.getMessage() for record in caplog.records if record.levelname == "ERROR"]
+    assert [error.split(":")[0] for error in errors] == [
+        "Invalid configuration sales_flows_config.json",
+        "Invalid configuration support_flows_config.json"
+    ]
+
+
+def test_load_configs_invalid_workers(config_dir):
+    """Test that a non-positive worker count is rejected."""
+    with pytest.raises(ValueError):
+        load_configs(config_dir, workers=0)
+
+
+def test_resolve_environments(tmp_path):
+    """Test resolving explicit and 'all' environment selections."""
+    for environment in ("prod", "dev", "staging"):
+        (tmp_path / environment).mkdir()
+    
+    assert resolve_environments("all", tmp_path) == ["dev", "prod", "staging"]
+    assert resolve_environments("prod, dev,prod", tmp_path) == ["prod", "dev"]
+    
+    for value in ("dev,qa", " , "):
+        with pytest.raises(ValueError):
+            resolve_environments(value, tmp_path)
@@ -0,0 +1,135 @@
+"""
+Unit tests for drift detection between rendered and deployed flows.
+"""
+import json
+import pytest
+from tests.unit.fake_connect import INSTANCE_ARN, FakeConnect, no_sleep_caller
+from utils.connect_flows.drift import canonical_flow, detect_drift, diff_blocks, format_result
+
+
+def _flow(name, text="hi", x=100):
+    """Build a two-block flow."""
+    return {
+        "Version": "2019-10-30",
+        "StartAction": f"{name}-1",
+        "Metadata": {"ActionMetadata": {f"{name}-1": {"position": {"x": x, "y": 0}}}},
+        "Actions": [
+            {
+                "Identifier": f"{name}-1",
+                "Type": "MessageParticipant",
+                "Parameters": {"Text": text},
+                "Transitions": {"NextAction": f"{name}-2"}
+            },
+            {"Identifier": f"{name}-2", "Type": "DisconnectParticipant", "Parameters": {}}
+        ]
+    }
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project with three flows."""
+    flows = {f"sales/{name}.json": _flow(name) for name in ("main", "hold", "new")}
+    return make_project(flows, {"prod/sales": {
+        "instance_name": "sales-instance",
+        "flows": [
+            {
+                "filename": "sales/main.json",
+                "name": "SalesMainFlow",
+                "type": "CONTACT_FLOW",
+                "parameter_updates": {"main-1": {"Text": "Welcome"}}
+            },
+            {"filename": "sales/hold.json", "name": "SalesHoldFlow", "type": "CUSTOMER_HOLD"},
+            {"filename": "sales/new.json", "name": "SalesNewFlow", "type": "CONTACT_FLOW"}
+        ]
+    }})
+
+
+def test_canonical_flow_ignores_metadata_and_formatting():
+    """Test that only the behavior of a flow is compared by default."""
+    flow = _flow("main")
+    moved = json.dumps(_flow("main", x=500), indent=4)
+    
+    assert canonical_flow(moved) == canonical_flow(flow)
+    assert canonical_flow(moved, include_metadata=True) != canonical_flow(flow, include_metadata=True)
+    assert "Metadata" in flow
+
+
+def test_diff_blocks():
+    """Test that differences are reported by block identifier."""
+    expected = _flow("main")
+    deployed = _flow("main", text="Edited in the console")
+    deployed["StartAction"] = "main-3"
+    deployed["Actions"][1:] = [{"Identifier": "main-3", "Type": "DisconnectParticipant", "Parameters": {}}]
+    
+    assert diff_blocks(expected, deployed) == {
+        "added": ["main-3"],
+        "removed": ["main-2"],
+        "changed": ["main-1"],
+        "keys": ["StartAction"]
+    }
+
+
+def test_detect_drift(project_root):
+    """Test that each flow is reported in sync, drifted or missing."""
+    main = _flow("main", text="Welcome", x=999)
+    hold = _flow("hold", text="Please hold")
+    connect = FakeConnect({
+        "SalesMainFlow": ("CONTACT_FLOW", json.dumps(main)),
+        "SalesHoldFlow": ("CUSTOMER_HOLD", json.dumps(hold))
+    })
+    
+    results = detect_drift(
+        project_root, "prod", lambda region: connect, instance_arn=INSTANCE_ARN, caller=no_sleep_caller(), workers=4
+    )
+    
+    assert [(result["name"], result["status"]) for result in results] == [
+        ("SalesMainFlow", "in-sync"),
+        ("SalesHoldFlow", "drifted"),
+        ("SalesNewFlow", "missing")
+    ]
+    assert results[0]["expected"] == results[0]["deployed"]
+    assert results[1]["blocks"] == {"added": [], "removed": [], "changed": ["hold-1"], "keys": []}
+    assert results[1]["message"] == "changed: hold-1"
+    assert connect.calls.count("describe_contact_flow") == 2
+    assert connect.calls.count("list_contact_flows") == 1
+    assert all(format_result(result) for result in results)
+
+
+def test_detect_drift_applies_context_settings(project_root):
+    """Test that flows deployed with context pruning and stripping are in sync."""
+    flow_path = project_root / "flows" / "sales" / "hold.json"
+    content = json.loads(flow_path.read_text())
+    content["Actions"].append({"Identifier": "orphan", "Type": "DisconnectParticipant", "Parameters": {}})
+    flow_path.write_text(json.dumps(content))
+    deployed = _flow("hold")
+    del deployed["Metadata"]
+    connect = FakeConnect({"SalesHoldFlow": ("CUSTOMER_HOLD", json.dumps(deployed))})
+    
+    def check(context):
+        return detect_drift(
+            project_root, "prod", lambda region: connect, caller=no_sleep_caller(), flow_names=["SalesHoldFlow"],
+            include_metadata=True, context=dict(context, connectInstanceArn=INSTANCE_ARN)
+        )[0]
+    
+    assert check({"pruneUnreachable": "true", "stripMetadata": "all"})["status"] == "in-sync"
+    assert check({})["blocks"] == {"added": [], "removed": ["orphan"], "changed": [], "keys": ["Metadata"]}
+
+
+def test_detect_drift_with_metadata_and_errors(project_root):
+    """Test that metadata can be compared and that failed calls are reported per flow."""
+    main = _flow("main", text="Welcome", x=999)
+    connect = FakeConnect({
+        "SalesMainFlow": ("CONTACT_FLOW", json.dumps(main)),
+        "SalesHoldFlow": ("CUSTOMER_HOLD", "{")
+    })
+    
+    results = detect_drift(
+        project_root, "prod", lambda region: connect, instance_arn=INSTANCE_ARN, caller=no_sleep_caller(),
+        flow_names=["SalesMainFlow", "SalesHoldFlow"], include_metadata=True
+    )
+    
+    assert [(result["name"], result["status"]) for result in results] == [
+        ("SalesMainFlow", "drifted"),
+        ("SalesHoldFlow", "failed")
+    ]
+    assert results[0]["blocks"]["keys"] == ["Metadata"]
@@ -0,0 +1,161 @@
+"""
+Unit tests for bulk export of deployed flows into the flows/ tree.
+"""
+import json
+import pytest
+from tests.unit.fake_connect import INSTANCE_ARN, FakeConnect, no_sleep_caller
+from utils.connect_flows.config_loader import ConfigurationLoader
+from utils.connect_flows.export import export_flows, flow_filename, format_result
+
+
+def _content(text):
+    """Build deployed flow content with keys in console order."""
+    return json.dumps({
+        "Version": "2019-10-30",
+        "StartAction": "a-1",
+        "Actions": [{"Identifier": "a-1", "Type": "MessageParticipant", "Parameters": {"Text": text}}]
+    })
+
+
+@pytest.fixture
+def connect():
+    """A Connect stand-in with flows of several types, listed two per page."""
+    return FakeConnect({
+        "SalesMainFlow": ("CONTACT_FLOW", _content("Welcome")),
+        "Sales hold music": ("CUSTOMER_HOLD", _content("Please hold")),
+        "Sales-Main-Flow": ("CONTACT_FLOW", _content("Duplicate name")),
+        "SalesCampaign": ("CAMPAIGN", _content("Not exported"))
+    })
+
+
+def _export(project_root, connect, **kwargs):
+    """Export the sales flows of the fake instance."""
+    return export_flows(
+        project_root, "dev", "sales", client_factory=lambda region: connect, instance_arn=INSTANCE_ARN,
+        caller=no_sleep_caller(), workers=4, **kwargs
+    )
+
+
+def test_flow_filename():
+    """Test that flow names become snake case file stems."""
+    assert flow_filename("SalesMainFlow") == "sales_main_flow"
+    assert flow_filename("Default agent hold") == "default_agent_hold"
+    assert flow_filename("IVR-Menu 2") == "ivr_menu_2"
+    assert flow_filename("---") == "flow"
+
+
+def test_export_writes_flows_and_config(tmp_path, connect):
+    """Test that flows are written as normalized JSON with a loadable config."""
+    report = _export(tmp_path, connect, instance_name="dev-connect-instance")
+    
+    assert [(result["name"], result["file"], result["status"]) for result in report["flows"]] == [
+        ("SalesMainFlow", "sales/sales_main_flow.json", "created"),
+        ("Sales hold music", "sales/sales_hold_music.json", "created"),
+        ("Sales-Main-Flow", "sales/sales_main_flow_2.json", "created")
+    ]
+    assert report["config_status"] == "created"
+    assert all(format_result(result) for result in report["flows"])
+    
+    text = (tmp_path / "flows" / "sales" / "sales_main_flow.json").read_text()
+    assert text == json.dumps(json.loads(_content("Welcome")), indent=2, sort_keys=True) + "\n"
+    
+    config = ConfigurationLoader(tmp_path / "config" / "connect_flows" / "dev").load_config("sales_flows_config.json")
+    assert config["instance_name"] == "dev-connect-instance"
+    assert [(flow["name"], flow["type"]) for flow in config["flows"]] == [
+        ("SalesMainFlow", "CONTACT_FLOW"),
+        ("Sales hold music", "CUSTOMER_HOLD"),
+        ("Sales-Main-Flow", "CONTACT_FLOW")
+    ]
+    assert connect.calls.count("list_contact_flows") == 1
+
+
+def test_reexport_is_incremental(tmp_path, connect):
+    """Test that unchanged flows and config entries are left alone on a re-run."""
+    _export(tmp_path, connect, instance_name="dev-connect-instance")
+    config_path = tmp_path / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config = json.loads(config_path.read_text())
+    config["flows"][0]["parameter_updates"] = {"a-1": {"Text": "$.Attributes.greeting"}}
+    config["flows"][0]["filename"] = "sales/main.json"
+    config_path.write_text(json.dumps(config, indent=2) + "\n")
+    (tmp_path / "flows" / "sales" / "sales_main_flow.json").rename(tmp_path / "flows" / "sales" / "main.json")
+    hold = tmp_path / "flows" / "sales" / "sales_hold_music.json"
+    hold.write_text(json.dumps(json.loads(hold.read_text())))
+    connect.flows["flow-3"]["Content"] = _content("Edited in the console")
+    
+    report = _export(tmp_path, connect)
+    
+    assert [(result["file"], result["status"]) for result in report["flows"]] == [
+        ("sales/main.json", "unchanged"),
+        ("sales/sales_hold_music.json", "unchanged"),
+        ("sales/sales_main_flow_2.json", "updated")
+    ]
+    assert report["config_status"] == "unchanged"
+    assert json.loads(config_path.read_text()) == config
+    assert "\n" not in hold.read_text()
+
+
+def test_failed_flows_are_left_out_of_the_config(tmp_path, connect):
+    """Test that a flow that cannot be fetched is reported and not configured."""
+    connect.flows["flow-2"]["Content"] = "{"
+    
+    report = _export(tmp_path, connect, instance_name="dev-connect-instance", pattern="Sales*Flow")
+    
+    assert [(result["name"], result["status"]) for result in report["flows"]] == [
+        ("SalesMainFlow", "created"),
+        ("Sales-Main-Flow", "created")
+    ]
+    connect.flows["flow-1"]["Content"] = "{"
+    
+    report = _export(tmp_path, connect)
+    
+    assert report["flows"][0]["status"] == "failed"
+    config = json.loads((tmp_path / "config" / "connect_flows" / "dev" / "sales_flows_config.json").read_text())
+    assert [flow["name"] for flow in config["flows"]] == ["SalesMainFlow", "Sales-Main-Flow"]
+
+
+def test_invalid_arguments(tmp_path, connect):
+    """Test that an unsafe LOB or a missing instance name is rejected before any call."""
+    with pytest.raises(ValueError, match="Invalid line of business"):
+        export_flows(tmp_path, "dev", "../sales", instance_arn=INSTANCE_ARN)
+    with pytest.raises(ValueError, match="--instance-name"):
+        _export(tmp_path, connect)
+    assert connect.calls == []
+
+
+def test_templates_are_not_overwritten(tmp_path, connect):
+    """Test that a file with parameter_updates in any environment is only replaced with overwrite."""
+    _export(tmp_path, connect, instance_name="dev-connect-instance", pattern="SalesMainFlow")
+    template = tmp_path / "flows" / "sales" / "sales_main_flow.json"
+    template.write_text(template.read_text().replace("Welcome", "$.Attributes.greeting"))
+    prod = tmp_path / "config" / "connect_flows" / "prod" / "sales_flows_config.json"
+    prod.parent.mkdir(parents=True)
+    prod.write_text(json.dumps({"flows": [{
+        "filename": "sales/sales_main_flow.json", "name": "SalesMainFlow", "type": "CONTACT_FLOW",
+        "parameter_updates": {"a-1": {"Text": "Welcome"}}
+    }]}))
+    
+    report = _export(tmp_path, connect, pattern="SalesMainFlow")
+    
+    assert report["flows"][0]["status"] == "skipped"
+    assert "prod/sales_flows_config.json" in report["flows"][0]["message"]
+    assert "--overwrite" in format_result(report["flows"][0])
+    assert "$.Attributes.greeting" in template.read_text()
+    
+    report = _export(tmp_path, connect, pattern="SalesMainFlow", overwrite=True)
+    
+    assert report["flows"][0]["status"] == "updated"
+    assert "$.Attributes.greeting" not in template.read_text()
+
+
+def test_duplicate_names_are_rejected(tmp_path):
+    """Test that flows of different types with one name are rejected before any describe call."""
+    connect = FakeConnect({
+        "SalesMainFlow": ("CONTACT_FLOW", _content("Welcome")),
+        "SalesQueue": ("CUSTOMER_QUEUE", _content("Queue"))
+    })
+    connect.flows["flow-2"]["Name"] = "SalesMainFlow"
+    
+    with pytest.raises(ValueError, match=r"SalesMainFlow \(CONTACT_FLOW, CUSTOMER_QUEUE\)"):
+        _export(tmp_path, connect, instance_name="dev-connect-instance")
+    assert "describe_contact_flow" not in connect.calls
+    assert not (tmp_path / "flows").exists()
@@ -0,0 +1,121 @@
+"""
+Unit tests for fast deploy through UpdateContactFlowContent.
+"""
+import json
+import pytest
+from tests.unit.fake_connect import INSTANCE_ARN, FakeConnect, no_sleep_caller
+from utils.connect_flows.fast_deploy import deploy_flows, format_result
+from utils.connect_flows.settings import load_context
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project with three flows, one of which references another."""
+    flows = {
+        f"sales/{name}.json": {
+            "Version": "2019-10-30",
+            "StartAction": f"{name}-1",
+            "Actions": [{"Identifier": f"{name}-1", "Type": "MessageParticipant", "Parameters": {"Text": "hi"}}]
+        }
+        for name in ("main", "hold", "new")
+    }
+    return make_project(flows, {"dev/sales": {
+        "instance_name": "sales-instance",
+        "flows": [
+            {
+                "filename": "sales/main.json",
+                "name": "SalesMainFlow",
+                "type": "CONTACT_FLOW",
+                "parameter_updates": {"main-1": {"ContactFlowId": {"ref": "flow:SalesHoldFlow"}}}
+            },
+            {"filename": "sales/hold.json", "name": "SalesHoldFlow", "type": "CUSTOMER_HOLD"},
+            {"filename": "sales/new.json", "name": "SalesNewFlow", "type": "CONTACT_FLOW"}
+        ]
+    }})
+
+
+@pytest.fixture
+def connect():
+    """A Connect stand-in holding the deployed main and hold flows."""
+    return FakeConnect({
+        "SalesMainFlow": ("CONTACT_FLOW", "{}"),
+        "SalesHoldFlow": ("CUSTOMER_HOLD", "{}"),
+        "OtherFlow": ("CONTACT_FLOW", "{}")
+    })
+
+
+def test_deploy_updates_existing_flows(project_root, connect):
+    """Test that rendered content is sent to every flow that exists."""
+    results = deploy_flows(
+        project_root, "dev", lambda region: connect, instance_arn=INSTANCE_ARN, caller=no_sleep_caller(), workers=4
+    )
+    
+    assert [(result["name"], result["status"]) for result in results] == [
+        ("SalesMainFlow", "updated"),
+        ("SalesHoldFlow", "updated"),
+        ("SalesNewFlow", "missing")
+    ]
+    main = json.loads(connect.flows["flow-1"]["Content"])
+    assert main["Actions"][0]["Parameters"]["ContactFlowId"] == connect.flows["flow-2"]["Arn"]
+    assert connect.flows["flow-3"]["Content"] == "{}"
+    assert connect.calls.count("list_contact_flows") == 1
+    assert all(format_result(result) for result in results)
+
+
+def test_throttled_updates_are_retried(project_root, connect):
+    """Test that throttling is retried with backoff and reported per flow."""
+    connect.throttle = 3
+    sleeps = []
+    
+    results = deploy_flows(
+        project_root, "dev", lambda region: connect, instance_arn=INSTANCE_ARN, caller=no_sleep_caller(sleeps),
+        workers=1
+    )
+    
+    assert [result["status"] for result in results[:2]] == ["updated", "updated"]
+    assert sum(result["attempts"] for result in results) == 5
+    assert connect.throttled == 3
+    assert len(sleeps) == 3
+
+
+def test_selection_and_failures(project_root, connect):
+    """Test that flows can be selected and that errors don't stop the other updates."""
+    def reject(**kwargs):
+        raise ValueError("InvalidContactFlow")
+    
+    connect.update_contact_flow_content = reject
+    
+    results = deploy_flows(
+        project_root, "dev", lambda region: connect, instance_arn=INSTANCE_ARN, caller=no_sleep_caller(),
+        flow_names=["SalesMainFlow", "SalesHoldFlow"]
+    )
+    
+    assert [(result["name"], result["status"], result["message"]) for result in results] == [
+        ("SalesMainFlow", "failed", "InvalidContactFlow"),
+        ("SalesHoldFlow", "failed", "InvalidContactFlow")
+    ]
+
+
+def test_context_matches_the_stack(project_root, connect):
+    """Test that cdk.json and -c context change the content and instance like they do for a synth."""
+    flow_path = project_root / "flows" / "sales" / "hold.json"
+    content = json.loads(flow_path.read_text())
+    content["Actions"].append({"Identifier": "orphan", "Type": "DisconnectParticipant", "Parameters": {}})
+    flow_path.write_text(json.dumps(content))
+    (project_root / "cdk.json").write_text(json.dumps({"context": {"connectInstanceArn": INSTANCE_ARN}}))
+    
+    results = deploy_flows(
+        project_root, "dev", lambda region: connect, caller=no_sleep_caller(), flow_names=["SalesHoldFlow"],
+        context=load_context(project_root, {"pruneUnreachable": "true"})
+    )
+    
+    assert [result["status"] for result in results] == ["updated"]
+    deployed = json.loads(connect.flows["flow-2"]["Content"])
+    assert [action["Identifier"] for action in deployed["Actions"]] == ["hold-1"]
+
+
+def test_production_needs_force(project_root, connect):
+    """Test that environments outside dev and staging are refused."""
+    with pytest.raises(ValueError, match="--force"):
+        deploy_flows(project_root, "prod", lambda region: connect, instance_arn=INSTANCE_ARN)
+    assert connect.calls == []
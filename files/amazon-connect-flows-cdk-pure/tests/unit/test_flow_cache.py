@@ -0,0 +1,109 @@
+"""
+Unit tests for FlowCache.
+"""
+import json
+import os
+import pytest
+from utils.connect_flows.flow_cache import FlowCache, get_flow_cache
+
+
+@pytest.fixture
+def flow_file(tmp_path):
+    """Create a flow file on disk."""
+    flow_path = tmp_path / "flow.json"
+    flow_path.write_text(json.dumps({
+        "Version": "2019-10-30",
+        "Actions": [
+            {"Identifier": "block-1", "Parameters": {"Text": "Original"}}
+        ]
+    }))
+    return flow_path
+
+
+def test_load_parses_once(flow_file):
+    """Test that repeated loads are served from the cache."""
+    cache = FlowCache()
+    
+    first = cache.load(flow_file)
+    second = cache.load(flow_file)
+    
+    assert first == second
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_loaded_copies_are_isolated(flow_file):
+    """Test that mutating a loaded flow does not leak into later loads."""
+    cache = FlowCache()
+    
+    first = cache.load(flow_file)
+    first["Actions"][0]["Parameters"]["Text"] = "Mutated"
+    first["Actions"].append({"Identifier": "block-2"})
+    
+    second = cache.load(flow_file)
+    
+    assert second["Actions"] == [{"Identifier": "block-1", "Parameters": {"Text": "Original"}}]
+    assert second is not first
+
+
+def test_changed_file_is_reparsed(flow_file):
+    """Test that a modified file invalidates its cache entry."""
+    cache = FlowCache()
+    cache.load(flow_file)
+    
+    flow_file.write_text(json.dumps({"Version": "2019-10-30", "Actions": [], "Extra": True}))
+    stat = flow_file.stat()
+    os.utime(flow_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    assert cache.load(flow_file)["Extra"] is True
+    assert cache.stats()["misses"] == 2
+
+
+def test_entry_bound_evicts_least_recently_used(tmp_path):
+    """Test that the cache never holds more than max_entries flows."""
+    cache = FlowCache(max_entries=2)
+    paths = []
+    for idx in range(3):
+        path = tmp_path / f"flow_{idx}.json"
+        path.write_text(json.dumps({"Actions": [], "Index": idx}))
+        paths.append(path)
+    
+    cache.load(paths[0])
+    cache.load(paths[1])
+    cache.load(paths[0])
+    cache.load(paths[2])
+    
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    
+    cache.load(paths[0])
+    assert cache.stats()["hits"] == 2
+
+
+def test_byte_bound_is_respected(tmp_path):
+    """Test that the total snapshot size stays within max_bytes."""
+    cache = FlowCache(max_bytes=200)
+    for idx in range(5):
+        path = tmp_path / f"flow_{idx}.json"
+        path.write_text(json.dumps({"Actions": [], "Padding": "x" * 50}))
+        cache.load(path)
+    
+    assert 0 < cache.stats()["bytes"] <= 200
+
+
+def test_missing_file(tmp_path):
+    """Test loading a flow file that doesn't exist."""
+    with pytest.raises(FileNotFoundError):
+        FlowCache().load(tmp_path / "missing.json")
+
+
+def test_invalid_bounds():
+    """Test FlowCache with non-positive bounds."""
+    with pytest.raises(ValueError):
+        FlowCache(max_entries=0)
+
+
+def test_default_cache_is_shared():
+    """Test that get_flow_cache returns one process-wide instance."""
+    assert get_flow_cache() is get_flow_cache()
@@ -129,3 +129,110 @@ def test_get_content_json():
     assert isinstance(json_str, str)
     assert "Version" in json_str
     assert "Actions" in json_str
+
+
+def test_add_block_is_indexed():
+    """Test that added blocks can be updated immediately."""
+    flow_content = {
+        "Version": "2019-10-30",
+        "Actions": []
+    }
+    
+    updater = FlowParameterUpdater(flow_content)
+    updater.add_block({"Identifier": "new-block", "Type": "MessageParticipant"})
+    updater.update_block_parameters("new-block", {"Text": "Hello"})
+    
+    assert flow_content["Actions"][0]["Parameters"] == {"Text": "Hello"}
+    assert updater.get_block("new-block") is flow_content["Actions"][0]
+    
+    with pytest.raises(ValueError):
+        updater.add_block({"Identifier": "new-block"})
+
+
+def test_replace_block_keeps_index_in_sync():
+    """Test that replaced blocks are updated in place of the old ones."""
+    flow_content = {
+        "Version": "2019-10-30",
+        "Actions": [
+            {"Identifier": "block-1", "Type": "MessageParticipant", "Parameters": {"Text": "Old"}},
+            {"Identifier": "block-2", "Type": "MessageParticipant", "Parameters": {"Text": "Old"}}
+        ]
+    }
+    
+    updater = FlowParameterUpdater(flow_content)
+    updater.replace_block({"Identifier": "block-1", "Type": "DisconnectParticipant", "Parameters": {}})
+    updater.update_block_parameters("block-1", {"Reason": "done"})
+    
+    assert flow_content["Actions"][0]["Type"] == "DisconnectParticipant"
+    assert flow_content["Actions"][0]["Parameters"] == {"Reason": "done"}
+    assert len(flow_content["Actions"]) == 2
+    
+    with pytest.raises(ValueError):
+        updater.replace_block({"Identifier": "missing"})
+
+
+def test_duplicate_identifiers_update_first_block():
+    """Test that the first block wins when identifiers are duplicated."""
+    flow_content = {
+        "Version": "2019-10-30",
+        "Actions": [
+            {"Identifier": "dup", "Parameters": {"Text": "First"}},
+            {"Identifier": "dup", "Parameters": {"Text": "Second"}}
+        ]
+    }
+    
+    updater = FlowParameterUpdater(flow_content)
+    updater.update_multiple_blocks({"dup": {"Text": "New"}})
+    
+    assert flow_content["Actions"][0]["Parameters"]["Text"] == "New"
+    assert flow_content["Actions"][1]["Parameters"]["Text"] == "Second"
+
+
+def test_update_multiple_blocks_rejects_invalid_batch():
+    """Test that an invalid entry rejects the batch before any block changes."""
+    flow_content = {
+        "Version": "2019-10-30",
+        "Actions": [
+            {"Identifier": "block-1", "Parameters": {"Text": "Old"}}
+        ]
+    }
+    
+    updater = FlowParameterUpdater(flow_content)
+    
+    with pytest.raises(ValueError):
+        updater.update_multiple_blocks({
+            "block-1": {"Text": "New"},
+            "block-2": "not-a-dict"
+        })
+    
+    assert flow_content["Actions"][0]["Parameters"]["Text"] == "Old"
+    assert updater.updated_blocks == []
+
+
+def test_update_multiple_blocks_large_flow():
+    """Test batch updates on a large flow, including missing identifiers."""
+    flow_content = {
+        "Version": "2019-10-30",
+        "Actions": [
+            {"Identifier": f"block-{idx}", "Parameters": {}} for idx in range(10000)
+        ]
+    }
+    updates = {f"block-{idx}": {"Text": str(idx)} for idx in range(0, 10000, 7)}
+    updates["missing"] = {"Text": "x"}
+    
+    updater = FlowParameterUpdater(flow_content)
+    updater.update_multiple_blocks(updates)
+    
+    validation = updater.validate_updates()
+    assert validation["updated_blocks"] == len(updates) - 1
+    assert validation["failed_identifiers"] == ["missing"]
+    assert flow_content["Actions"][9996]["Parameters"] == {"Text": "9996"}
+
+
+def test_get_content_json_is_canonical():
+    """Test that content JSON is compact and independent of key order."""
+    first = FlowParameterUpdater({"Version": "2019-10-30", "Actions": [{"Identifier": "a", "Type": "T"}]})
+    second = FlowParameterUpdater({"Actions": [{"Type": "T", "Identifier": "a"}], "Version": "2019-10-30"})
+    
+    assert first.get_content_json() == second.get_content_json()
+    assert first.get_content_json() == '{"Actions":[{"Identifier":"a","Type":"T"}],"Version":"2019-10-30"}'
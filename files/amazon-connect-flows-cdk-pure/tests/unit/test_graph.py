@@ -0,0 +1,138 @@
+"""
+Unit tests for flow graph analysis.
+"""
+import pytest
+from utils.connect_flows.graph import (
+    FlowGraphError,
+    analyze_flow,
+    build_adjacency,
+    find_cycles,
+    prune_unreachable,
+    reachable_actions,
+    validate_graph_check
+)
+
+
+def _action(identifier, next_action=None, action_type="MessageParticipant", errors=(), conditions=()):
+    """Build an action with the given transitions."""
+    transitions = {}
+    if next_action:
+        transitions["NextAction"] = next_action
+    if errors:
+        transitions["Errors"] = [{"NextAction": target, "ErrorType": "NoMatchingError"} for target in errors]
+    if conditions:
+        transitions["Conditions"] = [{"NextAction": target} for target in conditions]
+    return {"Identifier": identifier, "Type": action_type, "Parameters": {}, "Transitions": transitions}
+
+
+def _flow(*actions, start="a"):
+    """Build a flow from actions."""
+    return {"Version": "2019-10-30", "StartAction": start, "Actions": list(actions)}
+
+
+def test_build_adjacency_covers_every_transition():
+    """Test that NextAction, Errors and Conditions all become edges."""
+    flow = _flow(_action("a", "b", errors=["c"], conditions=["d"]), _action("b"), _action("c"), _action("d"))
+    
+    index, edges = build_adjacency(flow)
+    
+    assert index == {"a": 0, "b": 1, "c": 2, "d": 3}
+    assert sorted(target for target, _ in edges["a"]) == ["b", "c", "d"]
+    assert edges["b"] == []
+    assert ("c", "$.Actions[0].Transitions.Errors[0].NextAction") in edges["a"]
+
+
+def test_reachable_actions():
+    """Test reachability from the start action."""
+    _, edges = build_adjacency(_flow(_action("a", "b"), _action("b", "a"), _action("c", "a")))
+    
+    assert set(reachable_actions("a", edges)) == {"a", "b"}
+
+
+def test_find_cycles():
+    """Test that every cycle is found once, self-loops included."""
+    _, edges = build_adjacency(_flow(
+        _action("a", "b"), _action("b", "a"), _action("c", "c"), _action("d", "e"), _action("e", "d"), _action("f")
+    ))
+    
+    assert sorted(sorted(component) for component in find_cycles(edges)) == [["a", "b"], ["c"], ["d", "e"]]
+
+
+def test_find_cycles_handles_long_chains():
+    """Test that deep graphs don't hit the recursion limit."""
+    count = 5000
+    actions = [_action(f"n{i}", f"n{i + 1}") for i in range(count)] + [_action(f"n{count}", "n0")]
+    _, edges = build_adjacency(_flow(*actions, start="n0"))
+    
+    assert [len(component) for component in find_cycles(edges)] == [count + 1]
+
+
+def test_clean_flow_has_no_issues():
+    """Test a flow with a single path to a disconnect."""
+    flow = _flow(_action("a", "b", errors=["b"]), _action("b", action_type="DisconnectParticipant"))
+    
+    assert analyze_flow(flow) == {"errors": [], "warnings": []}
+
+
+def test_errors():
+    """Test the issues that would make a deploy fail."""
+    flow = _flow(_action("a", "missing"), _action("a"), start="nowhere")
+    
+    messages = [error["message"] for error in analyze_flow(flow)["errors"]]
+    
+    assert "Duplicate action 'a'" in messages
+    assert "StartAction 'nowhere' is not an action" in messages
+    assert "Transition from 'a' to unknown action 'missing'" in messages
+    assert analyze_flow({"Actions": []})["errors"] == [{"path": "$", "message": "Missing StartAction"}]
+
+
+def test_warnings():
+    """Test unreachable actions and cycles outside Loop blocks."""
+    flow = _flow(
+        _action("a", "b"),
+        _action("b", "a"),
+        _action("loop", "body", action_type="Loop"),
+        _action("body", "loop"),
+    )
+    
+    warnings = analyze_flow(flow)["warnings"]
+    
+    assert {"path": "$.Actions[2]", "message": "Action 'loop' is unreachable"} in warnings
+    assert any(warning["message"].startswith("Cycle without a Loop action") for warning in warnings)
+    assert len([warning for warning in warnings if "Cycle" in warning["message"]]) == 1
+
+
+def test_flow_graph_error_message():
+    """Test that the error lists every issue."""
+    error = FlowGraphError("Main", [{"path": "$", "message": "Missing StartAction"}])
+    
+    assert isinstance(error, ValueError)
+    assert str(error) == "1 graph error(s) in Main: $: Missing StartAction"
+
+
+def test_validate_graph_check():
+    """Test graph check mode validation."""
+    assert validate_graph_check("warn") == "warn"
+    with pytest.raises(ValueError, match="Invalid graph check mode"):
+        validate_graph_check("strict")
+
+
+def test_prune_unreachable():
+    """Test that unreachable actions and their metadata are removed."""
+    flow = _flow(_action("a", "b"), _action("orphan", "b"), _action("b"), _action("island", "island"))
+    flow["Metadata"] = {"ActionMetadata": {"a": {}, "orphan": {"position": {}}, "island": {}}}
+    
+    report = prune_unreachable(flow)
+    
+    assert report == {"removed": ["orphan", "island"]}
+    assert [action["Identifier"] for action in flow["Actions"]] == ["a", "b"]
+    assert flow["Metadata"]["ActionMetadata"] == {"a": {}}
+    assert analyze_flow(flow) == {"errors": [], "warnings": []}
+
+
+def test_prune_unreachable_without_start():
+    """Test that nothing is removed when the start action is unknown."""
+    flow = _flow(_action("a"), _action("b"), start="missing")
+    
+    assert prune_unreachable(flow) == {"removed": []}
+    assert len(flow["Actions"]) == 2
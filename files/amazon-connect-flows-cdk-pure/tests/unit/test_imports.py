@@ -0,0 +1,46 @@
+"""
+Import-time regression tests for the synth and render paths.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+
+def _imported_modules(statement):
+    """Run an import statement in a fresh interpreter and return the loaded top-level packages."""
+    script = f"import json, sys\n{statement}\nprint(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+def test_render_engine_does_not_import_cdk_or_boto3():
+    """Test that the render engine stays free of CDK and AWS SDK imports."""
+    modules = _imported_modules("import utils.connect_flows.render")
+    
+    assert "aws_cdk" not in modules
+    assert "jsii" not in modules
+    assert "boto3" not in modules
+
+
+def test_stacks_package_is_lazy():
+    """Test that importing the stacks package does not load aws_cdk."""
+    assert "aws_cdk" not in _imported_modules("import stacks")
+
+
+def test_app_module_is_lazy():
+    """Test that importing app.py does not load aws_cdk or synthesize."""
+    assert "aws_cdk" not in _imported_modules("import app")
+
+
+def test_stack_module_does_not_import_boto3():
+    """Test that building stacks does not pull in boto3."""
+    assert "boto3" not in _imported_modules("from stacks import ConnectFlowStack")
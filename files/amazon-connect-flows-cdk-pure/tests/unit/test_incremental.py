@@ -0,0 +1,148 @@
+"""
+Unit tests for incremental synth hashes.
+"""
+import json
+import pytest
+from utils.connect_flows.incremental import (
+    MANIFEST_FILENAME,
+    diff_stacks,
+    fingerprint_environment,
+    load_manifest,
+    main,
+    save_manifest
+)
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project with one flow file per line of business."""
+    lobs = ("sales", "support")
+    return make_project(
+        {f"{lob}.json": {"Actions": [{"Identifier": "block-1"}]} for lob in lobs},
+        {
+            f"dev/{lob}": {
+                "instance_name": "test-instance",
+                "flows": [
+                    {
+                        "filename": f"{lob}.json",
+                        "name": f"{lob.title()}MainFlow",
+                        "type": "CONTACT_FLOW",
+                        "parameter_updates": {"block-1": {"Text": "Hello"}}
+                    }
+                ]
+            }
+            for lob in lobs
+        }
+    )
+
+
+def _update_config(project_root, lob, update):
+    """Apply an update function to a config file."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / f"{lob}_flows_config.json"
+    config = json.loads(config_path.read_text())
+    update(config)
+    config_path.write_text(json.dumps(config))
+
+
+def test_fingerprint_is_stable(project_root):
+    """Test that unchanged inputs hash the same."""
+    first = fingerprint_environment(project_root, "dev")
+    
+    assert sorted(first) == ["SalesFlowsStack-dev", "SupportFlowsStack-dev"]
+    assert fingerprint_environment(project_root, "dev") == first
+    assert diff_stacks(first, first) == {}
+
+
+def test_flow_file_change_only_affects_its_stack(project_root):
+    """Test that editing a flow file changes only the stacks that use it."""
+    before = fingerprint_environment(project_root, "dev")
+    (project_root / "flows" / "sales.json").write_text(json.dumps({"Actions": []}))
+    
+    changed = diff_stacks(fingerprint_environment(project_root, "dev"), before)
+    
+    assert changed == {"SalesFlowsStack-dev": {"added": [], "modified": ["SalesMainFlow"], "removed": []}}
+
+
+def test_parameter_updates_change_is_detected(project_root):
+    """Test that changing parameter_updates marks the flow as modified."""
+    before = fingerprint_environment(project_root, "dev")
+    _update_config(
+        project_root, "support",
+        lambda config: config["flows"][0]["parameter_updates"]["block-1"].update(Text="Bye")
+    )
+    
+    changed = diff_stacks(fingerprint_environment(project_root, "dev"), before)
+    
+    assert list(changed) == ["SupportFlowsStack-dev"]
+    assert changed["SupportFlowsStack-dev"]["modified"] == ["SupportMainFlow"]
+
+
+def test_added_and_removed_flows(project_root):
+    """Test that added and removed flows are reported by name."""
+    before = fingerprint_environment(project_root, "dev")
+    
+    def rename(config):
+        config["flows"][0]["name"] = "SalesRenamedFlow"
+    
+    _update_config(project_root, "sales", rename)
+    changed = diff_stacks(fingerprint_environment(project_root, "dev"), before)
+    
+    assert changed == {
+        "SalesFlowsStack-dev": {"added": ["SalesRenamedFlow"], "modified": [], "removed": ["SalesMainFlow"]}
+    }
+
+
+def test_relevant_context_changes_every_stack(project_root):
+    """Test that context values affecting templates change stack hashes, others don't."""
+    before = fingerprint_environment(project_root, "dev")
+    
+    assert diff_stacks(fingerprint_environment(project_root, "dev", {"flowWorkers": "8"}), before) == {}
+    
+    changed = diff_stacks(fingerprint_environment(project_root, "dev", {"stripMetadata": "all"}), before)
+    assert sorted(changed) == ["SalesFlowsStack-dev", "SupportFlowsStack-dev"]
+    assert all(flows == {"added": [], "modified": [], "removed": []} for flows in changed.values())
+
+
+def test_manifest_round_trip_keeps_other_stacks(project_root):
+    """Test that recording one environment keeps the entries of others."""
+    manifest_path = project_root / MANIFEST_FILENAME
+    other = {"SalesFlowsStack-prod": {"environment": "prod", "config": "x", "hash": "h", "flows": {}}}
+    save_manifest(manifest_path, other)
+    
+    current = fingerprint_environment(project_root, "dev")
+    save_manifest(manifest_path, current)
+    
+    assert load_manifest(manifest_path) == dict(other, **current)
+    assert diff_stacks(current, load_manifest(manifest_path)) == {}
+
+
+def test_unusable_manifest_marks_everything_changed(project_root):
+    """Test that a missing, corrupt or outdated manifest is treated as empty."""
+    manifest_path = project_root / MANIFEST_FILENAME
+    assert load_manifest(manifest_path) == {}
+    
+    manifest_path.write_text("{not json")
+    assert load_manifest(manifest_path) == {}
+    
+    manifest_path.write_text(json.dumps({"version": 0, "stacks": {"a": {}}}))
+    assert load_manifest(manifest_path) == {}
+    
+    current = fingerprint_environment(project_root, "dev")
+    assert list(diff_stacks(current, {})) == list(current)
+
+
+def test_cli_reads_context_from_cdk_json(project_root, monkeypatch, capsys):
+    """Test that a template-affecting value in cdk.json marks stacks changed, like -c does."""
+    def run(*args):
+        monkeypatch.setattr("sys.argv", ["incremental", *args, "--env", "dev", "--project-root", str(project_root)])
+        main()
+        return capsys.readouterr().out.split()
+    
+    run("record")
+    assert run("changed") == []
+    
+    (project_root / "cdk.json").write_text(json.dumps({"app": "python3 app.py", "context": {"stripMetadata": "all"}}))
+    
+    assert run("changed") == ["SalesFlowsStack-dev", "SupportFlowsStack-dev"]
+    run("record")
+    assert run("changed") == []
@@ -0,0 +1,130 @@
+"""
+Unit tests for the Connect instance ARN lookup.
+"""
+import json
+import boto3
+import pytest
+from botocore.stub import Stubber
+from utils.connect_flows.instances import InstanceLookup, get_instance_lookup
+
+SALES_ARN = "arn:aws:connect:us-east-1:123456789012:instance/11111111-1111-1111-1111-111111111111"
+SUPPORT_ARN = "arn:aws:connect:us-east-1:123456789012:instance/22222222-2222-2222-2222-222222222222"
+
+
+def _summary(alias, arn):
+    """Build an InstanceSummary."""
+    return {"Id": arn.rsplit("/", 1)[1], "Arn": arn, "InstanceAlias": alias}
+
+
+class StubbedClients:
+    """Client factory handing out stubbed Connect clients with queued ListInstances pages."""
+    
+    def __init__(self):
+        self.client = boto3.client(
+            "connect", region_name="us-east-1", aws_access_key_id="test", aws_secret_access_key="test"
+        )
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        self.regions = []
+    
+    def add_sweep(self, *pages):
+        """Queue the pages of one paginated ListInstances sweep."""
+        for idx, page in enumerate(pages):
+            response = {"InstanceSummaryList": page}
+            if idx < len(pages) - 1:
+                response["NextToken"] = f"page-{idx + 1}"
+            expected = {"NextToken": f"page-{idx}"} if idx else {}
+            self.stubber.add_response("list_instances", response, expected)
+    
+    def __call__(self, region):
+        self.regions.append(region)
+        return self.client
+
+
+@pytest.fixture
+def clients():
+    """Stubbed Connect clients; every queued response must be used."""
+    factory = StubbedClients()
+    yield factory
+    factory.stubber.assert_no_pending_responses()
+
+
+def test_lookup_follows_pagination(clients, tmp_path):
+    """Test that one sweep over every page resolves all aliases."""
+    clients.add_sweep([_summary("sales", SALES_ARN)], [_summary("support", SUPPORT_ARN)])
+    lookup = InstanceLookup(tmp_path / "instances.json", client_factory=clients)
+    
+    assert lookup.lookup("support", "us-east-1") == SUPPORT_ARN
+    assert lookup.lookup("sales", "us-east-1") == SALES_ARN
+    assert lookup.api_calls == 1
+    assert clients.regions == ["us-east-1"]
+
+
+def test_disk_cache_is_shared_between_processes(clients, tmp_path):
+    """Test that a second lookup object is served from the cache file."""
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    InstanceLookup(tmp_path / "instances.json", client_factory=clients).lookup("sales", "us-east-1", "123456789012")
+    
+    def fail(region):
+        raise AssertionError("lookup should have been served from disk")
+    
+    second = InstanceLookup(tmp_path / "instances.json", client_factory=fail)
+    assert second.lookup("sales", "us-east-1", "123456789012") == SALES_ARN
+    
+    entries = json.loads((tmp_path / "instances.json").read_text())["entries"]
+    assert entries["123456789012:us-east-1"]["instances"] == {"sales": SALES_ARN}
+
+
+def test_expired_entries_are_refreshed(clients, tmp_path):
+    """Test that entries older than the TTL trigger a new sweep."""
+    clients.add_sweep([_summary("sales", SUPPORT_ARN)])
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    InstanceLookup(tmp_path / "instances.json", client_factory=clients).lookup("sales", "us-east-1")
+    
+    lookup = InstanceLookup(tmp_path / "instances.json", ttl_seconds=0, client_factory=clients)
+    
+    assert lookup.lookup("sales", "us-east-1") == SALES_ARN
+    assert lookup.api_calls == 1
+
+
+def test_unknown_alias_refreshes_once(clients, tmp_path):
+    """Test that a cached sweep without the alias is refreshed once, then reported."""
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    clients.add_sweep([_summary("sales", SALES_ARN), _summary("support", SUPPORT_ARN)])
+    InstanceLookup(tmp_path / "instances.json", client_factory=clients).lookup("sales", "us-east-1")
+    
+    lookup = InstanceLookup(tmp_path / "instances.json", client_factory=clients)
+    assert lookup.lookup("support", "us-east-1") == SUPPORT_ARN
+    
+    with pytest.raises(ValueError, match="Connect instance 'billing' not found in us-east-1"):
+        lookup.lookup("billing", "us-east-1")
+    assert lookup.api_calls == 1
+
+
+def test_unreadable_cache_file_is_ignored(clients, tmp_path):
+    """Test that a corrupt cache file falls back to the API and is rewritten."""
+    cache_path = tmp_path / "instances.json"
+    cache_path.write_text("{not json")
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    
+    assert InstanceLookup(cache_path, client_factory=clients).lookup("sales", "us-east-1") == SALES_ARN
+    assert json.loads(cache_path.read_text())["version"] == 1
+
+
+def test_clear(clients, tmp_path):
+    """Test that clearing removes the cache file and the in-memory results."""
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    clients.add_sweep([_summary("sales", SALES_ARN)])
+    lookup = InstanceLookup(tmp_path / "instances.json", client_factory=clients)
+    lookup.lookup("sales", "us-east-1")
+    
+    lookup.clear()
+    
+    assert not (tmp_path / "instances.json").exists()
+    lookup.lookup("sales", "us-east-1")
+    assert lookup.api_calls == 2
+
+
+def test_get_instance_lookup_is_shared(tmp_path):
+    """Test that lookups for the same cache file are one instance."""
+    assert get_instance_lookup(tmp_path / "instances.json") is get_instance_lookup(tmp_path / "." / "instances.json")
@@ -0,0 +1,86 @@
+"""
+Unit tests for flow metadata stripping.
+"""
+import pytest
+from utils.connect_flows.minify import strip_metadata
+
+
+@pytest.fixture
+def flow_content():
+    """Return flow content with designer metadata, including an orphan entry."""
+    return {
+        "Version": "2019-10-30",
+        "StartAction": "block-1",
+        "Metadata": {
+            "entryPointPosition": {"x": 20, "y": 20},
+            "snapToGrid": False,
+            "ActionMetadata": {
+                "block-1": {"position": {"x": 100, "y": 100}},
+                "block-2": {"position": {"x": 300, "y": 100}, "parameters": {"QueueId": {"displayName": "Sales"}}},
+                "deleted-block": {"position": {"x": 500, "y": 100}, "parameters": {}}
+            }
+        },
+        "Actions": [
+            {"Identifier": "block-1", "Type": "MessageParticipant", "Parameters": {"Text": "Hi"}},
+            {"Identifier": "block-2", "Type": "TransferToQueue", "Parameters": {}}
+        ]
+    }
+
+
+def test_layout_mode_removes_positions(flow_content):
+    """Test that layout mode keeps only non-layout metadata."""
+    report = strip_metadata(flow_content, mode="layout")
+    
+    assert flow_content["Metadata"] == {
+        "ActionMetadata": {
+            "block-2": {"parameters": {"QueueId": {"displayName": "Sales"}}},
+            "deleted-block": {"parameters": {}}
+        }
+    }
+    assert report["removed_keys"] == 5
+    assert report["orphans"] == []
+
+
+def test_layout_mode_drops_empty_metadata():
+    """Test that Metadata holding only layout data is removed entirely."""
+    flow_content = {
+        "Metadata": {"entryPointPosition": {"x": 1, "y": 1}, "ActionMetadata": {"a": {"position": {}}}},
+        "Actions": [{"Identifier": "a"}]
+    }
+    
+    strip_metadata(flow_content, mode="layout")
+    
+    assert "Metadata" not in flow_content
+
+
+def test_all_mode_removes_metadata(flow_content):
+    """Test that all mode removes Metadata and leaves Actions alone."""
+    actions = list(flow_content["Actions"])
+    
+    strip_metadata(flow_content, mode="all")
+    
+    assert "Metadata" not in flow_content
+    assert flow_content["Actions"] == actions
+
+
+def test_prune_orphans_only(flow_content):
+    """Test removing metadata of blocks that no longer exist."""
+    report = strip_metadata(flow_content, mode="none", prune_orphans=True)
+    
+    assert report["orphans"] == ["deleted-block"]
+    assert set(flow_content["Metadata"]["ActionMetadata"]) == {"block-1", "block-2"}
+    assert flow_content["Metadata"]["snapToGrid"] is False
+
+
+def test_flow_without_metadata():
+    """Test stripping a flow that has no Metadata."""
+    flow_content = {"Actions": []}
+    
+    assert strip_metadata(flow_content, mode="layout")["removed_keys"] == 0
+    assert flow_content == {"Actions": []}
+
+
+def test_invalid_mode(flow_content):
+    """Test that an unknown mode is rejected."""
+    with pytest.raises(ValueError):
+        strip_metadata(flow_content, mode="everything")
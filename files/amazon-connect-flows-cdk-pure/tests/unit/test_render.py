@@ -0,0 +1,291 @@
+"""
+Unit tests for the CDK-independent flow renderer.
+"""
+import json
+import pytest
+from tests.unit.fake_connect import INSTANCE_ARN, FakeConnect
+from utils.connect_flows import render
+from utils.connect_flows.flow_cache import FlowCache
+from utils.connect_flows.graph import FlowGraphError
+from utils.connect_flows.render import FlowRenderer, render_environment, MANIFEST_FILENAME
+from utils.connect_flows.render_cache import RenderCache
+from utils.connect_flows.resources import ResourceResolver
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a minimal project tree with one config and two flows."""
+    flows = {
+        f"sales/{name}_flow.json": {
+            "Version": "2019-10-30",
+            "StartAction": f"{name}-1",
+            "Actions": [
+                {"Identifier": f"{name}-1", "Type": "MessageParticipant", "Parameters": {"Text": "PLACEHOLDER"}}
+            ]
+        }
+        for name in ("main", "hold")
+    }
+    return make_project(flows, {"dev/sales": {
+        "instance_name": "test-instance",
+        "flows": [
+            {
+                "filename": "sales/main_flow.json",
+                "name": "SalesMainFlow",
+                "type": "CONTACT_FLOW",
+                "parameter_updates": {
+                    "main-1": {"Text": "$.Attributes.greeting"},
+                    "missing": {"Text": "x"}
+                }
+            },
+            {
+                "filename": "sales/hold_flow.json",
+                "name": "SalesHoldFlow",
+                "type": "CUSTOMER_HOLD"
+            }
+        ]
+    }})
+
+
+def _flow_configs(project_root):
+    """Load the flow configurations of the test project."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    return json.loads(config_path.read_text())["flows"]
+
+
+def test_render_flow_applies_updates(project_root):
+    """Test rendering a flow with parameter updates."""
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache())
+    
+    flow = renderer.render_flow(_flow_configs(project_root)[0])
+    
+    content = json.loads(flow["content"])
+    assert content["Actions"][0]["Parameters"]["Text"] == "$.Attributes.greeting"
+    assert flow["validation"]["failed_identifiers"] == ["missing"]
+    assert flow["cached"] is False
+
+
+def test_render_flow_uses_render_cache(project_root):
+    """Test that a second render with a render cache is a hit."""
+    render_cache = RenderCache(project_root / ".flowcache")
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache(), render_cache=render_cache)
+    config = _flow_configs(project_root)[0]
+    
+    first = renderer.render_flow(config)
+    second = renderer.render_flow(config)
+    
+    assert second["cached"] is True
+    assert second["content"] == first["content"]
+    assert second["validation"] == first["validation"]
+
+
+def test_render_all_preserves_order(project_root):
+    """Test that threaded rendering yields flows in configuration order."""
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache())
+    configs = _flow_configs(project_root) * 5
+    
+    names = [flow["name"] for _, flow in renderer.render_all(configs, workers=4)]
+    
+    assert names == [config["name"] for config in configs]
+
+
+def test_render_all_raises_first_error(project_root):
+    """Test that a failing flow stops rendering at that flow."""
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache())
+    configs = _flow_configs(project_root)
+    configs.insert(1, {"filename": "sales/missing.json", "name": "Broken", "type": "CONTACT_FLOW"})
+    
+    rendered = []
+    with pytest.raises(FileNotFoundError):
+        for config, flow in renderer.render_all(configs, workers=2):
+            rendered.append(flow["name"])
+    
+    assert rendered == ["SalesMainFlow"]
+
+
+def test_missing_flows_directory(tmp_path):
+    """Test FlowRenderer with a missing flows directory."""
+    with pytest.raises(FileNotFoundError):
+        FlowRenderer(tmp_path / "missing")
+
+
+def test_render_environment_writes_flows_and_manifest(project_root, tmp_path):
+    """Test rendering a whole environment to an output directory."""
+    output_dir = tmp_path / "rendered"
+    
+    manifest = render_environment(project_root, "dev", output_dir=output_dir, use_cache=False)
+    
+    entries = manifest["configs"]["sales_flows_config.json"]["flows"]
+    assert [entry["name"] for entry in entries] == ["SalesMainFlow", "SalesHoldFlow"]
+    assert entries[0]["updated_blocks"] == 1
+    assert entries[0]["failed_identifiers"] == ["missing"]
+    
+    written = output_dir / entries[0]["output"]
+    assert json.loads(written.read_text())["Actions"][0]["Parameters"]["Text"] == "$.Attributes.greeting"
+    assert json.loads((output_dir / MANIFEST_FILENAME).read_text()) == manifest
+
+
+def _use_flow_ref(project_root):
+    """Make the main flow transfer to the hold flow through a symbolic reference."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config = json.loads(config_path.read_text())
+    config["flows"][0]["parameter_updates"] = {"main-1": {"ContactFlowId": {"ref": "flow:SalesHoldFlow"}}}
+    config_path.write_text(json.dumps(config))
+
+
+def test_render_environment_marks_unresolved_refs(project_root):
+    """Test that flows with references are flagged when no instance is available."""
+    _use_flow_ref(project_root)
+    
+    manifest = render_environment(project_root, "dev", use_cache=False)
+    
+    entries = manifest["configs"]["sales_flows_config.json"]["flows"]
+    assert [entry["unresolved_refs"] for entry in entries] == [["flow:SalesHoldFlow"], []]
+
+
+def test_render_environment_resolves_refs(project_root, tmp_path, monkeypatch):
+    """Test that references are replaced with ARNs when an instance ARN is given."""
+    _use_flow_ref(project_root)
+    connect = FakeConnect({"SalesHoldFlow": ("CUSTOMER_HOLD", "{}")})
+    resolver = ResourceResolver(client_factory=lambda region: connect)
+    monkeypatch.setattr(render, "get_resource_resolver", lambda: resolver)
+    output_dir = tmp_path / "rendered"
+    
+    manifest = render_environment(
+        project_root, "dev", output_dir=output_dir, use_cache=False, instance_arn=INSTANCE_ARN
+    )
+    
+    entry = manifest["configs"]["sales_flows_config.json"]["flows"][0]
+    content = json.loads((output_dir / entry["output"]).read_text())
+    assert content["Actions"][0]["Parameters"]["ContactFlowId"] == connect.flows["flow-1"]["Arn"]
+    assert entry["unresolved_refs"] == []
+
+
+def test_render_environment_applies_context(project_root):
+    """Test that cdk.json and -c context settings apply as in a synth, below config file settings."""
+    flow_path = project_root / "flows" / "sales" / "hold_flow.json"
+    content = json.loads(flow_path.read_text())
+    content["Actions"].append({"Identifier": "orphan", "Type": "MessageParticipant", "Parameters": {"Text": "old"}})
+    content["Metadata"] = {"entryPointPosition": {"x": 20, "y": 20}}
+    flow_path.write_text(json.dumps(content))
+    (project_root / "cdk.json").write_text(json.dumps({"context": {"pruneUnreachable": True}}))
+    
+    manifest = render_environment(project_root, "dev", use_cache=False)
+    
+    hold = manifest["configs"]["sales_flows_config.json"]["flows"][1]
+    assert hold["unreachable_removed"] == ["orphan"]
+    assert hold["metadata_bytes_saved"] == 0
+    
+    manifest = render_environment(project_root, "dev", use_cache=False, context={"stripMetadata": "all"})
+    
+    hold = manifest["configs"]["sales_flows_config.json"]["flows"][1]
+    assert hold["unreachable_removed"] == []
+    assert hold["metadata_bytes_saved"] > 0
+
+
+def test_render_environment_resolves_refs_in_the_stack_instance(project_root, monkeypatch):
+    """Test that references resolve in the instance the stack uses, honouring context overrides."""
+    _use_flow_ref(project_root)
+    connect = FakeConnect({"SalesHoldFlow": ("CUSTOMER_HOLD", "{}")})
+    resolver = ResourceResolver(client_factory=lambda region: connect)
+    monkeypatch.setattr(render, "get_resource_resolver", lambda: resolver)
+    
+    manifest = render_environment(
+        project_root, "dev", use_cache=False, resolve_refs=True, context={"connectInstanceArn": INSTANCE_ARN}
+    )
+    
+    assert manifest["configs"]["sales_flows_config.json"]["flows"][0]["unresolved_refs"] == []
+    assert connect.calls == ["list_contact_flows"]
+
+
+def test_render_environment_rejects_invalid_config(project_root):
+    """Test that invalid configurations fail rendering."""
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    config_path.write_text(json.dumps({"instance_name": "test-instance"}))
+    
+    with pytest.raises(ValueError):
+        render_environment(project_root, "dev", use_cache=False)
+
+
+def test_render_flow_strips_metadata(project_root):
+    """Test that a flow's strip_metadata setting removes metadata and reports the saving."""
+    flow_path = project_root / "flows" / "sales" / "hold_flow.json"
+    content = json.loads(flow_path.read_text())
+    content["Metadata"] = {"entryPointPosition": {"x": 20, "y": 20}, "snapToGrid": False}
+    flow_path.write_text(json.dumps(content))
+    
+    render_cache = RenderCache(project_root / ".flowcache")
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache(), render_cache=render_cache)
+    config = dict(_flow_configs(project_root)[1])
+    
+    plain = renderer.render_flow(config)
+    stripped = renderer.render_flow(dict(config, strip_metadata="layout"))
+    
+    assert "Metadata" in json.loads(plain["content"])
+    assert "Metadata" not in json.loads(stripped["content"])
+    assert stripped["cached"] is False
+    assert stripped["report"]["metadata"]["bytes_saved"] == len(plain["content"]) - len(stripped["content"])
+    assert renderer.render_flow(dict(config, strip_metadata="layout"))["report"] == stripped["report"]
+
+
+def test_render_flow_prunes_unreachable_actions(project_root):
+    """Test that prune_unreachable removes orphan blocks and reports the saving."""
+    flow_path = project_root / "flows" / "sales" / "hold_flow.json"
+    content = json.loads(flow_path.read_text())
+    content["Actions"].append({"Identifier": "orphan", "Type": "MessageParticipant", "Parameters": {"Text": "old"}})
+    content["Metadata"] = {"ActionMetadata": {"hold-1": {"position": {"x": 1}}, "orphan": {"position": {"x": 2}}}}
+    flow_path.write_text(json.dumps(content))
+    
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache())
+    config = _flow_configs(project_root)[1]
+    
+    plain = renderer.render_flow(config)
+    pruned = renderer.render_flow(dict(config, prune_unreachable=True))
+    
+    assert "unreachable" not in plain["report"]
+    assert plain["report"]["graph"]["warnings"][0]["message"] == "Action 'orphan' is unreachable"
+    assert [action["Identifier"] for action in json.loads(pruned["content"])["Actions"]] == ["hold-1"]
+    assert list(json.loads(pruned["content"])["Metadata"]["ActionMetadata"]) == ["hold-1"]
+    assert pruned["report"]["unreachable"] == {
+        "removed": ["orphan"],
+        "bytes_saved": len(plain["content"]) - len(pruned["content"])
+    }
+    assert pruned["report"]["graph"]["warnings"] == []
+    
+    both = FlowRenderer(
+        project_root / "flows", flow_cache=FlowCache(), strip_metadata="all", prune_unreachable=True
+    ).render_flow(config)
+    assert both["report"]["unreachable"] == pruned["report"]["unreachable"]
+    assert both["report"]["metadata"]["bytes_saved"] == len(pruned["content"]) - len(both["content"])
+
+
+def test_renderer_default_strip_mode(project_root):
+    """Test that the renderer default applies to flows without their own setting."""
+    renderer = FlowRenderer(project_root / "flows", flow_cache=FlowCache(), strip_metadata="all")
+    configs = _flow_configs(project_root)
+    
+    assert renderer.render_flow(configs[1])["report"]["metadata"]["mode"] == "all"
+    assert "metadata" not in renderer.render_flow(dict(configs[1], strip_metadata="none"))["report"]
+    
+    with pytest.raises(ValueError):
+        FlowRenderer(project_root / "flows", strip_metadata="bogus")
+
+
+def test_render_flow_checks_graph(project_root):
+    """Test that graph errors fail the render, also when it is cached."""
+    flow_path = project_root / "flows" / "sales" / "hold_flow.json"
+    flow = json.loads(flow_path.read_text())
+    flow["Actions"][0]["Transitions"] = {"NextAction": "missing"}
+    flow_path.write_text(json.dumps(flow))
+    config = _flow_configs(project_root)[1]
+    render_cache = RenderCache(project_root / ".flowcache")
+    
+    with pytest.raises(FlowGraphError, match="unknown action 'missing'"):
+        FlowRenderer(project_root / "flows", flow_cache=FlowCache(), render_cache=render_cache).render_flow(config)
+    
+    rendered = FlowRenderer(
+        project_root / "flows", flow_cache=FlowCache(), render_cache=render_cache, graph_check="warn"
+    ).render_flow(config)
+    assert rendered["report"]["graph"]["errors"][0]["path"] == "$.Actions[0].Transitions.NextAction"
+    
+    with pytest.raises(FlowGraphError):
+        FlowRenderer(project_root / "flows", flow_cache=FlowCache(), render_cache=render_cache).render_flow(config)
@@ -0,0 +1,124 @@
+"""
+Unit tests for RenderCache.
+"""
+import pytest
+from utils.connect_flows.render_cache import RenderCache, get_render_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a render cache in a temporary directory."""
+    return RenderCache(tmp_path / ".flowcache")
+
+
+def test_miss_then_hit(cache):
+    """Test that a stored entry is returned for the same key."""
+    assert cache.get("flow", "updates") is None
+    
+    cache.put("flow", "updates", '{"Actions":[]}', {"updated_blocks": 0})
+    entry = cache.get("flow", "updates")
+    
+    assert entry["content"] == '{"Actions":[]}'
+    assert entry["validation"] == {"updated_blocks": 0}
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_keys_are_independent(cache):
+    """Test that a different flow or updates hash misses."""
+    cache.put("flow", "updates", "content")
+    
+    assert cache.get("flow", "other-updates") is None
+    assert cache.get("other-flow", "updates") is None
+
+
+def test_hash_updates_ignores_key_order():
+    """Test that equivalent parameter updates hash the same."""
+    first = {"a": {"Text": "1", "Extra": "2"}, "b": {"Text": "3"}}
+    second = {"b": {"Text": "3"}, "a": {"Extra": "2", "Text": "1"}}
+    
+    assert RenderCache.hash_updates(first) == RenderCache.hash_updates(second)
+    assert RenderCache.hash_updates(None) == RenderCache.hash_updates({})
+    assert RenderCache.hash_updates(first) != RenderCache.hash_updates({"a": {"Text": "1"}})
+
+
+def test_hash_file(tmp_path):
+    """Test that file hashes follow the file contents."""
+    path = tmp_path / "flow.json"
+    path.write_text('{"Actions": []}')
+    before = RenderCache.hash_file(path)
+    
+    path.write_text('{"Actions": [1]}')
+    
+    assert RenderCache.hash_file(path) != before
+
+
+def test_corrupt_entry_is_a_miss(cache):
+    """Test that an unreadable entry is ignored instead of failing."""
+    cache.put("flow", "updates", "content")
+    entry_path = next(cache.entries_dir.rglob("*.json"))
+    entry_path.write_text("{not json")
+    
+    # A new process has nothing in memory and reads the entry from disk
+    assert RenderCache(cache.cache_dir).get("flow", "updates") is None
+
+
+def test_failed_write_leaves_no_temporary_file(cache, monkeypatch):
+    """Test that a write that fails halfway is cleaned up and doesn't fail the caller."""
+    def fail(entry, f):
+        f.write("{partial")
+        raise OSError("disk full")
+    
+    monkeypatch.setattr("utils.connect_flows.render_cache.json.dump", fail)
+    cache.put("flow", "updates", "content")
+    
+    assert not [path for path in cache.entries_dir.rglob("*") if path.is_file()]
+    assert cache.get("flow", "updates")["content"] == "content"
+
+
+def test_entries_are_served_from_memory(cache):
+    """Test that entries seen by this process are not read from disk again."""
+    cache.put("flow", "updates", "content", {"updated_blocks": 1})
+    for entry_path in cache.entries_dir.rglob("*.json"):
+        entry_path.unlink()
+    
+    entry = cache.get("flow", "updates")
+    
+    assert entry["content"] == "content"
+    assert entry["validation"] == {"updated_blocks": 1}
+    assert cache.memory_hits == 1
+    
+    reader = RenderCache(cache.cache_dir)
+    reader.put("flow", "updates", "content")
+    reader.get("flow", "updates")
+    assert reader.memory_hits == 1
+
+
+def test_memory_is_bounded(tmp_path):
+    """Test that least recently used entries are evicted from memory."""
+    cache = RenderCache(tmp_path / ".flowcache", max_memory_bytes=10)
+    cache.put("flow-1", "updates", "x" * 6)
+    cache.put("flow-2", "updates", "y" * 6)
+    
+    cache.get("flow-2", "updates")
+    cache.get("flow-1", "updates")
+    
+    assert cache.memory_hits == 1
+    assert cache.hits == 2
+
+
+def test_clear_and_stats(cache):
+    """Test clearing the cache."""
+    cache.put("flow-1", "updates", "content")
+    cache.put("flow-2", "updates", "content")
+    
+    assert cache.stats()["entries"] == 2
+    assert cache.clear() == 2
+    assert cache.stats()["entries"] == 0
+    assert cache.get("flow-1", "updates") is None
+
+
+def test_get_render_cache_is_shared_per_directory(tmp_path):
+    """Test that one instance is shared per cache directory."""
+    assert get_render_cache(tmp_path / "a") is get_render_cache(tmp_path / "a")
+    assert get_render_cache(tmp_path / "a") is not get_render_cache(tmp_path / "b")
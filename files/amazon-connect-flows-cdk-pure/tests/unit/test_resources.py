@@ -0,0 +1,115 @@
+"""
+Unit tests for symbolic resource reference resolution.
+"""
+import boto3
+import pytest
+from botocore.stub import Stubber
+from utils.connect_flows.resources import ResourceResolver, find_refs, parse_ref
+
+INSTANCE_ID = "11111111-1111-1111-1111-111111111111"
+INSTANCE_ARN = f"arn:aws:connect:eu-west-2:123456789012:instance/{INSTANCE_ID}"
+
+
+def _arn(kind, name):
+    """Build the ARN of an instance resource."""
+    return f"{INSTANCE_ARN}/{kind}/{name.lower()}-id"
+
+
+def _summary(kind, name):
+    """Build a resource summary."""
+    return {"Id": f"{name.lower()}-id", "Arn": _arn(kind, name), "Name": name}
+
+
+@pytest.fixture
+def connect():
+    """A stubbed Connect client; every queued response must be used."""
+    client = boto3.client(
+        "connect", region_name="eu-west-2", aws_access_key_id="test", aws_secret_access_key="test"
+    )
+    with Stubber(client) as stubber:
+        yield client, stubber
+        stubber.assert_no_pending_responses()
+
+
+def test_parse_ref():
+    """Test reference parsing."""
+    assert parse_ref({"ref": "queue:Sales Queue"}) == ("queue", "Sales Queue")
+    assert parse_ref("queue:SalesQueue") is None
+    assert parse_ref({"ref": "queue:SalesQueue", "other": 1}) is None
+    with pytest.raises(ValueError, match="Invalid resource reference 'table:x'"):
+        parse_ref({"ref": "table:x"})
+    with pytest.raises(ValueError):
+        parse_ref({"ref": "queue:"})
+
+
+def test_find_refs_walks_nested_values():
+    """Test that references anywhere in the updates are found."""
+    updates = {
+        "block-1": {"QueueId": {"ref": "queue:Sales"}},
+        "block-2": {"Messages": [{"PromptId": {"ref": "prompt:Welcome"}}], "Text": "$.Attributes.x"},
+        "block-3": {"QueueId": {"ref": "queue:Sales"}}
+    }
+    
+    assert find_refs(updates) == {("queue", "Sales"), ("prompt", "Welcome")}
+
+
+def test_resolve_sweeps_each_type_once(connect):
+    """Test that every reference is resolved with one paginated sweep per type."""
+    client, stubber = connect
+    # Types are swept in sorted order
+    stubber.add_response(
+        "list_prompts",
+        {"PromptSummaryList": [_summary("prompt", "Welcome")]},
+        {"InstanceId": INSTANCE_ID}
+    )
+    stubber.add_response(
+        "list_queues",
+        {"QueueSummaryList": [_summary("queue", "Sales")], "NextToken": "next"},
+        {"InstanceId": INSTANCE_ID}
+    )
+    stubber.add_response(
+        "list_queues",
+        {"QueueSummaryList": [_summary("queue", "Support")]},
+        {"InstanceId": INSTANCE_ID, "NextToken": "next"}
+    )
+    regions = []
+    resolver = ResourceResolver(client_factory=lambda region: regions.append(region) or client)
+    
+    updates = {
+        "block-1": {"QueueId": {"ref": "queue:Sales"}, "Text": "$.Attributes.x"},
+        "block-2": {"QueueId": {"ref": "queue:Support"}, "PromptId": {"ref": "prompt:Welcome"}}
+    }
+    resolved = resolver.resolve(updates, INSTANCE_ARN)
+    again = resolver.resolve({"block-9": {"QueueId": {"ref": "queue:Support"}}}, INSTANCE_ARN)
+    
+    assert resolved == {
+        "block-1": {"QueueId": _arn("queue", "Sales"), "Text": "$.Attributes.x"},
+        "block-2": {"QueueId": _arn("queue", "Support"), "PromptId": _arn("prompt", "Welcome")}
+    }
+    assert updates["block-1"]["QueueId"] == {"ref": "queue:Sales"}
+    assert again == {"block-9": {"QueueId": _arn("queue", "Support")}}
+    assert resolver.api_calls == 2
+    assert regions == ["eu-west-2", "eu-west-2"]
+
+
+def test_updates_without_refs_make_no_calls():
+    """Test that plain updates are returned as they are."""
+    def fail(region):
+        raise AssertionError("no client should be created")
+    
+    updates = {"block-1": {"Text": "$.Attributes.greeting"}}
+    
+    assert ResourceResolver(client_factory=fail).resolve(updates, INSTANCE_ARN) is updates
+
+
+def test_unknown_names_are_reported_together(connect):
+    """Test that every missing reference is listed in one error."""
+    client, stubber = connect
+    stubber.add_response("list_contact_flows", {"ContactFlowSummaryList": []}, {"InstanceId": INSTANCE_ID})
+    stubber.add_response("list_queues", {"QueueSummaryList": [_summary("queue", "Sales")]}, {"InstanceId": INSTANCE_ID})
+    resolver = ResourceResolver(client_factory=lambda region: client)
+    
+    updates = {"block-1": {"QueueId": {"ref": "queue:Billing"}, "ContactFlowId": {"ref": "flow:Transfer"}}}
+    
+    with pytest.raises(ValueError, match="flow:Transfer, queue:Billing"):
+        resolver.resolve(updates, INSTANCE_ARN)
@@ -0,0 +1,96 @@
+"""
+Unit tests for config schema validation.
+"""
+import json
+from utils.connect_flows.schema import ConfigValidationError, format_error, validate_config, validate_config_text
+
+
+VALID_CONFIG = {
+    "instance_name": "test-instance",
+    "strip_metadata": "layout",
+    "flows": [
+        {
+            "filename": "sales/main.json",
+            "name": "SalesMainFlow",
+            "type": "CONTACT_FLOW",
+            "parameter_updates": {"block-1": {"Text": "Hello"}},
+            "shard": 0
+        }
+    ]
+}
+
+INVALID_TEXT = """{
+  "instance_name": "",
+  "flows": [
+    {"filename": "a.json", "name": "A", "type": "NOPE", "shard": -1},
+    {"name": "A", "type": "TRANSFER", "prune_orphan_metadata": "yes"}
+  ],
+  "strip_metadata": true
+}"""
+
+
+def test_valid_config_has_no_errors():
+    """Test that a valid config passes."""
+    assert validate_config(VALID_CONFIG) == []
+    assert validate_config_text(json.dumps(VALID_CONFIG)) == (VALID_CONFIG, [])
+
+
+def test_every_error_is_reported_with_its_location():
+    """Test that one pass reports every error with path, line and column."""
+    _, errors = validate_config_text(INVALID_TEXT)
+    
+    assert [(error["path"], error["line"], error["column"]) for error in errors] == [
+        ("$.instance_name", 2, 20),
+        ("$.flows[0].type", 4, 49),
+        ("$.flows[0].shard", 4, 66),
+        ("$.flows[1]", 5, 5),
+        ("$.flows[1].prune_orphan_metadata", 5, 64),
+        ("$.flows[1].name", 5, 14),
+        ("$.strip_metadata", 7, 21)
+    ]
+    assert errors[3]["message"] == "Missing required key 'filename'"
+    assert errors[5]["message"] == "Duplicate name 'A' (first used at index 0)"
+
+
+def test_type_errors_stop_descent():
+    """Test that a value of the wrong type is reported once, without nested errors."""
+    assert [error["path"] for error in validate_config({"instance_name": 1, "flows": {}})] == [
+        "$.instance_name", "$.flows"
+    ]
+    assert [error["message"] for error in validate_config([])] == ["Must be an object"]
+    
+    config = dict(VALID_CONFIG, flows=[dict(VALID_CONFIG["flows"][0], shard=True)])
+    assert [error["path"] for error in validate_config(config)] == ["$.flows[0].shard"]
+
+
+def test_invalid_json_is_located():
+    """Test that JSON syntax errors carry their line and column."""
+    config, errors = validate_config_text('{\n  "flows": [1,]\n}')
+    
+    assert config is None
+    assert (errors[0]["line"], errors[0]["column"]) == (2, 15)
+    assert format_error("dev/x.json", errors[0]).startswith("dev/x.json:2:15: $: Invalid JSON")
+
+
+def test_positions_handle_escapes_and_nesting():
+    """Test that positions are found after escaped strings and nested values."""
+    text = (
+        '{"flows": [{"filename": "a\\\\\\"b.json", "name": "A", "type": "X",\n'
+        ' "parameter_updates": {"k": [1, {"x": "}"}]}}], "instance_name": "i"}'
+    )
+    
+    _, errors = validate_config_text(text)
+    
+    assert [(error["path"], error["line"], error["column"]) for error in errors] == [
+        ("$.flows[0].type", 1, text.index('"X"') + 1)
+    ]
+
+
+def test_config_validation_error_lists_every_error():
+    """Test that the loader's exception is a ValueError carrying every error."""
+    _, errors = validate_config_text(INVALID_TEXT)
+    error = ConfigValidationError("sales_flows_config.json", errors)
+    
+    assert isinstance(error, ValueError)
+    assert str(error).startswith("7 error(s) in sales_flows_config.json:")
+    assert "sales_flows_config.json:4:49: $.flows[0].type" in str(error)
@@ -0,0 +1,97 @@
+"""
+Unit tests for canonical flow serialization.
+"""
+import json
+import pytest
+from utils.connect_flows import serialization
+from utils.connect_flows.serialization import canonical_hash, dumps_flow, get_backend, serializer_id
+
+FLOW_CONTENT = {
+    "Version": "2019-10-30",
+    "StartAction": "block-1",
+    "Metadata": {"entryPointPosition": {"x": 20, "y": 20}, "snapToGrid": False},
+    "Actions": [
+        {
+            "Identifier": "block-1",
+            "Type": "MessageParticipant",
+            "Parameters": {"Text": "Grüße – \"hello\"\n"},
+            "Transitions": {"NextAction": "block-2", "Errors": [], "Conditions": []}
+        },
+        {"Identifier": "block-2", "Type": "DisconnectParticipant", "Parameters": {}, "Transitions": {}}
+    ]
+}
+
+
+@pytest.fixture(params=["stdlib", "orjson"])
+def backend(request, monkeypatch):
+    """Run a test once per available serialization backend."""
+    if request.param == "orjson" and serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setenv(serialization.BACKEND_ENV_VAR, request.param)
+    return request.param
+
+
+def test_dumps_flow_is_compact_and_sorted(backend):
+    """Test that output has no whitespace between tokens and sorted keys."""
+    output = dumps_flow({"b": 1, "a": {"d": [1, 2], "c": None}})
+    
+    assert output == '{"a":{"c":null,"d":[1,2]},"b":1}'
+
+
+def test_dumps_flow_ignores_key_order(backend):
+    """Test that reordered input serializes to the same bytes."""
+    reordered = json.loads(json.dumps(FLOW_CONTENT, sort_keys=True))
+    reordered["Actions"][0] = dict(reversed(list(reordered["Actions"][0].items())))
+    
+    assert dumps_flow(reordered) == dumps_flow(FLOW_CONTENT)
+    assert json.loads(dumps_flow(FLOW_CONTENT)) == FLOW_CONTENT
+
+
+def test_dumps_flow_indent(backend):
+    """Test indented output."""
+    output = dumps_flow(FLOW_CONTENT, indent=2)
+    
+    assert output.startswith('{\n  "Actions": [')
+    assert json.loads(output) == FLOW_CONTENT
+    assert dumps_flow(FLOW_CONTENT, indent=4).startswith('{\n    "Actions"')
+
+
+def test_backends_produce_identical_output(monkeypatch):
+    """Test that orjson and the stdlib agree on flow content."""
+    if serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    
+    outputs = {}
+    for name in ("stdlib", "orjson"):
+        monkeypatch.setenv(serialization.BACKEND_ENV_VAR, name)
+        outputs[name] = (dumps_flow(FLOW_CONTENT), dumps_flow(FLOW_CONTENT, indent=2))
+    
+    assert outputs["orjson"] == outputs["stdlib"]
+
+
+def test_orjson_falls_back_for_unsupported_values(monkeypatch):
+    """Test that values orjson cannot encode are serialized by the stdlib."""
+    if serialization.orjson is None:
+        pytest.skip("orjson not installed")
+    monkeypatch.setenv(serialization.BACKEND_ENV_VAR, "orjson")
+    
+    assert dumps_flow({"big": 2 ** 70}) == '{"big":1180591620717411303424}'
+
+
+def test_invalid_backend(monkeypatch):
+    """Test that an unknown backend is rejected."""
+    monkeypatch.setenv(serialization.BACKEND_ENV_VAR, "yaml")
+    
+    with pytest.raises(ValueError):
+        get_backend()
+
+
+def test_serializer_id_tracks_backend(backend):
+    """Test that the serializer id names the backend."""
+    assert serializer_id().startswith(backend)
+
+
+def test_canonical_hash(backend):
+    """Test that canonical hashes ignore key order."""
+    assert canonical_hash({"a": 1, "b": 2}) == canonical_hash({"b": 2, "a": 1})
+    assert canonical_hash({"a": 1}) != canonical_hash({"a": 2})
@@ -0,0 +1,78 @@
+"""
+Unit tests for the settings shared by the stack and the direct API commands.
+"""
+import json
+import pytest
+from utils.connect_flows import settings
+from utils.connect_flows.instances import DEFAULT_TTL_SECONDS
+from utils.connect_flows.settings import (
+    instance_name,
+    load_context,
+    parse_context,
+    render_options,
+    resolve_instance_arn
+)
+
+INSTANCE_ARN = "arn:aws:connect:eu-west-2:123456789012:instance/test-instance-id"
+
+
+def test_parse_context():
+    """Test parsing of -c key=value arguments."""
+    assert parse_context(["stripMetadata=all", "queueArn=a=b"]) == {"stripMetadata": "all", "queueArn": "a=b"}
+    with pytest.raises(ValueError):
+        parse_context(["stripMetadata"])
+
+
+def test_load_context_reads_cdk_json_then_overrides(tmp_path):
+    """Test that -c values win over cdk.json, like the CDK CLI."""
+    assert load_context(tmp_path) == {}
+    
+    (tmp_path / "cdk.json").write_text(json.dumps({
+        "app": "python3 app.py",
+        "context": {"stripMetadata": "layout", "pruneUnreachable": True}
+    }))
+    
+    assert load_context(tmp_path, {"stripMetadata": "all"}) == {"stripMetadata": "all", "pruneUnreachable": True}
+
+
+def test_render_options_precedence():
+    """Test that config values win over context values and context flags accept strings."""
+    context = {"stripMetadata": "all", "pruneOrphanMetadata": "true", "pruneUnreachable": True}
+    
+    assert render_options({}, context) == {
+        "strip_metadata": "all",
+        "prune_orphan_metadata": True,
+        "prune_unreachable": True,
+        "graph_check": "error"
+    }
+    assert render_options({"strip_metadata": "none", "prune_unreachable": False}, context)["prune_unreachable"] is False
+    assert render_options({}, {}) == {
+        "strip_metadata": "none",
+        "prune_orphan_metadata": False,
+        "prune_unreachable": False,
+        "graph_check": "error"
+    }
+
+
+def test_instance_resolution(tmp_path, monkeypatch):
+    """Test the ARN override, the name override and the cache TTL."""
+    calls = []
+    
+    class Lookup:
+        def lookup(self, alias, region, account):
+            calls.append((alias, region, account))
+            return INSTANCE_ARN
+    
+    monkeypatch.setattr(settings, "get_instance_lookup", lambda cache_path, ttl: calls.append(ttl) or Lookup())
+    config = {"instance_name": "dev-instance"}
+    
+    assert resolve_instance_arn(tmp_path, config, {"connectInstanceArn": "arn:override"}) == "arn:override"
+    assert calls == []
+    
+    assert resolve_instance_arn(tmp_path, config, {"instanceCacheTtl": 0}, "eu-west-2") == INSTANCE_ARN
+    assert resolve_instance_arn(tmp_path, config, {"connectInstanceName": "other"}) == INSTANCE_ARN
+    assert calls == [0.0, ("dev-instance", "eu-west-2", None), DEFAULT_TTL_SECONDS, ("other", None, None)]
+    assert instance_name(config, {}) == "dev-instance"
+    
+    with pytest.raises(ValueError, match="connectInstanceName"):
+        resolve_instance_arn(tmp_path, {}, {})
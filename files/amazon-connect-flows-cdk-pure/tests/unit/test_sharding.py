@@ -0,0 +1,114 @@
+"""
+Unit tests for flow sharding.
+"""
+import json
+import pytest
+from utils.connect_flows.sharding import (
+    FLOW_OVERHEAD_BYTES,
+    MAX_OUTPUTS,
+    MAX_TEMPLATE_BYTES,
+    check_template_limits,
+    estimate_flow_bytes,
+    plan_shards,
+    shard_for
+)
+
+
+def _flows(*sizes):
+    """Build flow size entries named Flow0, Flow1, ..."""
+    return [{'name': f"Flow{i}", 'bytes': size} for i, size in enumerate(sizes)]
+
+
+def test_estimate_flow_bytes_counts_escaping():
+    """Test that the estimate accounts for the content being embedded as a string."""
+    content = json.dumps({"Text": "say \"hi\""})
+    
+    assert estimate_flow_bytes(content) > len(content) + FLOW_OVERHEAD_BYTES
+
+
+def test_shard_for_is_stable_and_balanced():
+    """Test that a name always hashes to the same shard and names spread across shards."""
+    counts = [0] * 4
+    for i in range(400):
+        index = shard_for(f"Flow{i}", 4)
+        assert index == shard_for(f"Flow{i}", 4)
+        counts[index] += 1
+    
+    assert min(counts) > 60
+    assert shard_for("SalesMainFlow", 1) == 0
+
+
+def test_shard_for_growing_the_count_only_moves_flows_to_new_shards():
+    """Test that jump hashing never shuffles flows between existing shards."""
+    for i in range(200):
+        assert shard_for(f"Flow{i}", 5) in (shard_for(f"Flow{i}", 4), 4)
+
+
+def test_plan_shards_depends_on_names_only():
+    """Test that growing, removing or reordering one flow leaves every other flow in its shard."""
+    def assignment(flows):
+        shards = plan_shards(flows, shard_count=3, max_bytes=1000, max_flows=10)
+        return {name: index for index, names in enumerate(shards) for name in names}
+    
+    before = assignment(_flows(400, 400, 400, 400))
+    grown = _flows(400, 400, 400, 400)
+    grown[0]['bytes'] = 700
+    
+    assert assignment(grown) == before
+    assert assignment(list(reversed(_flows(400, 400, 400, 400)))) == before
+    assert assignment(_flows(400, 400, 400, 400)[1:]) == {name: before[name] for name in ("Flow1", "Flow2", "Flow3")}
+
+
+def test_plan_shards_keeps_config_order_within_a_shard():
+    """Test that flows of one shard are listed in configuration order."""
+    shards = plan_shards(_flows(1, 1, 1, 1, 1), shard_count=1)
+    
+    assert shards == [["Flow0", "Flow1", "Flow2", "Flow3", "Flow4"]]
+
+
+def test_plan_shards_over_budget_warns_without_moving(caplog):
+    """Test that a shard over its budget is reported instead of spilling flows into another shard."""
+    shards = plan_shards(_flows(40, 40, 40), shard_count=1, max_bytes=100, max_flows=2)
+    
+    assert shards == [["Flow0", "Flow1", "Flow2"]]
+    assert "over the budget" in caplog.text
+
+
+def test_plan_shards_over_template_limits_fails():
+    """Test that a shard CloudFormation would reject fails the plan."""
+    with pytest.raises(ValueError, match="Pin some of its flows"):
+        plan_shards(_flows(MAX_TEMPLATE_BYTES // 2, MAX_TEMPLATE_BYTES // 2 + 1), shard_count=1)
+
+
+def test_plan_shards_pins():
+    """Test that pinned flows go to their shard, beyond the shard count if needed."""
+    flows = _flows(60, 60, 60)
+    flows[2]['shard'] = 3
+    
+    shards = plan_shards(flows, shard_count=1)
+    
+    assert shards == [["Flow0", "Flow1"], [], [], ["Flow2"]]
+
+
+def test_plan_shards_invalid_pins():
+    """Test that invalid pins are rejected."""
+    for pin in (-1, "1", True):
+        flows = _flows(60, 60)
+        flows[0]['shard'] = pin
+        with pytest.raises(ValueError):
+            plan_shards(flows, shard_count=2)
+
+
+def test_plan_shards_invalid_bounds():
+    """Test that non-positive bounds are rejected."""
+    with pytest.raises(ValueError):
+        plan_shards(_flows(1), shard_count=0)
+    with pytest.raises(ValueError):
+        plan_shards(_flows(1), shard_count=1, max_bytes=0)
+
+
+def test_check_template_limits():
+    """Test detection of template size and output limits."""
+    assert check_template_limits(_flows(100, 100)) == []
+    assert len(check_template_limits(_flows(MAX_TEMPLATE_BYTES, 1))) == 1
+    assert len(check_template_limits(_flows(*[1] * (MAX_OUTPUTS + 1)))) == 1
@@ -0,0 +1,156 @@
+"""
+Unit tests for cached, parallel file validation.
+"""
+import json
+import os
+import xml.etree.ElementTree as ET
+import pytest
+from utils.connect_flows import validation
+from utils.connect_flows.validation import main, run_validation, validate_config_source, validate_flow_source
+
+
+MAIN_FLOW = {
+    "Version": "2019-10-30",
+    "StartAction": "block-1",
+    "Actions": [{"Identifier": "block-1", "Type": "DisconnectParticipant", "Transitions": {}}]
+}
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project with valid and invalid configs and flows."""
+    return make_project(
+        {"sales/main.json": MAIN_FLOW, "sales/broken.json": '{"Actions": [}'},
+        {
+            "dev/sales": {
+                "instance_name": "test-instance",
+                "flows": [
+                    {"filename": "sales/main.json", "name": "SalesMainFlow", "type": "CONTACT_FLOW"},
+                    {"filename": "sales/missing.json", "name": "SalesMissingFlow", "type": "CONTACT_FLOW"}
+                ]
+            },
+            "dev/support": {"instance_name": "", "flows": []}
+        }
+    )
+
+
+def _by_file(results):
+    """Index results by file."""
+    return {result["file"]: result for result in results}
+
+
+def test_results_and_reference_check(project_root):
+    """Test that every file gets a result and missing flow files are reported."""
+    results = _by_file(run_validation(project_root))
+    
+    assert [file for file, result in results.items() if not result["valid"]] == [
+        "config/connect_flows/dev/sales_flows_config.json",
+        "config/connect_flows/dev/support_flows_config.json",
+        "flows/sales/broken.json"
+    ]
+    sales = results["config/connect_flows/dev/sales_flows_config.json"]
+    assert [error["message"] for error in sales["errors"]] == ["Flow file not found: flows/sales/missing.json"]
+    assert results["flows/sales/broken.json"]["errors"][0]["line"] == 1
+
+
+def test_flow_graph_checks():
+    """Test that flow files get the graph checks."""
+    flow = dict(MAIN_FLOW, StartAction="missing")
+    
+    result = validate_flow_source(json.dumps(flow))
+    
+    assert [error["message"] for error in result["errors"]] == ["StartAction 'missing' is not an action"]
+    assert result["warnings"] == []
+
+
+def test_invalid_resource_refs_are_reported():
+    """Test that malformed resource references in parameter_updates are errors."""
+    config = {
+        "instance_name": "test",
+        "flows": [{
+            "filename": "sales/main.json",
+            "name": "Main",
+            "type": "CONTACT_FLOW",
+            "parameter_updates": {"block-1": {"QueueId": {"ref": "queues:Sales"}}}
+        }]
+    }
+    
+    result = validate_config_source(json.dumps(config))
+    
+    assert [error["path"] for error in result["errors"]] == ["$.flows[0].parameter_updates"]
+    assert "Invalid resource reference 'queues:Sales'" in result["errors"][0]["message"]
+
+
+def test_unchanged_files_are_served_from_cache(project_root, monkeypatch):
+    """Test that a second run only validates files that changed."""
+    run_validation(project_root)
+    
+    validated = []
+    original = validation._validate_file
+    monkeypatch.setattr(validation, "_validate_file", lambda task: validated.append(task[1]) or original(task))
+    
+    results = run_validation(project_root)
+    assert validated == []
+    assert all(result["cached"] for result in results)
+    
+    # Touching a file without changing it is recognised by its content hash
+    main_flow = project_root / "flows" / "sales" / "main.json"
+    os.utime(main_flow, ns=(0, main_flow.stat().st_mtime_ns + 1_000_000_000))
+    run_validation(project_root)
+    assert validated == []
+    
+    main_flow.write_text(json.dumps({key: value for key, value in MAIN_FLOW.items() if key != "Version"}))
+    results = _by_file(run_validation(project_root))
+    assert validated == [str(main_flow)]
+    assert results["flows/sales/main.json"]["warnings"]
+    assert results["config/connect_flows/dev/sales_flows_config.json"]["cached"]
+
+
+def test_rule_changes_invalidate_the_cache(project_root, monkeypatch):
+    """Test that cached results are dropped when the validation rules change."""
+    run_validation(project_root)
+    monkeypatch.setattr(validation, "rules_hash", lambda: "new-rules")
+    
+    assert not any(result["cached"] for result in run_validation(project_root))
+
+
+def test_process_pool_matches_serial(project_root):
+    """Test that validating on worker processes gives the same results."""
+    serial = run_validation(project_root, use_cache=False)
+    parallel = run_validation(project_root, workers=2, use_cache=False)
+    
+    assert parallel == serial
+
+
+def test_deleted_files_are_pruned(project_root):
+    """Test that cache entries of deleted files are removed."""
+    run_validation(project_root)
+    (project_root / "flows" / "sales" / "broken.json").unlink()
+    run_validation(project_root)
+    
+    cache = json.loads((project_root / ".flowcache" / "validation.json").read_text())
+    assert "flows/sales/broken.json" not in cache["entries"]
+    assert "flows/sales/main.json" in cache["entries"]
+
+
+def test_json_and_junit_reports(project_root, tmp_path, capsys):
+    """Test machine-readable reports and exit codes."""
+    assert main(["configs", "--project-root", str(project_root), "--format", "json"]) == 1
+    report = json.loads(capsys.readouterr().out)
+    assert report["valid"] is False
+    assert {result["kind"] for result in report["results"]} == {"configs"}
+    
+    output = tmp_path / "report.xml"
+    assert main(["--project-root", str(project_root), "--format", "junit", "--output", str(output)]) == 1
+    suites = ET.fromstring(output.read_text())
+    assert [(suite.get("name"), suite.get("tests"), suite.get("failures")) for suite in suites] == [
+        ("configs", "2", "2"), ("flows", "2", "1")
+    ]
+
+
+def test_text_output_and_exit_code(project_root, capsys):
+    """Test the human-readable output of a valid run."""
+    (project_root / "flows" / "sales" / "broken.json").unlink()
+    
+    assert main(["flows", "--project-root", str(project_root)]) == 0
+    assert "✅ flows/sales/main.json: Valid" in capsys.readouterr().out
@@ -0,0 +1,161 @@
+"""
+Unit tests for the flow watcher.
+"""
+import json
+import os
+import pytest
+from utils.connect_flows.watch import FlowWatcher, format_result
+
+
+def _write(path, content):
+    """Write JSON and move the mtime forward so the change is always seen."""
+    path.write_text(json.dumps(content))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def _flow(text):
+    """Build a one-block flow."""
+    return {
+        "StartAction": "block-1",
+        "Actions": [{"Identifier": "block-1", "Type": "MessageParticipant", "Parameters": {"Text": text}}]
+    }
+
+
+@pytest.fixture
+def project_root(make_project):
+    """Create a project with a shared flow file and a flow of its own per config."""
+    return make_project(
+        {"shared.json": _flow("shared"), "sales.json": _flow("sales")},
+        {f"dev/{lob}": _config(lob) for lob in ("sales", "support")}
+    )
+
+
+def _config(lob, greeting="Hello"):
+    """Build a config using the shared flow, plus sales.json for sales."""
+    flows = [{
+        "filename": "shared.json",
+        "name": f"{lob.title()}SharedFlow",
+        "type": "CONTACT_FLOW",
+        "parameter_updates": {"block-1": {"Text": greeting}}
+    }]
+    if lob == "sales":
+        flows.append({"filename": "sales.json", "name": "SalesOwnFlow", "type": "CONTACT_FLOW"})
+    return {"instance_name": "test-instance", "flows": flows}
+
+
+def _rendered(results):
+    """Return (config, flow, status) of every result."""
+    return [(result["config"], result["flow"], result["status"]) for result in results]
+
+
+def test_first_poll_renders_everything_then_nothing(project_root):
+    """Test that the first poll renders every flow and an idle poll renders none."""
+    watcher = FlowWatcher(project_root)
+    
+    assert _rendered(watcher.poll()) == [
+        ("sales_flows_config.json", "SalesOwnFlow", "ok"),
+        ("sales_flows_config.json", "SalesSharedFlow", "ok"),
+        ("support_flows_config.json", "SupportSharedFlow", "ok")
+    ]
+    assert watcher.poll() == []
+
+
+def test_flow_file_change_renders_its_users(project_root):
+    """Test that a changed flow file re-renders only the flows using it."""
+    watcher = FlowWatcher(project_root)
+    watcher.poll()
+    
+    _write(project_root / "flows" / "shared.json", _flow("changed"))
+    assert _rendered(watcher.poll()) == [
+        ("sales_flows_config.json", "SalesSharedFlow", "ok"),
+        ("support_flows_config.json", "SupportSharedFlow", "ok")
+    ]
+    
+    _write(project_root / "flows" / "sales.json", _flow("changed"))
+    assert _rendered(watcher.poll()) == [("sales_flows_config.json", "SalesOwnFlow", "ok")]
+
+
+def test_config_change_renders_changed_entries(project_root):
+    """Test that a config change re-renders only the entries that changed."""
+    watcher = FlowWatcher(project_root)
+    watcher.poll()
+    config_path = project_root / "config" / "connect_flows" / "dev" / "sales_flows_config.json"
+    
+    _write(config_path, _config("sales", greeting="Bye"))
+    assert _rendered(watcher.poll()) == [("sales_flows_config.json", "SalesSharedFlow", "ok")]
+    
+    config = _config("sales", greeting="Bye")
+    config["flows"].pop()
+    _write(config_path, config)
+    assert _rendered(watcher.poll()) == [("sales_flows_config.json", "SalesOwnFlow", "removed")]
+
+
+def test_invalid_config_then_fix(project_root):
+    """Test that an invalid config is reported and fixing it re-renders only what changed."""
+    watcher = FlowWatcher(project_root)
+    watcher.poll()
+    config_path = project_root / "config" / "connect_flows" / "dev" / "support_flows_config.json"
+    
+    _write(config_path, {"flows": []})
+    results = watcher.poll()
+    assert _rendered(results) == [("support_flows_config.json", None, "error")]
+    assert "instance_name" in results[0]["message"]
+    
+    _write(config_path, _config("support"))
+    assert watcher.poll() == []
+
+
+def test_missing_flow_and_failed_updates(project_root):
+    """Test that render errors and unmatched block IDs are reported per flow."""
+    watcher = FlowWatcher(project_root, environments=["dev"])
+    watcher.poll()
+    
+    (project_root / "flows" / "sales.json").unlink()
+    results = watcher.poll()
+    assert _rendered(results) == [("sales_flows_config.json", "SalesOwnFlow", "error")]
+    assert "Flow file not found" in format_result(results[0])
+    
+    config = _config("support")
+    config["flows"][0]["parameter_updates"] = {"block-2": {"Text": "x"}}
+    _write(project_root / "config" / "connect_flows" / "dev" / "support_flows_config.json", config)
+    assert _rendered(watcher.poll()) == [("support_flows_config.json", "SupportSharedFlow", "warning")]
+
+
+def test_unresolved_refs_are_flagged(project_root):
+    """Test that a flow rendered with symbolic references is not reported as ok."""
+    watcher = FlowWatcher(project_root, environments=["dev"])
+    watcher.poll()
+    
+    config = _config("support")
+    config["flows"][0]["parameter_updates"] = {"block-1": {"QueueId": {"ref": "queue:Support"}}}
+    _write(project_root / "config" / "connect_flows" / "dev" / "support_flows_config.json", config)
+    results = watcher.poll()
+    
+    assert _rendered(results) == [("support_flows_config.json", "SupportSharedFlow", "warning")]
+    assert results[0]["message"] == "Unresolved references: queue:Support"
+
+
+def test_context_settings_apply_and_reload(project_root):
+    """Test that cdk.json context applies as in a synth and editing it re-renders every flow."""
+    flow = _flow("sales")
+    flow["Actions"][0]["Transitions"] = {"NextAction": "missing"}
+    _write(project_root / "flows" / "sales.json", flow)
+    watcher = FlowWatcher(project_root)
+    
+    assert ("sales_flows_config.json", "SalesOwnFlow", "error") in _rendered(watcher.poll())
+    
+    _write(project_root / "cdk.json", {"context": {"flowGraphCheck": "warn"}})
+    
+    assert _rendered(watcher.poll()) == [
+        ("sales_flows_config.json", "SalesOwnFlow", "ok"),
+        ("sales_flows_config.json", "SalesSharedFlow", "ok"),
+        ("support_flows_config.json", "SupportSharedFlow", "ok")
+    ]
+    assert watcher.poll() == []
+    assert _rendered(FlowWatcher(project_root, overrides={"flowGraphCheck": "error"}).poll())[0][2] == "error"
+
+
+def test_environment_filter(project_root):
+    """Test that only the selected environments are watched."""
+    assert FlowWatcher(project_root, environments=["prod"]).poll() == []
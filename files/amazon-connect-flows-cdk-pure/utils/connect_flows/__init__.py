@@ -1,5 +1,6 @@
 """Utility modules for Amazon Connect Flows."""
 from .flow_updater import FlowParameterUpdater
 from .config_loader import ConfigurationLoader
+from .flow_cache import FlowCache, get_flow_cache
 
-__all__ = ['FlowParameterUpdater', 'ConfigurationLoader']
+__all__ = ['FlowParameterUpdater', 'ConfigurationLoader', 'FlowCache', 'get_flow_cache']
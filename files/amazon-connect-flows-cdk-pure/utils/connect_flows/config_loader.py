@@ -1,10 +1,11 @@
 """
 Configuration loader for Amazon Connect flows.
 """
-import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any
+
+from .schema import ConfigValidationError, validate_config_text
 
 logger = logging.getLogger(__name__)
 
@@ -12,10 +13,10 @@ logger = logging.getLogger(__name__)
 class ConfigurationLoader:
     """
     Loads and validates flow configuration files.
-    """
     
-    REQUIRED_CONFIG_KEYS = ['instance_name', 'flows']
-    REQUIRED_FLOW_KEYS = ['filename', 'name', 'type']
+    Validation is done by utils.connect_flows.schema, which reports every
+    error of a file at once.
+    """
     
     def __init__(self, config_dir: Path):
         """
@@ -44,7 +45,7 @@ class ConfigurationLoader:
         
         Raises:
             FileNotFoundError: If config file doesn't exist
-            ValueError: If configuration is invalid
+            ConfigValidationError: If configuration is invalid (a ValueError listing every error)
         """
         config_path = self.config_dir / config_filename
         
@@ -54,89 +55,13 @@ class ConfigurationLoader:
         logger.info(f"Loading configuration from {config_path}")
         
         with open(config_path, 'r') as f:
-            config = json.load(f)
+            text = f.read()
         
-        # Validate configuration
-        self._validate_config(config, config_filename)
+        # Parse and validate in one pass, collecting every error
+        config, errors = validate_config_text(text)
+        if errors or config is None:
+            raise ConfigValidationError(config_filename, errors)
         
         logger.info(f"Successfully loaded configuration with {len(config.get('flows', []))} flows")
         
         return config
-    
-    def _validate_config(self, config: Dict[str, Any], filename: str) -> None:
-        """
-        Validate the configuration structure.
-        
-        Args:
-            config: Configuration dictionary to validate
-            filename: Name of the config file (for error messages)
-        
-        Raises:
-            ValueError: If configuration is invalid
-        """
-        # Check required top-level keys
-        for key in self.REQUIRED_CONFIG_KEYS:
-            if key not in config:
-                raise ValueError(f"Missing required key '{key}' in {filename}")
-        
-        # Validate instance_name
-        if not config['instance_name'] or not isinstance(config['instance_name'], str):
-            raise ValueError(f"Invalid instance_name in {filename}")
-        
-        # Validate flows
-        flows = config.get('flows', [])
-        if not isinstance(flows, list):
-            raise ValueError(f"'flows' must be a list in {filename}")
-        
-        # Validate each flow
-        for idx, flow in enumerate(flows):
-            self._validate_flow_config(flow, filename, idx)
-    
-    def _validate_flow_config(
-        self, 
-        flow: Dict[str, Any], 
-        filename: str, 
-        idx: int
-    ) -> None:
-        """
-        Validate a single flow configuration.
-        
-        Args:
-            flow: Flow configuration dictionary
-            filename: Name of the config file (for error messages)
-            idx: Index of the flow in the flows list
-        
-        Raises:
-            ValueError: If flow configuration is invalid
-        """
-        # Check required keys
-        for key in self.REQUIRED_FLOW_KEYS:
-            if key not in flow:
-                raise ValueError(
-                    f"Missing required key '{key}' in flow {idx} of {filename}"
-                )
-        
-        # Validate flow type
-        valid_types = [
-            'CONTACT_FLOW',
-            'CUSTOMER_QUEUE',
-            'CUSTOMER_HOLD',
-            'CUSTOMER_WHISPER',
-            'AGENT_HOLD',
-            'AGENT_WHISPER',
-            'TRANSFER',
-            'QUEUE_TRANSFER'
-        ]
-        
-        if flow['type'] not in valid_types:
-            raise ValueError(
-                f"Invalid flow type '{flow['type']}' in flow {idx} of {filename}. "
-                f"Must be one of: {', '.join(valid_types)}"
-            )
-        
-        # Validate parameter_updates if present
-        if 'parameter_updates' in flow:
-            if not isinstance(flow['parameter_updates'], dict):
-                raise ValueError(
-                    f"'parameter_updates' must be a dictionary in flow {idx} of {filename}"
-                )
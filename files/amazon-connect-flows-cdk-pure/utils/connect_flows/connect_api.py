@@ -0,0 +1,299 @@
+"""
+Shared plumbing for commands that call the Amazon Connect API directly.
+
+Connect throttles its flow APIs per account (a few requests per second with
+a small burst), so every call goes through a token bucket and is retried with
+exponential backoff and full jitter when it is throttled anyway.
+"""
+import logging
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .discovery import load_configs
+from .render import FlowRenderer
+from .resources import ResourceResolver, get_resource_resolver
+from .settings import load_context, render_options, resolve_instance_arn
+
+logger = logging.getLogger(__name__)
+
+# Connect's default quota for the contact flow APIs
+DEFAULT_TPS = 2.0
+DEFAULT_BURST = 5
+DEFAULT_MAX_ATTEMPTS = 6
+DEFAULT_WORKERS = 4
+
+THROTTLING_ERRORS = frozenset({'ThrottlingException', 'TooManyRequestsException', 'LimitExceededException'})
+
+# Config filename, instance ARN, rendered flow and deployed flow ARN (None if not deployed)
+FlowTarget = Tuple[str, str, Dict[str, Any], Optional[str]]
+
+
+def create_client(region: Optional[str]) -> Any:
+    """Create a Connect client; boto3 is only imported when a command needs it."""
+    import boto3
+    
+    return boto3.client('connect', region_name=region)
+
+
+def region_of(arn: str) -> Optional[str]:
+    """Get the region of an ARN (arn:partition:service:region:account:resource)."""
+    parts = arn.split(':')
+    return parts[3] if len(parts) > 5 and parts[3] else None
+
+
+def resource_id(arn: str) -> str:
+    """Get the identifier at the end of a Connect resource ARN."""
+    return arn.rsplit('/', 1)[-1]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    
+    Tokens refill at 'rate' per second up to 'burst'; acquire blocks until a
+    token is available.
+    """
+    
+    def __init__(
+        self,
+        rate: float = DEFAULT_TPS,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the bucket, full.
+        
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens
+            clock: Monotonic clock
+            sleep: Sleep function
+        
+        Raises:
+            ValueError: If rate or burst is not positive
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("rate and burst must be positive")
+        
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> float:
+        """
+        Take one token, waiting for it if the bucket is empty.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self.sleep(delay)
+            waited += delay
+
+
+def is_throttling(error: Exception) -> bool:
+    """Check whether an exception is a botocore throttling error."""
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') in THROTTLING_ERRORS
+
+
+class RateLimitedCaller:
+    """
+    Calls API operations through a token bucket, retrying throttled calls.
+    
+    Retries wait a random time up to base_delay * 2**attempt, capped at
+    max_delay ("full jitter"), so concurrent workers don't retry in lockstep.
+    """
+    
+    def __init__(
+        self,
+        limiter: TokenBucket,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = 0.2,
+        max_delay: float = 10.0,
+        sleep: Callable[[float], None] = time.sleep,
+        jitter: Callable[[], float] = random.random
+    ):
+        """
+        Initialize the caller.
+        
+        Args:
+            limiter: Token bucket shared by every call
+            max_attempts: Attempts per call, the first one included
+            base_delay: Backoff of the first retry in seconds
+            max_delay: Maximum backoff in seconds
+            sleep: Sleep function
+            jitter: Returns a random number in [0, 1)
+        """
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.jitter = jitter
+    
+    def call(self, operation: Callable[..., Any], **kwargs: Any) -> Tuple[Any, int]:
+        """
+        Call an API operation.
+        
+        Args:
+            operation: Bound client method, e.g. client.describe_contact_flow
+            **kwargs: Operation parameters
+        
+        Returns:
+            Tuple of the response and the number of attempts made
+        
+        Raises:
+            Exception: The last error, if it is not throttling or attempts ran out
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            self.limiter.acquire()
+            try:
+                return operation(**kwargs), attempt
+            except Exception as e:
+                if not is_throttling(e) or attempt == self.max_attempts:
+                    raise
+                delay = self.jitter() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                logger.debug(f"Throttled (attempt {attempt}), retrying in {delay:.2f}s")
+                self.sleep(delay)
+        
+        raise AssertionError("unreachable")
+
+
+class ClientPool:
+    """
+    One Connect client per region.
+    
+    Creating boto3 clients is not thread-safe, so clients are created on the
+    calling thread before work is handed to a pool (see flow_targets).
+    """
+    
+    def __init__(self, client_factory: Callable[[Optional[str]], Any] = create_client, region: Optional[str] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            client_factory: Creates a Connect client for a region
+            region: Region for ARNs without one (None for the default region)
+        """
+        self.client_factory = client_factory
+        self.region = region
+        self._clients: Dict[Optional[str], Any] = {}
+    
+    def __call__(self, region: Optional[str]) -> Any:
+        """Get the client of a region, creating it on first use."""
+        if region not in self._clients:
+            self._clients[region] = self.client_factory(region)
+        return self._clients[region]
+    
+    def for_arn(self, arn: str) -> Any:
+        """Get the client of the region an ARN belongs to."""
+        return self(region_of(arn) or self.region)
+
+
+def render_instance_flows(
+    project_root: Path,
+    environment: str,
+    region: Optional[str] = None,
+    instance_arn: Optional[str] = None,
+    config_filenames: Optional[List[str]] = None,
+    resolver: Optional[ResourceResolver] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[str, str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Render the flows of an environment the way ConnectFlowStack does.
+    
+    Render options and instances come from the config files and CDK context
+    through the same helpers the stack uses (see utils.connect_flows.settings),
+    and resource references are resolved with the shared resolver, so the
+    content matches what a CDK deploy would send, to the same instance.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name
+        region: AWS region of the instances (None for the default region)
+        instance_arn: Instance ARN to use instead of looking up instance_name
+        config_filenames: Config files to render (None for all)
+        resolver: Resource reference resolver (the process-wide one if None)
+        context: CDK context values (None to read cdk.json)
+    
+    Yields:
+        Tuples of config filename, instance ARN, flow config and rendered flow
+    
+    Raises:
+        FileNotFoundError: If the config or flows directory doesn't exist
+        ValueError: If a configuration, reference or flow graph is invalid
+    """
+    config_dir = project_root / 'config' / 'connect_flows' / environment
+    resolver = resolver or get_resource_resolver()
+    context = load_context(project_root) if context is None else context
+    
+    for config_filename, config in load_configs(config_dir, config_filenames).items():
+        arn = instance_arn or resolve_instance_arn(project_root, config, context, region)
+        renderer = FlowRenderer(project_root / 'flows', **render_options(config, context))
+        flow_configs = [
+            dict(flow_config, parameter_updates=resolver.resolve(flow_config['parameter_updates'], arn))
+            if flow_config.get('parameter_updates') else flow_config
+            for flow_config in config.get('flows', [])
+        ]
+        for flow_config, flow in renderer.render_all(flow_configs):
+            yield config_filename, arn, flow_config, flow
+
+
+def flow_targets(
+    project_root: Path,
+    environment: str,
+    clients: ClientPool,
+    instance_arn: Optional[str] = None,
+    config_filenames: Optional[List[str]] = None,
+    flow_names: Optional[List[str]] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> List[FlowTarget]:
+    """
+    Render flows and find the deployed flow each one corresponds to.
+    
+    Deployed flows are matched by name, using the same ListContactFlows
+    sweep that resolves flow references.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name
+        clients: Clients to call the API with
+        instance_arn: Instance ARN to use instead of looking up instance_name
+        config_filenames: Config files to render (None for all)
+        flow_names: Flows to include (None for all)
+        context: CDK context values (None to read cdk.json)
+    
+    Returns:
+        Tuples of config filename, instance ARN, rendered flow and the ARN
+        of the deployed flow (None if there is none), in configuration order
+    """
+    resolver = ResourceResolver(client_factory=clients)
+    
+    targets = []
+    for config_filename, arn, flow_config, flow in render_instance_flows(
+        project_root, environment, clients.region, instance_arn, config_filenames, resolver, context
+    ):
+        if flow_names and flow_config['name'] not in flow_names:
+            continue
+        targets.append((config_filename, arn, flow, resolver.names(arn, 'flow').get(flow['name'])))
+        clients.for_arn(arn)
+    
+    return targets
@@ -0,0 +1,318 @@
+"""
+Reverse dependency index from flow files to the configs and stacks using them.
+
+The index maps every flow filename (relative to flows/) to the config files,
+environments and stack IDs that reference it. It is cached in
+.flowcache/dependency-index.json and refreshed incrementally: only config
+files whose mtime or size changed are read again.
+
+Usage:
+    python -m utils.connect_flows.dependency_index stacks flows/sales/sales_main_flow.json
+    python -m utils.connect_flows.dependency_index git-diff [--base origin/main] [--env prod]
+    python -m utils.connect_flows.dependency_index show
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path, PurePosixPath
+from typing import Dict, Any, Iterable, List, Optional, Set
+
+from .discovery import CONFIG_SUFFIX, discover_environments, stack_id
+from .incremental import CODE_PATHS
+from .render_cache import DEFAULT_CACHE_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = 'dependency-index.json'
+INDEX_VERSION = 1
+
+# Project files that affect every stack when they change
+GLOBAL_PATHS = CODE_PATHS + ('cdk.json',)
+
+
+class DependencyIndex:
+    """
+    Index of which configs, environments and stacks use each flow file.
+    
+    Config files are read as plain JSON without schema validation, so an
+    index can be built while a config is being edited. A config that can't
+    be parsed keeps no flow references until it is fixed.
+    """
+    
+    def __init__(self, project_root: Path, cache_path: Optional[Path] = None):
+        """
+        Initialize the index. Call refresh() to scan the configs.
+        
+        Args:
+            project_root: Directory containing flows/ and config/
+            cache_path: Index cache file (default: .flowcache/dependency-index.json)
+        """
+        self.project_root = Path(project_root)
+        self.config_root = self.project_root / 'config' / 'connect_flows'
+        self.cache_path = cache_path or self.project_root / DEFAULT_CACHE_DIRNAME / INDEX_FILENAME
+        # Config entries keyed by '<env>/<config filename>'
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._by_flow: Dict[str, List[Dict[str, str]]] = {}
+        self._loaded = False
+    
+    def _load_cache(self) -> None:
+        """Load config entries from the cache file, if it is usable."""
+        self._loaded = True
+        
+        try:
+            with open(self.cache_path, 'r') as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable dependency index {self.cache_path}: {str(e)}")
+            return
+        
+        if cached.get('version') == INDEX_VERSION:
+            self._configs = cached.get('configs', {})
+    
+    def _save_cache(self) -> None:
+        """Write config entries to the cache file."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'configs': self._configs}, f)
+            os.replace(tmp_name, self.cache_path)
+        except OSError as e:
+            # The cache is an optimization; failing to write it must not fail the caller
+            logger.warning(f"Failed to write dependency index {self.cache_path}: {str(e)}")
+    
+    @staticmethod
+    def _read_config(config_path: Path) -> List[Dict[str, str]]:
+        """Read the flow references of a config file."""
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+            return [
+                {'filename': str(PurePosixPath(flow['filename'])), 'name': flow.get('name', '')}
+                for flow in config.get('flows', [])
+                if isinstance(flow, dict) and isinstance(flow.get('filename'), str)
+            ]
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not read flow references from {config_path}: {str(e)}")
+            return []
+    
+    def refresh(self) -> List[str]:
+        """
+        Bring the index up to date with the config files on disk.
+        
+        Returns:
+            Keys ('<env>/<config filename>') of the configs that were added,
+            changed or removed
+        """
+        if not self._loaded:
+            self._load_cache()
+        
+        seen = set()
+        changed = []
+        
+        environments = discover_environments(self.config_root) if self.config_root.is_dir() else []
+        for environment in environments:
+            for config_path in sorted((self.config_root / environment).glob(f"*{CONFIG_SUFFIX}")):
+                key = f"{environment}/{config_path.name}"
+                stat = config_path.stat()
+                stamp = [stat.st_mtime_ns, stat.st_size]
+                seen.add(key)
+                
+                entry = self._configs.get(key)
+                if entry is not None and entry['stamp'] == stamp:
+                    continue
+                
+                self._configs[key] = {
+                    'environment': environment,
+                    'config': config_path.name,
+                    'stack': stack_id(config_path.name, environment),
+                    'stamp': stamp,
+                    'flows': self._read_config(config_path)
+                }
+                changed.append(key)
+        
+        for key in [key for key in self._configs if key not in seen]:
+            del self._configs[key]
+            changed.append(key)
+        
+        if changed or not self._by_flow:
+            self._rebuild()
+        if changed:
+            logger.info(f"Dependency index: {len(changed)} configs updated")
+            self._save_cache()
+        
+        return changed
+    
+    def _rebuild(self) -> None:
+        """Rebuild the flow filename lookup from the config entries."""
+        self._by_flow = {}
+        for key in sorted(self._configs):
+            entry = self._configs[key]
+            for flow in entry['flows']:
+                self._by_flow.setdefault(flow['filename'], []).append({
+                    'environment': entry['environment'],
+                    'config': entry['config'],
+                    'stack': entry['stack'],
+                    'flow': flow['name']
+                })
+    
+    def dependents(self, flow_filename: str) -> List[Dict[str, str]]:
+        """
+        Get the uses of a flow file.
+        
+        Args:
+            flow_filename: Flow filename relative to flows/, as written in configs
+        
+        Returns:
+            Dictionaries with the 'environment', 'config', 'stack' and 'flow'
+            name of every config entry using the file
+        """
+        return list(self._by_flow.get(str(PurePosixPath(flow_filename)), []))
+    
+    def configs(self, environments: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Get the keys of every config file in the index.
+        
+        Args:
+            environments: Only include these environments (default: all)
+        
+        Returns:
+            Sorted keys ('<env>/<config filename>')
+        """
+        selected = set(environments) if environments is not None else None
+        return sorted(
+            key for key, entry in self._configs.items()
+            if selected is None or entry['environment'] in selected
+        )
+    
+    def stacks(self, environments: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Get every stack ID in the index.
+        
+        Args:
+            environments: Only include these environments (default: all)
+        
+        Returns:
+            Sorted stack IDs
+        """
+        selected = set(environments) if environments is not None else None
+        return sorted(
+            entry['stack'] for entry in self._configs.values()
+            if selected is None or entry['environment'] in selected
+        )
+    
+    def affected_stacks(
+        self,
+        paths: Iterable[str],
+        environments: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """
+        Map changed project files to the stacks that must be synthesized again.
+        
+        Flow files map to the stacks using them, config files to their own
+        stack, and code or cdk.json to every stack. Other files affect nothing.
+        
+        Args:
+            paths: Changed file paths relative to the project root
+            environments: Only include these environments (default: all)
+        
+        Returns:
+            Sorted stack IDs
+        """
+        selected = set(environments) if environments is not None else None
+        affected: Set[str] = set()
+        global_paths = [PurePosixPath(global_path) for global_path in GLOBAL_PATHS]
+        
+        for path in map(PurePosixPath, paths):
+            parts = path.parts
+            
+            if any(path == global_path or global_path in path.parents for global_path in global_paths):
+                return self.stacks(environments)
+            
+            if parts[:1] == ('flows',) and len(parts) > 1:
+                uses = self.dependents(str(PurePosixPath(*parts[1:])))
+                affected.update(use['stack'] for use in uses
+                                if selected is None or use['environment'] in selected)
+            elif parts[:2] == ('config', 'connect_flows') and len(parts) == 4 and parts[3].endswith(CONFIG_SUFFIX):
+                if selected is None or parts[2] in selected:
+                    affected.add(stack_id(parts[3], parts[2]))
+        
+        return sorted(affected)
+    
+    def to_dict(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Get the whole index.
+        
+        Returns:
+            Uses of every flow file, keyed by flow filename
+        """
+        return {filename: list(uses) for filename, uses in sorted(self._by_flow.items())}
+
+
+def git_changed_files(project_root: Path, base: str) -> List[str]:
+    """
+    List files changed between a git revision and the working tree.
+    
+    Args:
+        project_root: Project root directory inside a git work tree
+        base: Revision to compare against, e.g. 'origin/main'
+    
+    Returns:
+        Changed file paths relative to project_root
+    
+    Raises:
+        RuntimeError: If git fails
+    """
+    result = subprocess.run(
+        ['git', 'diff', '--name-only', '--relative', base, '--', '.'],
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git diff failed: {result.stderr.strip()}")
+    
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Find the stacks that use flow files.")
+    parser.add_argument('command', choices=['stacks', 'git-diff', 'show'])
+    parser.add_argument('paths', nargs='*', help="Changed files relative to the project root (stacks)")
+    parser.add_argument('--base', default='origin/main',
+                        help="Revision to diff against (git-diff, default: %(default)s)")
+    parser.add_argument('--env', action='append', help="Only include this environment (repeatable)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    index = DependencyIndex(args.project_root)
+    index.refresh()
+    
+    if args.command == 'show':
+        print(json.dumps(index.to_dict(), indent=2))
+        return
+    
+    try:
+        paths = args.paths if args.command == 'stacks' else git_changed_files(args.project_root, args.base)
+    except RuntimeError as e:
+        print(f"❌ {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Stack IDs go to stdout, one per line, so they can be passed to cdk
+    for name in index.affected_stacks(paths, args.env):
+        print(name)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+"""
+Discovery and parallel loading of flow configuration files.
+
+Every subdirectory of config/connect_flows is an environment. Every
+`<lob>_flows_config.json` in an environment's config directory is one line
+of business and becomes one stack, named `<Lob>FlowsStack-<env>`.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .config_loader import ConfigurationLoader
+
+logger = logging.getLogger(__name__)
+
+CONFIG_SUFFIX = '_flows_config.json'
+
+DEFAULT_LOAD_WORKERS = 8
+
+
+def discover_environments(config_root: Path) -> List[str]:
+    """
+    Find the environments that have a config directory.
+    
+    Args:
+        config_root: Directory containing one subdirectory per environment
+    
+    Returns:
+        Sorted environment names
+    
+    Raises:
+        FileNotFoundError: If config_root doesn't exist
+    """
+    if not config_root.is_dir():
+        raise FileNotFoundError(f"Config directory not found: {config_root}")
+    
+    return sorted(path.name for path in config_root.iterdir() if path.is_dir())
+
+
+def resolve_environments(value: str, config_root: Path) -> List[str]:
+    """
+    Resolve an environment selection such as 'dev,prod' or 'all'.
+    
+    Args:
+        value: Comma-separated environment names, or 'all'
+        config_root: Directory containing one subdirectory per environment
+    
+    Returns:
+        Environment names, without duplicates, in the order given ('all' is sorted)
+    
+    Raises:
+        FileNotFoundError: If config_root doesn't exist
+        ValueError: If no environment is given or one has no config directory
+    """
+    available = discover_environments(config_root)
+    
+    if value.strip().lower() == 'all':
+        return available
+    
+    environments = list(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    if not environments:
+        raise ValueError("No environments given")
+    
+    unknown = [name for name in environments if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Unknown environments: {', '.join(unknown)}. Must be one of: {', '.join(available)}"
+        )
+    
+    return environments
+
+
+def discover_configs(config_dir: Path) -> List[str]:
+    """
+    Find the flow configuration files of an environment.
+    
+    Args:
+        config_dir: Environment configuration directory
+    
+    Returns:
+        Sorted configuration filenames
+    
+    Raises:
+        FileNotFoundError: If config_dir doesn't exist
+    """
+    if not config_dir.is_dir():
+        raise FileNotFoundError(f"Config directory not found: {config_dir}")
+    
+    return sorted(path.name for path in config_dir.glob(f"*{CONFIG_SUFFIX}") if path.is_file())
+
+
+def lob_name(config_filename: str) -> str:
+    """
+    Get the line of business of a configuration file.
+    
+    Args:
+        config_filename: Configuration filename, e.g. 'small_business_flows_config.json'
+    
+    Returns:
+        Line of business in title case, e.g. 'Small Business'
+    
+    Raises:
+        ValueError: If the filename doesn't follow the <lob>_flows_config.json pattern
+    """
+    if not config_filename.endswith(CONFIG_SUFFIX) or config_filename == CONFIG_SUFFIX:
+        raise ValueError(f"Config filename must look like <lob>{CONFIG_SUFFIX}: {config_filename}")
+    
+    return config_filename[:-len(CONFIG_SUFFIX)].replace('-', '_').replace('_', ' ').title()
+
+
+def stack_id(config_filename: str, environment: str) -> str:
+    """
+    Get the stack ID for a configuration file.
+    
+    Args:
+        config_filename: Configuration filename, e.g. 'sales_flows_config.json'
+        environment: Environment name
+    
+    Returns:
+        Stack ID, e.g. 'SalesFlowsStack-dev'
+    """
+    return f"{lob_name(config_filename).replace(' ', '')}FlowsStack-{environment}"
+
+
+def load_configs(
+    config_dir: Path,
+    config_filenames: Optional[List[str]] = None,
+    workers: int = DEFAULT_LOAD_WORKERS
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Load and validate configuration files on a thread pool.
+    
+    Every file is loaded even if an earlier one fails, so all invalid files
+    are logged in one run.
+    
+    Args:
+        config_dir: Environment configuration directory
+        config_filenames: Files to load (default: every discovered config)
+        workers: Maximum number of worker threads
+    
+    Returns:
+        Validated configurations keyed by filename, in filename order
+    
+    Raises:
+        FileNotFoundError: If the directory or a config file doesn't exist
+        ValueError: If workers is not positive or a configuration is invalid
+            (the first failing file in order is raised)
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    
+    if config_filenames is None:
+        config_filenames = discover_configs(config_dir)
+    
+    loader = ConfigurationLoader(config_dir)
+    
+    def load(filename: str) -> Any:
+        try:
+            return loader.load_config(filename)
+        except Exception as e:
+            return e
+    
+    if workers == 1 or len(config_filenames) <= 1:
+        results = [load(filename) for filename in config_filenames]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(config_filenames))) as executor:
+            results = list(executor.map(load, config_filenames))
+    
+    configs = {}
+    errors = []
+    for filename, result in zip(config_filenames, results):
+        if isinstance(result, Exception):
+            logger.error(f"Invalid configuration {filename}: {str(result)}")
+            errors.append(result)
+        else:
+            configs[filename] = result
+    
+    if errors:
+        raise errors[0]
+    
+    return configs
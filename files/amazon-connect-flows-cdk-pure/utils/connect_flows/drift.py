@@ -0,0 +1,249 @@
+"""
+Drift detection between rendered and deployed flow content.
+
+Every flow named in the configs is rendered as a synth would render it (the
+same config and context settings, from cdk.json and -c), its deployed
+content is fetched with DescribeContactFlow (concurrently, behind the shared
+rate limiter), and both sides are compared by the hash of their canonical
+JSON. Drifted flows are compared action by action, so the report names the
+blocks edited in the console. Designer metadata is ignored unless
+--include-metadata is given: moving a block around is not drift.
+
+Usage:
+    python -m utils.connect_flows.drift --env dev [--config sales_flows_config.json] [--flow SalesMainFlow]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .connect_api import (
+    DEFAULT_BURST,
+    DEFAULT_TPS,
+    DEFAULT_WORKERS,
+    ClientPool,
+    FlowTarget,
+    RateLimitedCaller,
+    TokenBucket,
+    create_client,
+    flow_targets,
+    resource_id
+)
+from .serialization import canonical_hash
+from .settings import load_context, parse_context
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_flow(content: Union[str, Dict[str, Any]], include_metadata: bool = False) -> Dict[str, Any]:
+    """
+    Get the part of a flow that drift is detected on.
+    
+    Args:
+        content: Flow content as a JSON string or parsed
+        include_metadata: Keep designer metadata
+    
+    Returns:
+        Parsed flow content, without Metadata unless include_metadata is set
+    """
+    flow = json.loads(content) if isinstance(content, str) else dict(content)
+    if not include_metadata:
+        flow.pop('Metadata', None)
+    return flow
+
+
+def diff_blocks(expected: Dict[str, Any], deployed: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Compare two flows action by action.
+    
+    Args:
+        expected: Canonical rendered flow
+        deployed: Canonical deployed flow
+    
+    Returns:
+        Dictionary with the identifiers of 'added' (only deployed), 'removed'
+        (only rendered) and 'changed' actions, and the other top-level 'keys'
+        that differ
+    """
+    def actions(flow: Dict[str, Any]) -> Dict[str, str]:
+        return {
+            str(action.get('Identifier')): canonical_hash(action)
+            for action in flow.get('Actions') or [] if isinstance(action, dict)
+        }
+    
+    expected_actions = actions(expected)
+    deployed_actions = actions(deployed)
+    
+    return {
+        'added': [identifier for identifier in deployed_actions if identifier not in expected_actions],
+        'removed': [identifier for identifier in expected_actions if identifier not in deployed_actions],
+        'changed': [
+            identifier for identifier, digest in expected_actions.items()
+            if identifier in deployed_actions and deployed_actions[identifier] != digest
+        ],
+        'keys': sorted(
+            key for key in set(expected) | set(deployed)
+            if key != 'Actions' and canonical_hash(expected.get(key)) != canonical_hash(deployed.get(key))
+        )
+    }
+
+
+def detect_drift(
+    project_root: Path,
+    environment: str,
+    client_factory: Callable[[Optional[str]], Any] = create_client,
+    region: Optional[str] = None,
+    instance_arn: Optional[str] = None,
+    config_filenames: Optional[List[str]] = None,
+    flow_names: Optional[List[str]] = None,
+    workers: int = DEFAULT_WORKERS,
+    caller: Optional[RateLimitedCaller] = None,
+    include_metadata: bool = False,
+    context: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Compare the rendered flows of an environment with the deployed ones.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name
+        client_factory: Creates a Connect client for a region
+        region: AWS region of the instances (None for the default region)
+        instance_arn: Instance ARN to use instead of looking up instance_name
+        config_filenames: Config files to check (None for all)
+        flow_names: Flows to check (None for all)
+        workers: Maximum number of concurrent DescribeContactFlow calls
+        caller: Rate-limited caller (DEFAULT_TPS with DEFAULT_BURST if None)
+        include_metadata: Treat designer metadata changes as drift
+        context: CDK context values (None to read cdk.json)
+    
+    Returns:
+        One result per flow, in configuration order, with 'config', 'name',
+        'status' (in-sync, drifted, missing or failed), the 'expected' and
+        'deployed' hashes, the 'blocks' diff of drifted flows and 'message'
+    
+    Raises:
+        ValueError: If a configuration, reference or flow graph is invalid
+    """
+    caller = caller or RateLimitedCaller(TokenBucket(DEFAULT_TPS, DEFAULT_BURST))
+    clients = ClientPool(client_factory, region)
+    targets = flow_targets(
+        project_root, environment, clients, instance_arn, config_filenames, flow_names, context
+    )
+    
+    def check(target: FlowTarget) -> Dict[str, Any]:
+        config_filename, arn, flow, flow_arn = target
+        expected = canonical_flow(flow['content'], include_metadata)
+        result = {
+            'config': config_filename,
+            'name': flow['name'],
+            'expected': canonical_hash(expected),
+            'deployed': None,
+            'blocks': None
+        }
+        start = time.perf_counter()
+        
+        if flow_arn is None:
+            result.update(status='missing', message="Flow does not exist in the instance")
+        else:
+            try:
+                response, _ = caller.call(
+                    clients.for_arn(arn).describe_contact_flow,
+                    InstanceId=resource_id(arn),
+                    ContactFlowId=resource_id(flow_arn)
+                )
+                deployed = canonical_flow(response['ContactFlow']['Content'], include_metadata)
+                result['deployed'] = canonical_hash(deployed)
+                if result['deployed'] == result['expected']:
+                    result.update(status='in-sync', message="Deployed content matches")
+                else:
+                    result['blocks'] = diff_blocks(expected, deployed)
+                    result.update(status='drifted', message=_summarize(result['blocks']))
+            except Exception as e:
+                result.update(status='failed', message=str(e))
+        
+        result['ms'] = (time.perf_counter() - start) * 1000
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(check, targets))
+
+
+def _summarize(blocks: Dict[str, List[str]]) -> str:
+    """Describe a block diff in one line."""
+    parts = [f"{kind}: {', '.join(blocks[kind])}" for kind in ('changed', 'added', 'removed') if blocks[kind]]
+    if blocks['keys']:
+        parts.append(f"keys: {', '.join(blocks['keys'])}")
+    return '; '.join(parts)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """
+    Format a drift result as one line.
+    
+    Args:
+        result: Result from detect_drift
+    
+    Returns:
+        Human-readable line
+    """
+    icons = {'in-sync': '✅', 'drifted': '⚠️', 'missing': '➖', 'failed': '❌'}
+    return f"{icons[result['status']]} {result['config']} {result['name']}: {result['message']}"
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Compare rendered flows with the content deployed in Connect.")
+    parser.add_argument('--env', required=True, help="Environment to check (dev, staging, prod)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--config', action='append', help="Config file to check (repeatable, default: all)")
+    parser.add_argument('--flow', action='append', help="Flow name to check (repeatable, default: all)")
+    parser.add_argument('--region', help="AWS region (default: from the AWS configuration)")
+    parser.add_argument('--instance-arn', help="Instance ARN to use instead of looking up instance_name")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent describe calls")
+    parser.add_argument('--tps', type=float, default=DEFAULT_TPS, help="Describe calls per second")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="Describe calls allowed in a burst")
+    parser.add_argument('--include-metadata', action='store_true', help="Treat designer metadata changes as drift")
+    parser.add_argument('-c', '--context', action='append', default=[], help="CDK context value as key=value")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    try:
+        results = detect_drift(
+            args.project_root,
+            args.env,
+            region=args.region,
+            instance_arn=args.instance_arn,
+            config_filenames=args.config,
+            flow_names=args.flow,
+            workers=args.workers,
+            caller=RateLimitedCaller(TokenBucket(args.tps, args.burst)),
+            include_metadata=args.include_metadata,
+            context=load_context(args.project_root, parse_context(args.context))
+        )
+    except Exception as e:
+        print(f"❌ {args.env}: {str(e)}")
+        sys.exit(1)
+    
+    if args.format == 'json':
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(format_result(result))
+        drifted = sum(1 for result in results if result['status'] != 'in-sync')
+        print(f"{drifted} of {len(results)} flows in {args.env} differ from the rendered content")
+    
+    if any(result['status'] != 'in-sync' for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,380 @@
+"""
+Bulk export of the flows of an existing instance into the flows/ tree.
+
+Flows are listed with one paginated ListContactFlows sweep, their content is
+fetched concurrently behind the shared rate limiter, and each flow is written
+as normalized JSON (sorted keys, two-space indent) to flows/<lob>/. Matching
+entries are added to config/connect_flows/<env>/<lob>_flows_config.json;
+entries that already exist keep their filename, description and
+parameter_updates. Files whose content hash is unchanged are not rewritten,
+so re-running an export only touches flows edited since the last one.
+
+A file that any environment's config applies parameter_updates to is a
+template: it holds placeholders or references the deployed flow has
+resolved, so it is left alone unless --overwrite is given.
+
+Usage:
+    python -m utils.connect_flows.export --env dev --lob sales --instance-name dev-connect-instance [--match 'Sales*']
+"""
+import argparse
+import fnmatch
+import json
+import logging
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .connect_api import (
+    DEFAULT_BURST,
+    DEFAULT_TPS,
+    DEFAULT_WORKERS,
+    ClientPool,
+    RateLimitedCaller,
+    TokenBucket,
+    create_client,
+    resource_id
+)
+from .discovery import CONFIG_SUFFIX
+from .instances import CACHE_FILENAME as INSTANCE_CACHE_FILENAME
+from .instances import get_instance_lookup
+from .render_cache import DEFAULT_CACHE_DIRNAME
+from .schema import FLOW_TYPES
+from .serialization import canonical_hash, dumps_flow
+
+logger = logging.getLogger(__name__)
+
+_LOB_PATTERN = re.compile(r'[a-z0-9][a-z0-9_-]*')
+
+
+def flow_filename(name: str) -> str:
+    """
+    Get the file stem of a flow name.
+    
+    Args:
+        name: Flow name, e.g. 'SalesMainFlow' or 'Default agent hold'
+    
+    Returns:
+        Snake case stem, e.g. 'sales_main_flow' or 'default_agent_hold'
+    """
+    stem = re.sub(r'(?<=[a-z0-9])(?=[A-Z])', '_', name)
+    stem = re.sub(r'[^A-Za-z0-9]+', '_', stem).strip('_').lower()
+    return stem or 'flow'
+
+
+def list_flows(
+    client: Any,
+    instance_id: str,
+    flow_types: Optional[List[str]] = None,
+    pattern: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List the active flows of an instance.
+    
+    Args:
+        client: Connect client
+        instance_id: Instance ID
+        flow_types: Flow types to include (default: every type the config schema accepts)
+        pattern: Glob the flow names must match (None for all)
+    
+    Returns:
+        Flow summaries, in listing order
+    """
+    paginator = client.get_paginator('list_contact_flows')
+    summaries = []
+    for page in paginator.paginate(InstanceId=instance_id, ContactFlowTypes=list(flow_types or FLOW_TYPES)):
+        for summary in page.get('ContactFlowSummaryList', []):
+            if summary.get('ContactFlowState') == 'ARCHIVED':
+                continue
+            if pattern and not fnmatch.fnmatchcase(summary['Name'], pattern):
+                continue
+            summaries.append(summary)
+    return summaries
+
+
+def template_files(config_root: Path) -> Dict[str, str]:
+    """
+    Find the flow files that configs apply parameter_updates to.
+    
+    Args:
+        config_root: Directory containing one config directory per environment
+    
+    Returns:
+        Config path (relative to config_root) of the first entry with
+        parameter_updates, keyed by flow filename
+    """
+    templates: Dict[str, str] = {}
+    for config_path in sorted(config_root.glob(f"*/*{CONFIG_SUFFIX}")):
+        try:
+            config = json.loads(config_path.read_text(encoding='utf-8'))
+        except ValueError:
+            logger.warning(f"Skipping invalid JSON in {config_path}")
+            continue
+        for entry in config.get('flows', []) if isinstance(config, dict) else []:
+            if isinstance(entry, dict) and entry.get('parameter_updates') and entry.get('filename'):
+                templates.setdefault(entry['filename'], config_path.relative_to(config_root).as_posix())
+    return templates
+
+
+def _write_if_changed(path: Path, content: Dict[str, Any], replace: bool = True) -> str:
+    """
+    Write flow content unless the file already holds the same content.
+    
+    Args:
+        path: Flow file
+        content: Flow content
+        replace: Overwrite an existing file with different content
+    
+    Returns:
+        'created', 'updated', 'unchanged' or 'skipped' (different content
+        that replace doesn't allow to be written)
+    """
+    if path.exists():
+        try:
+            if canonical_hash(json.loads(path.read_text(encoding='utf-8'))) == canonical_hash(content):
+                return 'unchanged'
+        except ValueError:
+            if replace:
+                logger.warning(f"Overwriting invalid JSON in {path}")
+        if not replace:
+            return 'skipped'
+        status = 'updated'
+    else:
+        status = 'created'
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(dumps_flow(content, indent=2) + '\n', encoding='utf-8')
+    return status
+
+
+def export_flows(
+    project_root: Path,
+    environment: str,
+    lob: str,
+    instance_name: Optional[str] = None,
+    client_factory: Callable[[Optional[str]], Any] = create_client,
+    region: Optional[str] = None,
+    instance_arn: Optional[str] = None,
+    flow_types: Optional[List[str]] = None,
+    pattern: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    caller: Optional[RateLimitedCaller] = None,
+    overwrite: bool = False
+) -> Dict[str, Any]:
+    """
+    Export the flows of an instance into flows/<lob>/ and the LOB's config.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment whose config receives the entries
+        lob: Line of business, e.g. 'sales' (flows/sales/, sales_flows_config.json)
+        instance_name: Instance alias (default: the existing config's instance_name)
+        client_factory: Creates a Connect client for a region
+        region: AWS region of the instance (None for the default region)
+        instance_arn: Instance ARN to use instead of looking up instance_name
+        flow_types: Flow types to export (default: every type the config schema accepts)
+        pattern: Glob the flow names must match (None for all)
+        workers: Maximum number of concurrent DescribeContactFlow calls
+        caller: Rate-limited caller (DEFAULT_TPS with DEFAULT_BURST if None)
+        overwrite: Replace template files, which configs apply parameter_updates to
+    
+    Returns:
+        Dictionary with 'config' (config path relative to project_root),
+        'config_status' (created, updated or unchanged) and 'flows', one
+        result per flow with 'name', 'file', 'status' (created, updated,
+        unchanged, skipped or failed), 'attempts', 'ms' and 'message'
+    
+    Raises:
+        ValueError: If lob is invalid, the existing config is not valid JSON,
+            no instance name is given or configured, or listed flows share a name
+    """
+    if not _LOB_PATTERN.fullmatch(lob):
+        raise ValueError(f"Invalid line of business '{lob}'. Use lowercase letters, digits, '_' and '-'")
+    
+    config_path = project_root / 'config' / 'connect_flows' / environment / f"{lob}{CONFIG_SUFFIX}"
+    config: Dict[str, Any] = {}
+    if config_path.exists():
+        try:
+            config = json.loads(config_path.read_text(encoding='utf-8'))
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in {config_path}: {str(e)}")
+    
+    instance_name = instance_name or config.get('instance_name')
+    if not instance_name:
+        raise ValueError(f"No instance_name in {config_path}; pass --instance-name")
+    
+    if instance_arn is None:
+        lookup = get_instance_lookup(project_root / DEFAULT_CACHE_DIRNAME / INSTANCE_CACHE_FILENAME)
+        instance_arn = lookup.lookup(instance_name, region)
+    
+    caller = caller or RateLimitedCaller(TokenBucket(DEFAULT_TPS, DEFAULT_BURST))
+    client = ClientPool(client_factory, region).for_arn(instance_arn)
+    instance_id = resource_id(instance_arn)
+    summaries = list_flows(client, instance_id, flow_types, pattern)
+    logger.info(f"Exporting {len(summaries)} flows from {instance_arn}")
+    
+    # Config entries and files are keyed by name, so a name must be unique
+    types: Dict[str, List[str]] = {}
+    for summary in summaries:
+        types.setdefault(summary['Name'], []).append(summary['ContactFlowType'])
+    duplicates = [f"{name} ({', '.join(kinds)})" for name, kinds in types.items() if len(kinds) > 1]
+    if duplicates:
+        raise ValueError(
+            f"Flows share a name: {'; '.join(duplicates)}. Narrow the export with --type or --match"
+        )
+    
+    templates = {} if overwrite else template_files(project_root / 'config' / 'connect_flows')
+    
+    # Existing entries keep their files; new flows get unique snake case names
+    entries = {entry.get('name'): entry for entry in config.get('flows', []) if isinstance(entry, dict)}
+    used = {entry.get('filename') for entry in entries.values()}
+    filenames = {}
+    for summary in summaries:
+        name = summary['Name']
+        if name in entries and entries[name].get('filename'):
+            filenames[name] = entries[name]['filename']
+            continue
+        stem = f"{lob}/{flow_filename(name)}"
+        filename, suffix = f"{stem}.json", 2
+        while filename in used:
+            filename, suffix = f"{stem}_{suffix}.json", suffix + 1
+        used.add(filename)
+        filenames[name] = filename
+    
+    def export(summary: Dict[str, Any]) -> Dict[str, Any]:
+        result = {'name': summary['Name'], 'file': filenames[summary['Name']], 'attempts': 0}
+        start = time.perf_counter()
+        try:
+            response, result['attempts'] = caller.call(
+                client.describe_contact_flow,
+                InstanceId=instance_id,
+                ContactFlowId=summary['Id']
+            )
+            flow = response['ContactFlow']
+            path = project_root / 'flows' / result['file']
+            template = templates.get(result['file'])
+            result['status'] = _write_if_changed(path, json.loads(flow['Content']), replace=template is None)
+            if result['status'] == 'skipped':
+                result['message'] = (
+                    f"{result['file']} is a template with parameter_updates in {template}; "
+                    f"pass --overwrite to replace it"
+                )
+            else:
+                result['message'] = result['file']
+            result['description'] = flow.get('Description')
+        except Exception as e:
+            result.update(status='failed', message=str(e))
+        result['ms'] = (time.perf_counter() - start) * 1000
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(export, summaries))
+    
+    # Merge entries for every flow that was written
+    flows = [dict(entry) for entry in config.get('flows', [])]
+    positions = {entry.get('name'): index for index, entry in enumerate(flows) if isinstance(entry, dict)}
+    for summary, result in zip(summaries, results):
+        description = result.pop('description', None)
+        if result['status'] == 'failed':
+            continue
+        entry = {'filename': result['file'], 'name': summary['Name'], 'type': summary['ContactFlowType']}
+        if summary['Name'] in positions:
+            flows[positions[summary['Name']]].update(entry)
+        else:
+            if description:
+                entry['description'] = description
+            flows.append(entry)
+    
+    merged = dict(config, instance_name=config.get('instance_name', instance_name), flows=flows)
+    if not config_path.exists():
+        config_status = 'created'
+    elif merged != config:
+        config_status = 'updated'
+    else:
+        config_status = 'unchanged'
+    if config_status != 'unchanged':
+        config_path.parent.mkdir(parents=True, exist_ok=True)
+        config_path.write_text(json.dumps(merged, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    
+    return {
+        'config': config_path.relative_to(project_root).as_posix(),
+        'config_status': config_status,
+        'flows': results
+    }
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """
+    Format a flow export result as one line.
+    
+    Args:
+        result: One of the 'flows' results from export_flows
+    
+    Returns:
+        Human-readable line
+    """
+    icons = {'created': '🆕', 'updated': '✏️', 'unchanged': '✅', 'skipped': '⏭️', 'failed': '❌'}
+    attempts = f", {result['attempts']} attempts" if result['attempts'] > 1 else ''
+    return f"{icons[result['status']]} {result['name']}: {result['message']} ({result['ms']:.0f} ms{attempts})"
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Export the flows of an existing Connect instance into flows/.")
+    parser.add_argument('--env', required=True, help="Environment whose config receives the entries")
+    parser.add_argument('--lob', required=True, help="Line of business, e.g. sales")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--instance-name', help="Instance alias (default: instance_name of the existing config)")
+    parser.add_argument('--instance-arn', help="Instance ARN to use instead of looking up the alias")
+    parser.add_argument('--region', help="AWS region (default: from the AWS configuration)")
+    parser.add_argument('--type', action='append', choices=FLOW_TYPES, help="Flow type to export (repeatable)")
+    parser.add_argument('--match', help="Glob the flow names must match, e.g. 'Sales*'")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent describe calls")
+    parser.add_argument('--tps', type=float, default=DEFAULT_TPS, help="Describe calls per second")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="Describe calls allowed in a burst")
+    parser.add_argument(
+        '--overwrite', action='store_true', help="Replace template files that configs apply parameter_updates to"
+    )
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    try:
+        report = export_flows(
+            args.project_root,
+            args.env,
+            args.lob,
+            instance_name=args.instance_name,
+            region=args.region,
+            instance_arn=args.instance_arn,
+            flow_types=args.type,
+            pattern=args.match,
+            workers=args.workers,
+            caller=RateLimitedCaller(TokenBucket(args.tps, args.burst)),
+            overwrite=args.overwrite
+        )
+    except Exception as e:
+        print(f"❌ {args.lob}: {str(e)}")
+        sys.exit(1)
+    
+    if args.format == 'json':
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report['flows']:
+            print(format_result(result))
+        written = sum(1 for result in report['flows'] if result['status'] in ('created', 'updated'))
+        print(f"Wrote {written} of {len(report['flows'])} flows; {report['config']} {report['config_status']}")
+        if any(result['status'] == 'skipped' for result in report['flows']):
+            print("Skipped templates were edited in the console; port the edits or pass --overwrite")
+    
+    if any(result['status'] == 'failed' for result in report['flows']):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+Fast deploy: send rendered flow content straight to UpdateContactFlowContent.
+
+Flows are rendered exactly as ConnectFlowStack renders them (config files,
+then cdk.json and -c context), then updated concurrently through a
+rate-limited client, skipping the CloudFormation change-set cycle. Only
+flows that already exist in the instance (created by a regular deploy) can
+be updated. CloudFormation still holds the previous content, so this is
+meant for dev and staging iteration loops; a regular deploy makes the stacks
+authoritative again.
+
+Usage:
+    python -m utils.connect_flows.fast_deploy --env dev [--config sales_flows_config.json] [--flow SalesMainFlow]
+"""
+import argparse
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from .connect_api import (
+    DEFAULT_BURST,
+    DEFAULT_TPS,
+    DEFAULT_WORKERS,
+    ClientPool,
+    FlowTarget,
+    RateLimitedCaller,
+    TokenBucket,
+    create_client,
+    flow_targets,
+    resource_id
+)
+from .settings import load_context, parse_context
+
+logger = logging.getLogger(__name__)
+
+# Environments fast deploy runs against without --force
+FAST_DEPLOY_ENVIRONMENTS = ('dev', 'staging')
+
+
+def deploy_flows(
+    project_root: Path,
+    environment: str,
+    client_factory: Callable[[Optional[str]], Any] = create_client,
+    region: Optional[str] = None,
+    instance_arn: Optional[str] = None,
+    config_filenames: Optional[List[str]] = None,
+    flow_names: Optional[List[str]] = None,
+    workers: int = DEFAULT_WORKERS,
+    caller: Optional[RateLimitedCaller] = None,
+    force: bool = False,
+    context: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Render flows and update their content in place.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name
+        client_factory: Creates a Connect client for a region
+        region: AWS region of the instances (None for the default region)
+        instance_arn: Instance ARN to use instead of looking up instance_name
+        config_filenames: Config files to deploy (None for all)
+        flow_names: Flows to deploy (None for all)
+        workers: Number of concurrent update calls
+        caller: Rate-limited caller (DEFAULT_TPS with DEFAULT_BURST if None)
+        force: Allow environments outside FAST_DEPLOY_ENVIRONMENTS
+        context: CDK context values (None to read cdk.json)
+    
+    Returns:
+        One result per flow, in configuration order, with 'config', 'name',
+        'status' (updated, missing or failed), 'attempts', 'ms' and 'message'
+    
+    Raises:
+        ValueError: If the environment is not allowed, or a configuration,
+            reference or flow graph is invalid
+    """
+    if environment not in FAST_DEPLOY_ENVIRONMENTS and not force:
+        raise ValueError(
+            f"Fast deploy is for {', '.join(FAST_DEPLOY_ENVIRONMENTS)}; use --force to update '{environment}'"
+        )
+    
+    caller = caller or RateLimitedCaller(TokenBucket(DEFAULT_TPS, DEFAULT_BURST))
+    clients = ClientPool(client_factory, region)
+    targets = flow_targets(
+        project_root, environment, clients, instance_arn, config_filenames, flow_names, context
+    )
+    
+    def update(target: FlowTarget) -> Dict[str, Any]:
+        config_filename, arn, flow, flow_arn = target
+        result = {'config': config_filename, 'name': flow['name'], 'attempts': 0}
+        start = time.perf_counter()
+        
+        if flow_arn is None:
+            result.update(status='missing', message="Flow does not exist in the instance; deploy it with CDK first")
+        else:
+            try:
+                _, result['attempts'] = caller.call(
+                    clients.for_arn(arn).update_contact_flow_content,
+                    InstanceId=resource_id(arn),
+                    ContactFlowId=resource_id(flow_arn),
+                    Content=flow['content']
+                )
+                result.update(status='updated', message=f"{len(flow['content'])} bytes")
+            except Exception as e:
+                result.update(status='failed', message=str(e))
+        
+        result['ms'] = (time.perf_counter() - start) * 1000
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return list(pool.map(update, targets))
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """
+    Format a deploy result as one line.
+    
+    Args:
+        result: Result from deploy_flows
+    
+    Returns:
+        Human-readable line
+    """
+    icons = {'updated': '✅', 'missing': '⚠️', 'failed': '❌'}
+    attempts = f", {result['attempts']} attempts" if result['attempts'] > 1 else ''
+    return (
+        f"{icons[result['status']]} {result['config']} {result['name']}: {result['message']} "
+        f"({result['ms']:.0f} ms{attempts})"
+    )
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Update deployed flow content without CloudFormation.")
+    parser.add_argument('--env', required=True, help="Environment to deploy (dev, staging)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--config', action='append', help="Config file to deploy (repeatable, default: all)")
+    parser.add_argument('--flow', action='append', help="Flow name to deploy (repeatable, default: all)")
+    parser.add_argument('--region', help="AWS region (default: from the AWS configuration)")
+    parser.add_argument('--instance-arn', help="Instance ARN to use instead of looking up instance_name")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent update calls")
+    parser.add_argument('--tps', type=float, default=DEFAULT_TPS, help="Update calls per second")
+    parser.add_argument('--burst', type=int, default=DEFAULT_BURST, help="Update calls allowed in a burst")
+    parser.add_argument('-c', '--context', action='append', default=[], help="CDK context value as key=value")
+    parser.add_argument('--format', choices=['text', 'json'], default='text')
+    parser.add_argument('--force', action='store_true', help="Allow environments other than dev and staging")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    try:
+        results = deploy_flows(
+            args.project_root,
+            args.env,
+            region=args.region,
+            instance_arn=args.instance_arn,
+            config_filenames=args.config,
+            flow_names=args.flow,
+            workers=args.workers,
+            caller=RateLimitedCaller(TokenBucket(args.tps, args.burst)),
+            force=args.force,
+            context=load_context(args.project_root, parse_context(args.context))
+        )
+    except Exception as e:
+        print(f"❌ {args.env}: {str(e)}")
+        sys.exit(1)
+    
+    if args.format == 'json':
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print(format_result(result))
+        updated = sum(1 for result in results if result['status'] == 'updated')
+        print(f"Updated {updated} of {len(results)} flows in {args.env}")
+    
+    if any(result['status'] != 'updated' for result in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Process-wide cache of parsed Amazon Connect flow files.
+"""
+import json
+import logging
+import pickle
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (mtime_ns, size) of the file when it was parsed
+_FileStamp = Tuple[int, int]
+
+
+class FlowCache:
+    """
+    Size-bounded LRU cache of parsed flow files.
+    
+    Entries are keyed by resolved path and revalidated against the file's
+    mtime and size on every lookup, so edited files are re-parsed. Each entry
+    holds a pickled snapshot of the parsed JSON, and every load returns a
+    fresh copy built from it: callers such as FlowParameterUpdater can mutate
+    what they get back without affecting any other flow.
+    """
+    
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Maximum number of flow files kept in the cache
+            max_bytes: Maximum total size of the cached snapshots in bytes
+        
+        Raises:
+            ValueError: If a bound is not positive
+        """
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries and max_bytes must be positive")
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Tuple[_FileStamp, bytes]]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def load(self, flow_path: Path) -> Dict[str, Any]:
+        """
+        Load a parsed flow file, parsing it only if it is not cached or has changed.
+        
+        Args:
+            flow_path: Path to the flow JSON file
+        
+        Returns:
+            An isolated copy of the parsed flow content
+        
+        Raises:
+            FileNotFoundError: If the flow file doesn't exist
+            json.JSONDecodeError: If the flow file is not valid JSON
+        """
+        key = str(Path(flow_path).resolve())
+        stat = Path(key).stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                cached: Dict[str, Any] = pickle.loads(entry[1])
+                return cached
+            self.misses += 1
+        
+        with open(key, 'r') as f:
+            flow_content: Dict[str, Any] = json.load(f)
+        
+        snapshot = pickle.dumps(flow_content, protocol=pickle.HIGHEST_PROTOCOL)
+        self._store(key, stamp, snapshot)
+        
+        return flow_content
+    
+    def _store(self, key: str, stamp: _FileStamp, snapshot: bytes) -> None:
+        """Insert a snapshot and evict least recently used entries over the bounds."""
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous[1])
+            
+            if len(snapshot) > self.max_bytes:
+                logger.debug(f"Not caching {key}: snapshot larger than cache bound")
+                return
+            
+            self._entries[key] = (stamp, snapshot)
+            self._total_bytes += len(snapshot)
+            
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, cached bytes, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+
+_default_cache = FlowCache()
+
+
+def get_flow_cache() -> FlowCache:
+    """
+    Get the process-wide flow cache shared by all stacks.
+    
+    Returns:
+        The shared FlowCache instance
+    """
+    return _default_cache
@@ -1,10 +1,11 @@
 """
 Flow parameter updater utility for Amazon Connect flows.
 """
-import json
 import logging
 from typing import Dict, Any, List, Optional
 
+from .serialization import dumps_flow
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,6 +33,114 @@ class FlowParameterUpdater:
         self.flow_content = flow_content
         self.updated_blocks: List[str] = []
         self.failed_updates: List[str] = []
+        self._action_index: Dict[str, Dict[str, Any]] = {}
+        self._rebuild_index()
+    
+    def _rebuild_index(self) -> None:
+        """
+        Build the Identifier -> action index from the current Actions list.
+        
+        The first action wins when identifiers are duplicated, matching the
+        order in which a linear scan of Actions would find them.
+        """
+        index: Dict[str, Dict[str, Any]] = {}
+        for action in self.flow_content.get('Actions', []):
+            identifier = action.get('Identifier')
+            if identifier is not None and identifier not in index:
+                index[identifier] = action
+        self._action_index = index
+    
+    def get_block(self, identifier: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a block by its identifier.
+        
+        Args:
+            identifier: The unique identifier of the block
+        
+        Returns:
+            The action dictionary, or None if no block has this identifier
+        """
+        return self._action_index.get(identifier)
+    
+    def add_block(self, action: Dict[str, Any]) -> 'FlowParameterUpdater':
+        """
+        Append a new block to the flow.
+        
+        Args:
+            action: The action dictionary to add
+        
+        Returns:
+            Self for method chaining
+        
+        Raises:
+            ValueError: If the action has no identifier or the identifier already exists
+        """
+        identifier = action.get('Identifier') if isinstance(action, dict) else None
+        if not identifier:
+            raise ValueError("action must be a dictionary with an 'Identifier'")
+        
+        if identifier in self._action_index:
+            raise ValueError(f"Block with identifier '{identifier}' already exists in flow")
+        
+        self.flow_content['Actions'].append(action)
+        self._action_index[identifier] = action
+        return self
+    
+    def replace_block(self, action: Dict[str, Any]) -> 'FlowParameterUpdater':
+        """
+        Replace an existing block with a new action of the same identifier.
+        
+        Args:
+            action: The replacement action dictionary
+        
+        Returns:
+            Self for method chaining
+        
+        Raises:
+            ValueError: If the action has no identifier or no block has that identifier
+        """
+        identifier = action.get('Identifier') if isinstance(action, dict) else None
+        if not identifier:
+            raise ValueError("action must be a dictionary with an 'Identifier'")
+        
+        existing = self._action_index.get(identifier)
+        if existing is None:
+            raise ValueError(f"Block with identifier '{identifier}' not found in flow")
+        
+        actions = self.flow_content['Actions']
+        for position, candidate in enumerate(actions):
+            if candidate is existing:
+                actions[position] = action
+                break
+        
+        self._action_index[identifier] = action
+        return self
+    
+    def _apply_parameters(
+        self,
+        identifier: str,
+        parameters: Dict[str, Any],
+        merge: bool
+    ) -> bool:
+        """
+        Apply parameters to the indexed block, recording the outcome.
+        
+        Returns:
+            True if the block was found and updated
+        """
+        action = self._action_index.get(identifier)
+        
+        if action is None:
+            self.failed_updates.append(identifier)
+            return False
+        
+        if merge:
+            action.setdefault('Parameters', {}).update(parameters)
+        else:
+            action['Parameters'] = parameters
+        
+        self.updated_blocks.append(identifier)
+        return True
     
     def update_block_parameters(
         self, 
@@ -59,26 +168,9 @@ class FlowParameterUpdater:
         if not isinstance(parameters, dict):
             raise ValueError("parameters must be a dictionary")
         
-        block_found = False
-        
-        for action in self.flow_content.get('Actions', []):
-            if action.get('Identifier') == identifier:
-                block_found = True
-                
-                if 'Parameters' not in action:
-                    action['Parameters'] = {}
-                
-                if merge:
-                    action['Parameters'].update(parameters)
-                else:
-                    action['Parameters'] = parameters
-                
-                self.updated_blocks.append(identifier)
-                logger.info(f"Updated block {identifier}")
-                break
-        
-        if not block_found:
-            self.failed_updates.append(identifier)
+        if self._apply_parameters(identifier, parameters, merge):
+            logger.info(f"Updated block {identifier}")
+        else:
             logger.warning(f"Block with identifier '{identifier}' not found in flow")
         
         return self
@@ -104,8 +196,26 @@ class FlowParameterUpdater:
         if not isinstance(updates, dict):
             raise ValueError("updates must be a dictionary")
         
+        # Validate the whole batch up front so a bad entry cannot leave the
+        # flow half-updated
+        for identifier, parameters in updates.items():
+            if not identifier:
+                raise ValueError("identifier cannot be empty")
+            if not isinstance(parameters, dict):
+                raise ValueError("parameters must be a dictionary")
+        
+        failed_before = len(self.failed_updates)
+        updated_before = len(self.updated_blocks)
+        
         for identifier, parameters in updates.items():
-            self.update_block_parameters(identifier, parameters, merge)
+            self._apply_parameters(identifier, parameters, merge)
+        
+        updated = len(self.updated_blocks) - updated_before
+        failed = self.failed_updates[failed_before:]
+        
+        logger.info(f"Updated {updated} blocks")
+        if failed:
+            logger.warning(f"Blocks not found in flow: {failed}")
         
         return self
     
@@ -126,7 +236,10 @@ class FlowParameterUpdater:
     
     def get_content_json(self, indent: Optional[int] = None) -> str:
         """
-        Get the updated flow content as a JSON string.
+        Get the updated flow content as a canonical JSON string.
+        
+        Keys are sorted and the compact form has no whitespace, so identical
+        content always serializes to identical bytes.
         
         Args:
             indent: Number of spaces for indentation (None for compact)
@@ -134,7 +247,7 @@ class FlowParameterUpdater:
         Returns:
             The modified flow content as a JSON string
         """
-        return json.dumps(self.flow_content, indent=indent)
+        return dumps_flow(self.flow_content, indent=indent)
     
     def get_content(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,280 @@
+"""
+Graph analysis of Amazon Connect flow content.
+
+Actions are nodes and transitions are edges: StartAction points at the
+first action, and each action's Transitions hold a NextAction plus the
+NextAction of every Errors and Conditions entry. One adjacency index is
+built per flow, and every check runs in O(V+E) over it.
+
+Errors (the flow would be rejected on deploy):
+    missing or unknown StartAction, transitions to unknown actions, and
+    duplicate action identifiers.
+
+Warnings:
+    actions not reachable from StartAction, and cycles that don't pass
+    through a Loop action (Loop blocks are how flows retry on purpose).
+
+prune_unreachable removes the unreachable actions, with their ActionMetadata,
+before deployment.
+"""
+from typing import Dict, Any, List, Optional, Tuple
+
+# Action types whose cycles are intended
+LOOP_ACTION_TYPES = frozenset({'Loop'})
+
+# 'error' fails rendering on graph errors, 'warn' only logs, 'off' is silent
+GRAPH_CHECK_MODES = ('error', 'warn', 'off')
+
+# (target identifier, JSON path of the transition)
+_Edge = Tuple[str, str]
+
+
+class FlowGraphError(ValueError):
+    """
+    Raised when a rendered flow has graph errors.
+    
+    The message lists every error; the errors themselves are in 'errors'.
+    """
+    
+    def __init__(self, flow_name: str, errors: List[Dict[str, str]]):
+        self.flow_name = flow_name
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} graph error(s) in {flow_name}: "
+            + '; '.join(f"{error['path']}: {error['message']}" for error in errors)
+        )
+
+
+def validate_graph_check(mode: str) -> str:
+    """
+    Validate a graph check mode.
+    
+    Args:
+        mode: Graph check mode
+    
+    Returns:
+        The mode, unchanged
+    
+    Raises:
+        ValueError: If mode is not one of GRAPH_CHECK_MODES
+    """
+    if mode not in GRAPH_CHECK_MODES:
+        raise ValueError(f"Invalid graph check mode '{mode}'. Must be one of: {', '.join(GRAPH_CHECK_MODES)}")
+    return mode
+
+
+def build_adjacency(flow_content: Dict[str, Any]) -> Tuple[Dict[str, int], Dict[str, List[_Edge]]]:
+    """
+    Index a flow's actions and transitions.
+    
+    Args:
+        flow_content: Parsed flow content
+    
+    Returns:
+        Tuple of the index of each action identifier in Actions (the first
+        one wins for duplicates) and the outgoing edges of each action, in
+        document order
+    """
+    index: Dict[str, int] = {}
+    edges: Dict[str, List[_Edge]] = {}
+    
+    for idx, action in enumerate(flow_content.get('Actions') or []):
+        if not isinstance(action, dict) or not isinstance(action.get('Identifier'), str):
+            continue
+        identifier = action['Identifier']
+        if identifier in index:
+            continue
+        index[identifier] = idx
+        
+        outgoing: List[_Edge] = []
+        path = f"$.Actions[{idx}].Transitions"
+        transitions = action.get('Transitions') or {}
+        
+        if isinstance(transitions.get('NextAction'), str):
+            outgoing.append((transitions['NextAction'], f"{path}.NextAction"))
+        for branch in ('Errors', 'Conditions'):
+            for branch_idx, entry in enumerate(transitions.get(branch) or []):
+                if isinstance(entry, dict) and isinstance(entry.get('NextAction'), str):
+                    outgoing.append((entry['NextAction'], f"{path}.{branch}[{branch_idx}].NextAction"))
+        
+        edges[identifier] = outgoing
+    
+    return index, edges
+
+
+def reachable_actions(start: Optional[str], edges: Dict[str, List[_Edge]]) -> List[str]:
+    """
+    Find the actions reachable from the start action.
+    
+    Args:
+        start: StartAction identifier
+        edges: Outgoing edges from build_adjacency
+    
+    Returns:
+        Reachable identifiers in depth-first order (empty if start is unknown)
+    """
+    if start not in edges:
+        return []
+    
+    seen = {start}
+    order = []
+    stack = [start]
+    while stack:
+        identifier = stack.pop()
+        order.append(identifier)
+        for target, _ in reversed(edges[identifier]):
+            if target in edges and target not in seen:
+                seen.add(target)
+                stack.append(target)
+    
+    return order
+
+
+def find_cycles(edges: Dict[str, List[_Edge]]) -> List[List[str]]:
+    """
+    Find cycles with Tarjan's strongly connected components algorithm.
+    
+    Iterative, so long flows don't hit the recursion limit.
+    
+    Args:
+        edges: Outgoing edges from build_adjacency
+    
+    Returns:
+        Identifiers of every component with a cycle (more than one action,
+        or an action transitioning to itself), in document order
+    """
+    order = {identifier: idx for idx, identifier in enumerate(edges)}
+    lowlink: Dict[str, int] = {}
+    number: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    cycles = []
+    
+    for root in edges:
+        if root in number:
+            continue
+        work = [(root, 0)]
+        while work:
+            identifier, edge_idx = work.pop()
+            if edge_idx == 0:
+                number[identifier] = lowlink[identifier] = len(number)
+                stack.append(identifier)
+                on_stack.add(identifier)
+            
+            outgoing = edges[identifier]
+            while edge_idx < len(outgoing):
+                target = outgoing[edge_idx][0]
+                edge_idx += 1
+                if target not in edges:
+                    continue
+                if target not in number:
+                    work.append((identifier, edge_idx))
+                    work.append((target, 0))
+                    break
+                if target in on_stack:
+                    lowlink[identifier] = min(lowlink[identifier], number[target])
+            else:
+                if lowlink[identifier] == number[identifier]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == identifier:
+                            break
+                    if len(component) > 1 or any(target == identifier for target, _ in outgoing):
+                        cycles.append(sorted(component, key=order.__getitem__))
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[identifier])
+    
+    return sorted(cycles, key=lambda component: order[component[0]])
+
+
+def analyze_flow(flow_content: Dict[str, Any]) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Check a flow's graph.
+    
+    Args:
+        flow_content: Parsed flow content
+    
+    Returns:
+        Dictionary with 'errors' and 'warnings', each a list of issues with
+        a JSON 'path' and a 'message'
+    """
+    errors: List[Dict[str, str]] = []
+    warnings: List[Dict[str, str]] = []
+    actions = flow_content.get('Actions') or []
+    index, edges = build_adjacency(flow_content)
+    
+    seen = set()
+    for idx, action in enumerate(actions):
+        identifier = action.get('Identifier') if isinstance(action, dict) else None
+        if identifier in seen:
+            errors.append({'path': f"$.Actions[{idx}].Identifier", 'message': f"Duplicate action '{identifier}'"})
+        seen.add(identifier)
+    
+    start = flow_content.get('StartAction')
+    if not isinstance(start, str) or not start:
+        errors.append({'path': '$', 'message': "Missing StartAction"})
+    elif start not in index:
+        errors.append({'path': '$.StartAction', 'message': f"StartAction '{start}' is not an action"})
+    
+    for identifier, outgoing in edges.items():
+        for target, path in outgoing:
+            if target not in index:
+                errors.append({'path': path, 'message': f"Transition from '{identifier}' to unknown action '{target}'"})
+    
+    if start in index:
+        reachable = set(reachable_actions(start, edges))
+        for identifier, idx in index.items():
+            if identifier not in reachable:
+                warnings.append({'path': f"$.Actions[{idx}]", 'message': f"Action '{identifier}' is unreachable"})
+    
+    types = {identifier: actions[idx].get('Type') for identifier, idx in index.items()}
+    for component in find_cycles(edges):
+        if not any(types[identifier] in LOOP_ACTION_TYPES for identifier in component):
+            warnings.append({
+                'path': f"$.Actions[{index[component[0]]}]",
+                'message': f"Cycle without a Loop action: {' -> '.join(component)}"
+            })
+    
+    return {'errors': errors, 'warnings': warnings}
+
+
+def prune_unreachable(flow_content: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Remove actions not reachable from StartAction, and their metadata, in place.
+    
+    Nothing is removed if StartAction is missing or unknown, since every
+    action would be unreachable then.
+    
+    Args:
+        flow_content: Parsed flow content
+    
+    Returns:
+        Dictionary with the identifiers of the 'removed' actions
+    """
+    report: Dict[str, Any] = {'removed': []}
+    index, edges = build_adjacency(flow_content)
+    start = flow_content.get('StartAction')
+    if start not in index:
+        return report
+    
+    reachable = set(reachable_actions(start, edges))
+    removed = [identifier for identifier in index if identifier not in reachable]
+    if not removed:
+        return report
+    
+    flow_content['Actions'] = [
+        action for action in flow_content['Actions']
+        if not isinstance(action, dict) or action.get('Identifier') in reachable
+    ]
+    
+    action_metadata = (flow_content.get('Metadata') or {}).get('ActionMetadata')
+    if isinstance(action_metadata, dict):
+        for identifier in removed:
+            action_metadata.pop(identifier, None)
+    
+    report['removed'] = removed
+    return report
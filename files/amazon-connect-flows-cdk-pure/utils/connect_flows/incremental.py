@@ -0,0 +1,256 @@
+"""
+Content hashes of stacks and flows for incremental synth and deploy.
+
+A stack's hash covers its config file, the bytes of every flow file it uses,
+the CDK context values that change its template and the code that renders
+it. Hashes of the last deployed state are kept in a manifest next to
+cdk.out; comparing against it tells which stacks and flows changed.
+
+Usage:
+    python -m utils.connect_flows.incremental changed --env dev [-c stripMetadata=layout]
+    python -m utils.connect_flows.incremental record --env dev
+"""
+import argparse
+import functools
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from .discovery import load_configs, resolve_environments, stack_id
+from .render_cache import RenderCache
+from .serialization import canonical_hash, serializer_id
+from .settings import load_context, parse_context
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'flow-manifest.json'
+MANIFEST_VERSION = 1
+
+# CDK context values that change the synthesized templates
+RELEVANT_CONTEXT_KEYS = (
+    'connectInstanceName',
+    'connectInstanceArn',
+    'queueArn',
+    'stripMetadata',
+    'pruneOrphanMetadata',
+    'pruneUnreachable',
+    'flowSharding',
+    'flowShardCount',
+    'flowShardBytes',
+    'flowsPerShard'
+)
+
+# Sources that turn configs and flows into templates
+CODE_PATHS = ('app.py', 'stacks', 'utils/connect_flows')
+
+
+@functools.lru_cache(maxsize=None)
+def code_hash(project_root: Path) -> str:
+    """
+    Hash the code that renders flows and builds stacks.
+    
+    Args:
+        project_root: Project root directory
+    
+    Returns:
+        Hex SHA-256 digest over the Python sources in CODE_PATHS
+    """
+    digest = hashlib.sha256()
+    
+    for code_path in CODE_PATHS:
+        path = project_root / code_path
+        files = sorted(path.rglob('*.py')) if path.is_dir() else [path]
+        for source in files:
+            if source.is_file():
+                digest.update(str(source.relative_to(project_root)).encode('utf-8'))
+                digest.update(source.read_bytes())
+    
+    return digest.hexdigest()
+
+
+def fingerprint_environment(
+    project_root: Path,
+    environment: str,
+    context: Optional[Dict[str, Any]] = None,
+    configs: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compute the hashes of every stack of an environment.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name
+        context: CDK context values (only RELEVANT_CONTEXT_KEYS are used)
+        configs: Already loaded configurations keyed by filename (loaded if None)
+    
+    Returns:
+        Manifest entries keyed by stack ID, each with the 'environment',
+        'config' filename, stack 'hash' and per-flow 'flows' hashes
+    
+    Raises:
+        FileNotFoundError: If the config directory doesn't exist
+        ValueError: If a configuration is invalid
+    """
+    context = context or {}
+    relevant_context = {key: str(context[key]) for key in RELEVANT_CONTEXT_KEYS if context.get(key) is not None}
+    flows_dir = project_root / 'flows'
+    file_hashes: Dict[Path, str] = {}
+    
+    def flow_hash(flow_config: Dict[str, Any]) -> str:
+        flow_path = flows_dir / flow_config['filename']
+        if flow_path not in file_hashes:
+            file_hashes[flow_path] = RenderCache.hash_file(flow_path) if flow_path.is_file() else 'missing'
+        return canonical_hash({'file': file_hashes[flow_path], 'config': flow_config})
+    
+    entries = {}
+    if configs is None:
+        configs = load_configs(project_root / 'config' / 'connect_flows' / environment)
+    
+    for config_filename, config in configs.items():
+        flows = {flow_config['name']: flow_hash(flow_config) for flow_config in config.get('flows', [])}
+        entries[stack_id(config_filename, environment)] = {
+            'environment': environment,
+            'config': config_filename,
+            'hash': canonical_hash({
+                'version': MANIFEST_VERSION,
+                'code': code_hash(project_root),
+                'serializer': serializer_id(),
+                'context': relevant_context,
+                'config': {key: value for key, value in config.items() if key != 'flows'},
+                'flows': list(flows.items())
+            }),
+            'flows': flows
+        }
+    
+    return entries
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the manifest of the last deployed state.
+    
+    Args:
+        manifest_path: Path to the manifest
+    
+    Returns:
+        Manifest entries keyed by stack ID (empty if there is no usable manifest)
+    """
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_path}: {str(e)}")
+        return {}
+    
+    if manifest.get('version') != MANIFEST_VERSION:
+        logger.warning(f"Ignoring manifest {manifest_path} with version {manifest.get('version')}")
+        return {}
+    
+    stacks: Dict[str, Dict[str, Any]] = manifest.get('stacks', {})
+    return stacks
+
+
+def save_manifest(manifest_path: Path, entries: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Record stack hashes as deployed.
+    
+    Entries of stacks not in entries (e.g. other environments) are kept.
+    
+    Args:
+        manifest_path: Path to the manifest
+        entries: Manifest entries keyed by stack ID
+    """
+    stacks = load_manifest(manifest_path)
+    stacks.update(entries)
+    
+    fd, tmp_name = tempfile.mkstemp(dir=manifest_path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump({'version': MANIFEST_VERSION, 'stacks': dict(sorted(stacks.items()))}, f, indent=2)
+    os.replace(tmp_name, manifest_path)
+
+
+def diff_stacks(
+    current: Dict[str, Dict[str, Any]],
+    recorded: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Find the stacks whose hash changed since they were recorded.
+    
+    Args:
+        current: Current manifest entries keyed by stack ID
+        recorded: Recorded manifest entries keyed by stack ID
+    
+    Returns:
+        Changed stacks, in the order of current, with the names of their
+        'added', 'modified' and 'removed' flows. A stack can change without
+        any flow changing, e.g. when its context or the code changes.
+    """
+    changed = {}
+    
+    for name, entry in current.items():
+        previous = recorded.get(name)
+        if previous and previous['hash'] == entry['hash']:
+            continue
+        
+        before = previous['flows'] if previous else {}
+        changed[name] = {
+            'added': [flow for flow in entry['flows'] if flow not in before],
+            'modified': [
+                flow for flow, flow_hash in entry['flows'].items()
+                if flow in before and before[flow] != flow_hash
+            ],
+            'removed': [flow for flow in before if flow not in entry['flows']]
+        }
+    
+    return changed
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Find or record the stacks changed since the last deploy.")
+    parser.add_argument('command', choices=['changed', 'record'])
+    parser.add_argument('--env', default='dev', help="Environments, comma-separated or 'all' (default: %(default)s)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--manifest', type=Path, help=f"Manifest path (default: <project-root>/{MANIFEST_FILENAME})")
+    parser.add_argument('-c', '--context', action='append', default=[], help="CDK context value as key=value")
+    parser.add_argument('-v', '--verbose', action='store_true', help="List the changed flows of every stack")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    manifest_path = args.manifest or args.project_root / MANIFEST_FILENAME
+    
+    try:
+        context = load_context(args.project_root, parse_context(args.context))
+        current = {}
+        for environment in resolve_environments(args.env, args.project_root / 'config' / 'connect_flows'):
+            current.update(fingerprint_environment(args.project_root, environment, context))
+    except Exception as e:
+        print(f"❌ {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.command == 'record':
+        save_manifest(manifest_path, current)
+        print(f"Recorded {len(current)} stacks in {manifest_path}", file=sys.stderr)
+        return
+    
+    # Stack IDs go to stdout, one per line, so they can be passed to cdk deploy
+    for name, flows in diff_stacks(current, load_manifest(manifest_path)).items():
+        print(name)
+        if args.verbose:
+            for change, names in flows.items():
+                for flow in names:
+                    print(f"   {change}: {flow}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
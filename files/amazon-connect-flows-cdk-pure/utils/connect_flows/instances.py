@@ -0,0 +1,253 @@
+"""
+Lookup of Amazon Connect instance ARNs by instance alias.
+
+One paginated ListInstances sweep resolves every alias of an account and
+region at once. The result is kept for the rest of the process and on disk in
+.flowcache/instances.json with a TTL, much like cdk.context.json caches CDK
+lookups, so any number of stacks and repeated synths make at most one API call
+per region until the entry expires.
+
+Usage:
+    python -m utils.connect_flows.instances lookup <alias> [--region us-east-1]
+    python -m utils.connect_flows.instances clear
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from .render_cache import DEFAULT_CACHE_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = 'instances.json'
+CACHE_VERSION = 1
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+
+def _default_client_factory(region: Optional[str]) -> Any:
+    """Create a Connect client; boto3 is only imported when a lookup is needed."""
+    import boto3
+    
+    return boto3.client('connect', region_name=region)
+
+
+def list_instance_arns(client: Any) -> Dict[str, str]:
+    """
+    List every Connect instance of an account and region.
+    
+    Args:
+        client: boto3 Connect client
+    
+    Returns:
+        Dictionary of instance alias to instance ARN
+    """
+    instances = {}
+    for page in client.get_paginator('list_instances').paginate():
+        for summary in page.get('InstanceSummaryList', []):
+            if summary.get('InstanceAlias'):
+                instances[summary['InstanceAlias']] = summary['Arn']
+    return instances
+
+
+class InstanceLookup:
+    """
+    Resolves instance aliases to ARNs with a process and an on-disk cache.
+    
+    Entries are keyed by account and region. A cached sweep that doesn't
+    contain an alias is refreshed once before the alias is reported missing,
+    so newly created instances are found without clearing the cache.
+    """
+    
+    def __init__(
+        self,
+        cache_path: Optional[Path] = None,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        client_factory: Callable[[Optional[str]], Any] = _default_client_factory
+    ):
+        """
+        Initialize the lookup.
+        
+        Args:
+            cache_path: JSON file of the on-disk cache (None to keep results in memory only)
+            ttl_seconds: How long on-disk entries stay valid (0 to ignore the file)
+            client_factory: Creates a Connect client for a region
+        """
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.ttl_seconds = ttl_seconds
+        self.client_factory = client_factory
+        self._instances: Dict[str, Dict[str, str]] = {}
+        self._fetched: Set[str] = set()
+        self._lock = threading.Lock()
+        self.api_calls = 0
+    
+    @staticmethod
+    def _key(region: Optional[str], account: Optional[str]) -> str:
+        """Get the cache key of an account and region."""
+        return f"{account or 'default'}:{region or 'default'}"
+    
+    def lookup(self, alias: str, region: Optional[str] = None, account: Optional[str] = None) -> str:
+        """
+        Resolve an instance alias to its ARN.
+        
+        Args:
+            alias: Instance alias (the config's instance_name)
+            region: AWS region (None for the default region of the credentials)
+            account: AWS account, used to keep accounts apart in the cache
+        
+        Returns:
+            The instance ARN
+        
+        Raises:
+            ValueError: If no instance has the alias
+        """
+        key = self._key(region, account)
+        
+        # One sweep per key at a time; stacks waiting on it are served from memory
+        with self._lock:
+            instances = self._instances.get(key)
+            if instances is None:
+                instances = self._read(key)
+            if instances is None or (alias not in instances and key not in self._fetched):
+                instances = self._fetch(key, region)
+            self._instances[key] = instances
+        
+        if alias not in instances:
+            known = ', '.join(sorted(instances)) or 'none'
+            raise ValueError(f"Connect instance '{alias}' not found in {region or 'default region'} (found: {known})")
+        
+        return instances[alias]
+    
+    def _fetch(self, key: str, region: Optional[str]) -> Dict[str, str]:
+        """List the instances of a region and store them on disk."""
+        logger.info(f"Listing Connect instances in {region or 'default region'}")
+        instances = list_instance_arns(self.client_factory(region))
+        self.api_calls += 1
+        self._fetched.add(key)
+        self._write(key, instances)
+        return instances
+    
+    def _load_file(self) -> Dict[str, Any]:
+        """Read the cache file, treating a missing or unreadable file as empty."""
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable instance cache {self.cache_path}: {str(e)}")
+            return {}
+        
+        if not isinstance(data, dict) or data.get('version') != CACHE_VERSION:
+            return {}
+        entries: Dict[str, Any] = data.get('entries', {})
+        return entries
+    
+    def _read(self, key: str) -> Optional[Dict[str, str]]:
+        """Get the instances of a key from disk if the entry has not expired."""
+        if self.ttl_seconds <= 0:
+            return None
+        
+        entry = self._load_file().get(key)
+        if not entry or time.time() - entry.get('fetched_at', 0) > self.ttl_seconds:
+            return None
+        instances: Optional[Dict[str, str]] = entry.get('instances')
+        return instances
+    
+    def _write(self, key: str, instances: Dict[str, str]) -> None:
+        """Store the instances of a key on disk, keeping the other entries."""
+        if not self.cache_path:
+            return
+        
+        entries = self._load_file()
+        entries[key] = {'fetched_at': time.time(), 'instances': instances}
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': entries}, f, indent=2, sort_keys=True)
+            os.replace(tmp_name, self.cache_path)
+        except OSError as e:
+            # The cache is an optimization; failing to write it must not fail the synth
+            logger.warning(f"Failed to write instance cache {self.cache_path}: {str(e)}")
+    
+    def clear(self) -> None:
+        """Forget every cached lookup, in memory and on disk."""
+        with self._lock:
+            self._instances.clear()
+            self._fetched.clear()
+            if self.cache_path and self.cache_path.exists():
+                self.cache_path.unlink()
+
+
+_lookups: Dict[Path, InstanceLookup] = {}
+_lookups_lock = threading.Lock()
+
+
+def get_instance_lookup(cache_path: Path, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> InstanceLookup:
+    """
+    Get the process-wide instance lookup for a cache file.
+    
+    Stacks sharing a cache file share one instance, so the app makes at most
+    one ListInstances sweep per account and region.
+    
+    Args:
+        cache_path: JSON file of the on-disk cache
+        ttl_seconds: How long on-disk entries stay valid
+    
+    Returns:
+        The shared InstanceLookup for cache_path
+    """
+    key = Path(cache_path).resolve()
+    
+    with _lookups_lock:
+        if key not in _lookups:
+            _lookups[key] = InstanceLookup(key, ttl_seconds)
+        _lookups[key].ttl_seconds = ttl_seconds
+        return _lookups[key]
+
+
+def main() -> None:
+    """Command line entry point for looking up instances and clearing the cache."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Look up Amazon Connect instance ARNs.")
+    parser.add_argument('command', choices=['lookup', 'clear'])
+    parser.add_argument('alias', nargs='?', help="Instance alias to look up")
+    parser.add_argument('--region', help="AWS region (default: from the AWS configuration)")
+    parser.add_argument(
+        '--cache-file',
+        type=Path,
+        default=project_root / DEFAULT_CACHE_DIRNAME / CACHE_FILENAME,
+        help="Cache file (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    
+    lookup = InstanceLookup(args.cache_file)
+    
+    if args.command == 'clear':
+        lookup.clear()
+        print(f"Cleared {args.cache_file}")
+        return
+    
+    if not args.alias:
+        parser.error("lookup requires an instance alias")
+    
+    try:
+        print(lookup.lookup(args.alias, args.region))
+    except Exception as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
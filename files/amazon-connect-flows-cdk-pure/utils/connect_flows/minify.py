@@ -0,0 +1,112 @@
+"""
+Removal of designer-only metadata from Amazon Connect flow content.
+
+The flow designer stores block positions and other layout data under
+Metadata. Connect does not need it to run a flow, and it is inlined into
+every CfnContactFlow. Modes:
+
+    none    Keep Metadata as exported (default)
+    layout  Remove block positions, entryPointPosition, snapToGrid and
+            annotations; keep other metadata the designer uses for display
+    all     Remove Metadata entirely
+
+Orphan pruning removes ActionMetadata entries for blocks that no longer
+exist in Actions, and can be combined with any mode.
+"""
+import logging
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+STRIP_MODES = ('none', 'layout', 'all')
+
+# Designer-only keys directly under Metadata
+LAYOUT_METADATA_KEYS = ('entryPointPosition', 'snapToGrid', 'Annotations')
+
+# Designer-only keys of each ActionMetadata entry
+LAYOUT_ACTION_METADATA_KEYS = ('position',)
+
+
+def validate_strip_mode(mode: str) -> str:
+    """
+    Validate a metadata strip mode.
+    
+    Args:
+        mode: Strip mode to validate
+    
+    Returns:
+        The mode
+    
+    Raises:
+        ValueError: If the mode is not one of STRIP_MODES
+    """
+    if mode not in STRIP_MODES:
+        raise ValueError(f"Invalid strip_metadata mode '{mode}'. Must be one of: {', '.join(STRIP_MODES)}")
+    return mode
+
+
+def strip_metadata(
+    flow_content: Dict[str, Any],
+    mode: str = 'layout',
+    prune_orphans: bool = False
+) -> Dict[str, Any]:
+    """
+    Remove editor-only metadata from flow content in place.
+    
+    Args:
+        flow_content: Parsed flow content
+        mode: One of STRIP_MODES
+        prune_orphans: Remove ActionMetadata for blocks not in Actions
+    
+    Returns:
+        Dictionary with the 'mode', 'removed_keys' count and the 'orphans' removed
+    
+    Raises:
+        ValueError: If mode is invalid
+    """
+    validate_strip_mode(mode)
+    report: Dict[str, Any] = {'mode': mode, 'removed_keys': 0, 'orphans': []}
+    
+    metadata = flow_content.get('Metadata')
+    if not isinstance(metadata, dict):
+        return report
+    
+    if mode == 'all':
+        del flow_content['Metadata']
+        report['removed_keys'] = 1
+        return report
+    
+    action_metadata = metadata.get('ActionMetadata')
+    
+    if prune_orphans and isinstance(action_metadata, dict):
+        identifiers = {action.get('Identifier') for action in flow_content.get('Actions', [])}
+        orphans: List[str] = [identifier for identifier in action_metadata if identifier not in identifiers]
+        for identifier in orphans:
+            del action_metadata[identifier]
+        report['orphans'] = orphans
+    
+    if mode == 'layout':
+        for key in LAYOUT_METADATA_KEYS:
+            if key in metadata:
+                del metadata[key]
+                report['removed_keys'] += 1
+        
+        if isinstance(action_metadata, dict):
+            for identifier in list(action_metadata):
+                entry = action_metadata[identifier]
+                if not isinstance(entry, dict):
+                    continue
+                for key in LAYOUT_ACTION_METADATA_KEYS:
+                    if key in entry:
+                        del entry[key]
+                        report['removed_keys'] += 1
+                if not entry:
+                    del action_metadata[identifier]
+            
+            if not action_metadata:
+                del metadata['ActionMetadata']
+        
+        if not metadata:
+            del flow_content['Metadata']
+    
+    return report
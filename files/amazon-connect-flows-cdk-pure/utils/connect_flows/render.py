@@ -0,0 +1,516 @@
+"""
+Render Amazon Connect flows from configuration without CDK.
+
+This is the engine used by ConnectFlowStack to turn a flow configuration into
+flow content. It only depends on the standard library, so configs can be
+rendered and checked without starting the jsii runtime.
+
+Usage:
+    python -m utils.connect_flows.render --env prod [--output-dir rendered/prod] [--check] [-c stripMetadata=layout]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+from .discovery import load_configs
+from .flow_cache import FlowCache, get_flow_cache
+from .flow_updater import FlowParameterUpdater
+from .graph import GRAPH_CHECK_MODES, FlowGraphError, analyze_flow, prune_unreachable, validate_graph_check
+from .minify import STRIP_MODES, strip_metadata, validate_strip_mode
+from .render_cache import DEFAULT_CACHE_DIRNAME, RenderCache, get_render_cache
+from .resources import credentials_available, find_refs, get_resource_resolver
+from .serialization import dumps_flow
+from .settings import load_context, parse_context, render_options, resolve_instance_arn
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+class FlowRenderer:
+    """
+    Renders flow configurations into flow content JSON strings.
+    
+    Each rendered flow is returned as a dictionary with the flow's 'name',
+    'type', 'filename', rendered 'content', update 'validation' summary,
+    post-processing 'report' and 'cached' (True when served from the render
+    cache).
+    
+    Flows can set 'strip_metadata' (see utils.connect_flows.minify),
+    'prune_orphan_metadata' and 'prune_unreachable' (see
+    utils.connect_flows.graph); the renderer's defaults apply otherwise.
+    
+    The graph of every rendered flow is checked (see utils.connect_flows.graph)
+    and the result kept in the report, so cached flows are checked as well.
+    """
+    
+    def __init__(
+        self,
+        flows_dir: Path,
+        flow_cache: Optional[FlowCache] = None,
+        render_cache: Optional[RenderCache] = None,
+        strip_metadata: str = 'none',
+        prune_orphan_metadata: bool = False,
+        graph_check: str = 'error',
+        prune_unreachable: bool = False
+    ):
+        """
+        Initialize the renderer.
+        
+        Args:
+            flows_dir: Directory containing the flow JSON files
+            flow_cache: Cache of parsed flow files (defaults to the process-wide cache)
+            render_cache: Optional on-disk cache of rendered flows
+            strip_metadata: Default metadata strip mode for flows that don't set one
+            prune_orphan_metadata: Default for removing metadata of blocks not in Actions
+            graph_check: What to do with graph errors: 'error' (raise FlowGraphError),
+                'warn' (log them) or 'off'
+            prune_unreachable: Default for removing actions not reachable from StartAction
+        
+        Raises:
+            FileNotFoundError: If flows_dir doesn't exist
+            ValueError: If strip_metadata or graph_check is not a valid mode
+        """
+        if not flows_dir.exists():
+            raise FileNotFoundError(f"Flows directory not found: {flows_dir}")
+        
+        self.flows_dir = flows_dir
+        self.flow_cache = flow_cache or get_flow_cache()
+        self.render_cache = render_cache
+        self.strip_metadata = validate_strip_mode(strip_metadata)
+        self.prune_orphan_metadata = prune_orphan_metadata
+        self.graph_check = validate_graph_check(graph_check)
+        self.prune_unreachable = prune_unreachable
+    
+    def _render_options(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Resolve the post-processing options of a flow.
+        
+        Only options that differ from a plain render are included, so flows
+        without them keep their existing render cache entries.
+        """
+        options: Dict[str, Any] = {}
+        
+        strip_mode = validate_strip_mode(config.get('strip_metadata', self.strip_metadata))
+        if strip_mode != 'none':
+            options['strip_metadata'] = strip_mode
+        
+        if config.get('prune_orphan_metadata', self.prune_orphan_metadata):
+            options['prune_orphan_metadata'] = True
+        
+        if config.get('prune_unreachable', self.prune_unreachable):
+            options['prune_unreachable'] = True
+        
+        return options
+    
+    def render_flow(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Render a single flow. Safe to call from worker threads.
+        
+        Args:
+            config: Flow configuration dictionary
+        
+        Returns:
+            Rendered flow dictionary
+        
+        Raises:
+            FileNotFoundError: If flow file doesn't exist
+            ValueError: If the flow's render options are invalid
+        """
+        flow_path = self.flows_dir / config['filename']
+        
+        if not flow_path.exists():
+            raise FileNotFoundError(f"Flow file not found: {flow_path}")
+        
+        parameter_updates = config.get('parameter_updates') or {}
+        options = self._render_options(config)
+        
+        cached = None
+        if self.render_cache:
+            flow_hash = RenderCache.hash_file(flow_path)
+            updates_hash = RenderCache.hash_updates(parameter_updates, options)
+            cached = self.render_cache.get(flow_hash, updates_hash)
+        
+        if cached:
+            # Rendered on a previous run from identical inputs
+            content = cached['content']
+            validation = cached['validation']
+            report = cached.get('report', {})
+            logger.info(f"✓ {config['name']}: Loaded from render cache")
+        else:
+            content, validation, report = self._render(config, flow_path, parameter_updates, options)
+            if self.render_cache:
+                self.render_cache.put(flow_hash, updates_hash, content, validation, report)
+        
+        if validation.get('failed_updates', 0) > 0:
+            logger.warning(
+                f"Failed to update {validation['failed_updates']} blocks in {config['name']}"
+            )
+            logger.warning(f"Failed identifiers: {validation['failed_identifiers']}")
+        
+        self._check_graph(config, report.get('graph', {}))
+        
+        return {
+            'name': config['name'],
+            'type': config['type'],
+            'filename': config['filename'],
+            'content': content,
+            'validation': validation,
+            'report': report,
+            'cached': bool(cached)
+        }
+    
+    def _check_graph(self, config: Dict[str, Any], graph: Dict[str, Any]) -> None:
+        """
+        Log or raise the graph issues of a rendered flow.
+        
+        Raises:
+            FlowGraphError: If the flow has graph errors and graph_check is 'error'
+        """
+        if self.graph_check == 'off':
+            return
+        
+        for warning in graph.get('warnings', []):
+            logger.warning(f"{config['name']}: {warning['path']}: {warning['message']}")
+        
+        errors = graph.get('errors', [])
+        if errors and self.graph_check == 'error':
+            raise FlowGraphError(config['name'], errors)
+        for error in errors:
+            logger.error(f"{config['name']}: {error['path']}: {error['message']}")
+    
+    def _render(
+        self,
+        config: Dict[str, Any],
+        flow_path: Path,
+        parameter_updates: Dict[str, Any],
+        options: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Parse a flow file, apply its parameter updates and post-process it.
+        
+        Args:
+            config: Flow configuration dictionary
+            flow_path: Path to the flow file
+            parameter_updates: Parameter updates to apply (may be empty)
+            options: Post-processing options from _render_options
+        
+        Returns:
+            Tuple of the rendered flow content as a JSON string, the update
+            summary and the post-processing report
+        """
+        logger.info(f"Loading flow from {flow_path}")
+        
+        flow_content = self.flow_cache.load(flow_path)
+        validation: Dict[str, Any] = {}
+        report: Dict[str, Any] = {}
+        
+        # Check if this flow needs parameter updates
+        if parameter_updates:
+            # Use parameter updates directly (all values are contact attributes)
+            updater = FlowParameterUpdater(flow_content)
+            updater.update_multiple_blocks(parameter_updates)
+            
+            # Validate
+            validation = updater.validate_updates()
+            logger.info(f"✓ {config['name']}: Updated {validation['updated_blocks']} blocks")
+        else:
+            # No updates needed, use flow as-is
+            logger.info(f"✓ {config['name']}: Loaded directly without updates")
+        
+        content = None
+        
+        if options.get('prune_unreachable'):
+            size_before = len(dumps_flow(flow_content).encode('utf-8'))
+            unreachable_report = prune_unreachable(flow_content)
+            content = dumps_flow(flow_content)
+            unreachable_report['bytes_saved'] = size_before - len(content.encode('utf-8'))
+            report['unreachable'] = unreachable_report
+            if unreachable_report['removed']:
+                logger.info(
+                    f"✓ {config['name']}: Removed {len(unreachable_report['removed'])} unreachable actions, "
+                    f"saved {unreachable_report['bytes_saved']} bytes"
+                )
+        
+        # Check the flow as it will be deployed
+        report['graph'] = analyze_flow(flow_content)
+        
+        if options.get('strip_metadata') or options.get('prune_orphan_metadata'):
+            size_before = len((content or dumps_flow(flow_content)).encode('utf-8'))
+            metadata_report = strip_metadata(
+                flow_content,
+                mode=options.get('strip_metadata', 'none'),
+                prune_orphans=options.get('prune_orphan_metadata', False)
+            )
+            content = dumps_flow(flow_content)
+            metadata_report['bytes_saved'] = size_before - len(content.encode('utf-8'))
+            report['metadata'] = metadata_report
+            logger.info(
+                f"✓ {config['name']}: Stripped {metadata_report['mode']} metadata, "
+                f"saved {metadata_report['bytes_saved']} bytes"
+            )
+        
+        return content or dumps_flow(flow_content), validation, report
+    
+    def render_all(
+        self,
+        flow_configs: List[Dict[str, Any]],
+        workers: int = 1
+    ) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """
+        Render flows, yielding results in configuration order.
+        
+        With more than one worker, flows are rendered on a thread pool while
+        results are still yielded in order. The first error in configuration
+        order is raised when its flow is reached, and pending work is cancelled.
+        
+        Args:
+            flow_configs: Flow configuration dictionaries
+            workers: Number of worker threads
+        
+        Yields:
+            Tuples of (flow configuration, rendered flow)
+        """
+        workers = min(workers, len(flow_configs))
+        
+        if workers <= 1:
+            for config in flow_configs:
+                yield config, self.render_flow(config)
+            return
+        
+        logger.info(f"Rendering {len(flow_configs)} flows with {workers} workers")
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.render_flow, config) for config in flow_configs]
+            try:
+                for config, future in zip(flow_configs, futures):
+                    yield config, future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+
+def render_environment(
+    project_root: Path,
+    environment: str,
+    output_dir: Optional[Path] = None,
+    workers: int = 1,
+    use_cache: bool = True,
+    strip_mode: Optional[str] = None,
+    graph_check: Optional[str] = None,
+    resolve_refs: bool = False,
+    instance_arn: Optional[str] = None,
+    region: Optional[str] = None,
+    context: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Load, validate and render every flow config of an environment.
+    
+    Flows are rendered with the settings a synth would use: the config
+    file's, then the CDK context's (see utils.connect_flows.settings).
+    
+    Symbolic resource references in parameter_updates (see
+    utils.connect_flows.resources) are resolved when resolve_refs is set or
+    instance_arn is given. Otherwise flows are rendered with the reference
+    objects left in place and their manifest entries list them under
+    'unresolved_refs', so the output is never mistaken for deployable content.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        environment: Environment name (dev, staging, prod)
+        output_dir: Directory for rendered flows and the manifest (None to skip writing)
+        workers: Number of worker threads per config file
+        use_cache: Whether to use the on-disk render cache
+        strip_mode: Metadata strip mode for configs that don't set one, instead of
+            the 'stripMetadata' context value
+        graph_check: Graph check mode (see utils.connect_flows.graph), instead of
+            the 'flowGraphCheck' context value
+        resolve_refs: Resolve references in each config's instance, found like the
+            stack finds it (see utils.connect_flows.settings.resolve_instance_arn)
+        instance_arn: Instance to resolve references in, instead of looking it up
+        region: AWS region of the instances (None for the default region)
+        context: CDK context values (None to read cdk.json)
+    
+    Returns:
+        Manifest dictionary describing every rendered flow
+    
+    Raises:
+        FileNotFoundError: If the config or flows directory doesn't exist
+        ValueError: If a configuration is invalid or a reference names no resource
+        FlowGraphError: If a flow has graph errors and graph_check is 'error'
+    """
+    config_dir = project_root / 'config' / 'connect_flows' / environment
+    render_cache = get_render_cache(project_root / DEFAULT_CACHE_DIRNAME) if use_cache else None
+    resolve_refs = resolve_refs or instance_arn is not None
+    context = dict(load_context(project_root) if context is None else context)
+    if strip_mode is not None:
+        context['stripMetadata'] = strip_mode
+    if graph_check is not None:
+        context['flowGraphCheck'] = graph_check
+    
+    manifest: Dict[str, Any] = {'environment': environment, 'configs': {}}
+    
+    configs = load_configs(config_dir, workers=workers)
+    
+    for config_filename, config in configs.items():
+        config_path = config_dir / config_filename
+        flow_configs = config.get('flows', [])
+        refs = {
+            flow_config['name']: sorted(
+                f"{ref_type}:{name}" for ref_type, name in find_refs(flow_config.get('parameter_updates') or {})
+            )
+            for flow_config in flow_configs
+        }
+        if resolve_refs and any(refs.values()):
+            arn = instance_arn or resolve_instance_arn(project_root, config, context, region)
+            resolver = get_resource_resolver()
+            flow_configs = [
+                dict(flow_config, parameter_updates=resolver.resolve(flow_config['parameter_updates'], arn))
+                if refs[flow_config['name']] else flow_config
+                for flow_config in flow_configs
+            ]
+            refs = {}
+        elif any(refs.values()):
+            logger.warning(
+                f"{config_filename}: resource references left unresolved; "
+                f"pass --instance-arn or AWS credentials to resolve them"
+            )
+        renderer = FlowRenderer(project_root / 'flows', render_cache=render_cache, **render_options(config, context))
+        entries = []
+        
+        rendered_count = 0
+        try:
+            for flow_config, flow in renderer.render_all(flow_configs, workers):
+                entry = _manifest_entry(flow)
+                entry['unresolved_refs'] = refs.get(flow_config['name'], [])
+                if output_dir:
+                    entry['output'] = _write_flow(output_dir, config_path.stem, flow)
+                entries.append(entry)
+                rendered_count += 1
+        except Exception as e:
+            failed = flow_configs[rendered_count]
+            logger.error(f"Error rendering flow {failed.get('name', 'Unknown')}: {str(e)}")
+            raise
+        
+        manifest['configs'][config_path.name] = {
+            'instance_name': config.get('instance_name'),
+            'flows': entries
+        }
+    
+    if output_dir:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        with open(output_dir / MANIFEST_FILENAME, 'w') as f:
+            json.dump(manifest, f, indent=2)
+    
+    return manifest
+
+
+def _manifest_entry(flow: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the manifest entry for a rendered flow."""
+    content = flow['content'].encode('utf-8')
+    validation = flow['validation']
+    
+    return {
+        'name': flow['name'],
+        'type': flow['type'],
+        'filename': flow['filename'],
+        'sha256': hashlib.sha256(content).hexdigest(),
+        'bytes': len(content),
+        'updated_blocks': validation.get('updated_blocks', 0),
+        'failed_identifiers': validation.get('failed_identifiers', []),
+        'metadata_bytes_saved': flow['report'].get('metadata', {}).get('bytes_saved', 0),
+        'graph_warnings': len(flow['report'].get('graph', {}).get('warnings', [])),
+        'unreachable_removed': flow['report'].get('unreachable', {}).get('removed', []),
+        'unreachable_bytes_saved': flow['report'].get('unreachable', {}).get('bytes_saved', 0),
+        'cached': flow['cached']
+    }
+
+
+def _write_flow(output_dir: Path, config_stem: str, flow: Dict[str, Any]) -> str:
+    """Write rendered flow content and return its path relative to output_dir."""
+    relative = Path(config_stem) / f"{flow['name']}.json"
+    path = output_dir / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(flow['content'])
+    return str(relative)
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Render Amazon Connect flows without CDK.")
+    parser.add_argument('--env', required=True, help="Environment to render (dev, staging, prod)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--output-dir', type=Path, help="Output directory (default: rendered/<env>)")
+    parser.add_argument('--check', action='store_true', help="Render and validate without writing files")
+    parser.add_argument('--workers', type=int, default=1, help="Worker threads per config file")
+    parser.add_argument('--no-cache', action='store_true', help="Bypass the on-disk render cache")
+    parser.add_argument('--strip-metadata', choices=STRIP_MODES,
+                        help="Metadata strip mode for configs that don't set one (default: stripMetadata context)")
+    parser.add_argument('--graph-check', choices=GRAPH_CHECK_MODES,
+                        help="Fail on flow graph errors, only warn about them, or skip the check "
+                             "(default: flowGraphCheck context)")
+    parser.add_argument('--resolve-refs', choices=['auto', 'always', 'never'], default='auto',
+                        help="Resolve resource references (auto: when --instance-arn or AWS credentials are available)")
+    parser.add_argument('--instance-arn', help="Instance to resolve references in, instead of looking up instance_name")
+    parser.add_argument('--region', help="AWS region (default: from the AWS configuration)")
+    parser.add_argument('-c', '--context', action='append', default=[], help="CDK context value as key=value")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Log every flow")
+    args = parser.parse_args()
+    
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    output_dir = None if args.check else (args.output_dir or Path('rendered') / args.env)
+    if args.resolve_refs == 'auto':
+        resolve_refs = args.instance_arn is not None or credentials_available()
+    else:
+        resolve_refs = args.resolve_refs == 'always'
+    
+    try:
+        manifest = render_environment(
+            args.project_root,
+            args.env,
+            output_dir=output_dir,
+            workers=args.workers,
+            use_cache=not args.no_cache,
+            strip_mode=args.strip_metadata,
+            graph_check=args.graph_check,
+            resolve_refs=resolve_refs,
+            instance_arn=args.instance_arn if resolve_refs else None,
+            region=args.region,
+            context=load_context(args.project_root, parse_context(args.context))
+        )
+    except Exception as e:
+        print(f"❌ {args.env}: {str(e)}")
+        sys.exit(1)
+    
+    flows = [flow for config in manifest['configs'].values() for flow in config['flows']]
+    print(f"✅ Rendered {len(flows)} flows from {len(manifest['configs'])} configs for {args.env}")
+    for flow in flows:
+        if flow['metadata_bytes_saved']:
+            print(f"   {flow['name']}: metadata stripped, saved {flow['metadata_bytes_saved']} bytes")
+        if flow['unreachable_removed']:
+            print(
+                f"   {flow['name']}: removed {len(flow['unreachable_removed'])} unreachable actions, "
+                f"saved {flow['unreachable_bytes_saved']} bytes"
+            )
+        if flow['graph_warnings']:
+            print(f"   {flow['name']}: {flow['graph_warnings']} graph warning(s)")
+        if flow['unresolved_refs']:
+            refs = ', '.join(flow['unresolved_refs'])
+            print(f"⚠️  {flow['name']}: unresolved references {refs}, not deployable as rendered")
+    if output_dir:
+        print(f"   Output written to {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+"""
+Persistent on-disk cache of rendered Amazon Connect flow content.
+
+Usage:
+    python -m utils.connect_flows.render_cache stats [--cache-dir .flowcache]
+    python -m utils.connect_flows.render_cache clear [--cache-dir .flowcache]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .serialization import canonical_hash, serializer_id
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRNAME = '.flowcache'
+
+
+class RenderCache:
+    """
+    Stores rendered flow content keyed by (flow file hash, parameter_updates hash).
+    
+    A hit lets the caller skip both parsing the flow file and running
+    FlowParameterUpdater. Bump RENDER_VERSION whenever the rendering logic
+    changes the output for unchanged inputs, so stale entries are ignored.
+    The serialization backend is part of the key as well.
+    
+    Entries read or written in this process are also kept in a size-bounded
+    in-memory LRU, so stacks of other environments rendering the same flow
+    with the same updates don't read the entry from disk again.
+    """
+    
+    RENDER_VERSION = 3
+    DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, cache_dir: Path, max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES):
+        """
+        Initialize the render cache.
+        
+        Args:
+            cache_dir: Root directory of the cache (created on first write)
+            max_memory_bytes: Maximum total content size kept in memory (0 to disable)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.entries_dir = self.cache_dir / 'rendered'
+        self.max_memory_bytes = max_memory_bytes
+        self._memory: 'OrderedDict[Path, Dict[str, Any]]' = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.memory_hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def hash_file(path: Path) -> str:
+        """
+        Hash the raw bytes of a file.
+        
+        Args:
+            path: Path to the file
+        
+        Returns:
+            Hex SHA-256 digest of the file contents
+        """
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    
+    @staticmethod
+    def hash_updates(
+        parameter_updates: Optional[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Hash parameter updates independently of their key order.
+        
+        Args:
+            parameter_updates: Parameter updates from a flow configuration
+            options: Render options that change the output, if any
+        
+        Returns:
+            Hex SHA-256 digest of the canonical JSON form of the updates
+        """
+        if options:
+            return canonical_hash({'parameter_updates': parameter_updates or {}, 'options': options})
+        return canonical_hash(parameter_updates or {})
+    
+    def _entry_path(self, flow_hash: str, updates_hash: str) -> Path:
+        """Get the path of the entry for a (flow hash, updates hash) pair."""
+        version = f"{self.RENDER_VERSION}:{serializer_id()}"
+        key = hashlib.sha256(f"{version}:{flow_hash}:{updates_hash}".encode('utf-8')).hexdigest()
+        return self.entries_dir / key[:2] / f"{key}.json"
+    
+    def get(self, flow_hash: str, updates_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a rendered flow.
+        
+        Args:
+            flow_hash: Hash of the flow file (see hash_file)
+            updates_hash: Hash of the parameter updates (see hash_updates)
+        
+        Returns:
+            Entry with 'content' (rendered JSON string), 'validation' summary
+            and post-processing 'report', or None on a miss. Treat the
+            validation and report as read-only: they may be shared.
+        """
+        entry_path = self._entry_path(flow_hash, updates_hash)
+        
+        with self._lock:
+            entry = self._memory.get(entry_path)
+            if entry is not None:
+                self._memory.move_to_end(entry_path)
+                self.hits += 1
+                self.memory_hits += 1
+                return dict(entry)
+        
+        try:
+            with open(entry_path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable render cache entry {entry_path}: {str(e)}")
+            entry = None
+        
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        
+        if entry is not None:
+            self._remember(entry_path, entry)
+        
+        return entry
+    
+    def _remember(self, entry_path: Path, entry: Dict[str, Any]) -> None:
+        """Keep an entry in memory and evict least recently used entries over the bound."""
+        size = len(entry['content'])
+        
+        with self._lock:
+            previous = self._memory.pop(entry_path, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous['content'])
+            
+            if size > self.max_memory_bytes:
+                return
+            
+            self._memory[entry_path] = entry
+            self._memory_bytes += size
+            
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted['content'])
+    
+    def put(
+        self,
+        flow_hash: str,
+        updates_hash: str,
+        content: str,
+        validation: Optional[Dict[str, Any]] = None,
+        report: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Store a rendered flow.
+        
+        The entry is written to a temporary file and renamed into place, so
+        concurrent synths never observe a partial entry.
+        
+        Args:
+            flow_hash: Hash of the flow file (see hash_file)
+            updates_hash: Hash of the parameter updates (see hash_updates)
+            content: Rendered flow content as a JSON string
+            validation: Update summary from FlowParameterUpdater.validate_updates
+            report: Post-processing report of the render (e.g. metadata bytes saved)
+        """
+        entry_path = self._entry_path(flow_hash, updates_hash)
+        entry = {'content': content, 'validation': validation or {}, 'report': report or {}}
+        self._remember(entry_path, entry)
+        
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=entry_path.parent, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entry, f)
+                os.replace(tmp_name, entry_path)
+            except BaseException:
+                # Don't leave partial entries behind in the cache directory
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            # The cache is an optimization; failing to write it must not fail the synth
+            logger.warning(f"Failed to write render cache entry {entry_path}: {str(e)}")
+    
+    def clear(self) -> int:
+        """
+        Remove every cached entry.
+        
+        Returns:
+            Number of entries removed
+        """
+        removed = len(list(self.entries_dir.rglob('*.json'))) if self.entries_dir.exists() else 0
+        shutil.rmtree(self.entries_dir, ignore_errors=True)
+        
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            self.hits = 0
+            self.memory_hits = 0
+            self.misses = 0
+        
+        return removed
+    
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with hits (of which memory_hits were served from
+            memory) and misses for this process, plus the number and total
+            size of entries on disk
+        """
+        entries = list(self.entries_dir.rglob('*.json')) if self.entries_dir.exists() else []
+        
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'misses': self.misses,
+                'entries': len(entries),
+                'bytes': sum(entry.stat().st_size for entry in entries)
+            }
+
+
+_caches: Dict[Path, RenderCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_render_cache(cache_dir: Path) -> RenderCache:
+    """
+    Get the process-wide render cache for a directory.
+    
+    Stacks sharing a cache directory share one instance, so hit and miss
+    counts cover the whole app.
+    
+    Args:
+        cache_dir: Root directory of the cache
+    
+    Returns:
+        The shared RenderCache for cache_dir
+    """
+    key = Path(cache_dir).resolve()
+    
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RenderCache(key)
+        return _caches[key]
+
+
+def main() -> None:
+    """Command line entry point for inspecting and clearing the cache."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Manage the rendered flow cache.")
+    parser.add_argument('command', choices=['stats', 'clear'])
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=project_root / DEFAULT_CACHE_DIRNAME,
+        help="Cache directory (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    
+    cache = RenderCache(args.cache_dir)
+    
+    if args.command == 'clear':
+        removed = cache.clear()
+        print(f"Removed {removed} cached flows from {args.cache_dir}")
+    else:
+        stats = cache.stats()
+        print(f"{stats['entries']} cached flows ({stats['bytes']} bytes) in {args.cache_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+"""
+Resolution of symbolic Amazon Connect resource references.
+
+parameter_updates can refer to instance resources by name instead of ARN:
+
+    {"block-1": {"QueueId": {"ref": "queue:SalesQueue"}}}
+
+Each reference is replaced by the resource's ARN. The names of one resource
+type are listed with a single paginated sweep per instance, however many
+references there are, and the sweep is shared by every stack in the process.
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Reference type -> (paginated list operation, summary list key)
+REF_TYPES: Dict[str, Tuple[str, str]] = {
+    'queue': ('list_queues', 'QueueSummaryList'),
+    'prompt': ('list_prompts', 'PromptSummaryList'),
+    'flow': ('list_contact_flows', 'ContactFlowSummaryList'),
+    'hours': ('list_hours_of_operations', 'HoursOfOperationSummaryList')
+}
+
+# (reference type, resource name)
+Ref = Tuple[str, str]
+
+
+def _default_client_factory(region: Optional[str]) -> Any:
+    """Create a Connect client; boto3 is only imported when a reference is resolved."""
+    import boto3
+    
+    return boto3.client('connect', region_name=region)
+
+
+def credentials_available() -> bool:
+    """
+    Check whether AWS credentials can be found, without calling any API.
+    
+    Returns:
+        True if boto3 is installed and finds credentials
+    """
+    try:
+        import boto3
+        
+        return boto3.Session().get_credentials() is not None
+    except Exception:
+        return False
+
+
+def parse_ref(value: Any) -> Optional[Ref]:
+    """
+    Parse a symbolic reference.
+    
+    Args:
+        value: Any value from parameter_updates
+    
+    Returns:
+        (type, name) if value is a reference object, None otherwise
+    
+    Raises:
+        ValueError: If value is a reference object with an invalid reference
+    """
+    if not isinstance(value, dict) or list(value) != ['ref']:
+        return None
+    
+    ref_type, _, name = str(value['ref']).partition(':')
+    if ref_type not in REF_TYPES or not name:
+        raise ValueError(
+            f"Invalid resource reference '{value['ref']}'. "
+            f"Use '<type>:<name>' with type one of: {', '.join(REF_TYPES)}"
+        )
+    return ref_type, name
+
+
+def find_refs(value: Any) -> Set[Ref]:
+    """
+    Collect every symbolic reference in a value.
+    
+    Args:
+        value: parameter_updates or any part of them
+    
+    Returns:
+        Set of (type, name) references
+    
+    Raises:
+        ValueError: If a reference is invalid
+    """
+    ref = parse_ref(value)
+    if ref:
+        return {ref}
+    
+    refs: Set[Ref] = set()
+    if isinstance(value, dict):
+        for item in value.values():
+            refs |= find_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            refs |= find_refs(item)
+    return refs
+
+
+def substitute_refs(value: Any, arns: Dict[Ref, str]) -> Any:
+    """
+    Replace symbolic references with ARNs.
+    
+    Args:
+        value: parameter_updates or any part of them
+        arns: ARN of every reference in value
+    
+    Returns:
+        A copy of value with references replaced; value itself is not modified
+    """
+    ref = parse_ref(value)
+    if ref:
+        return arns[ref]
+    if isinstance(value, dict):
+        return {key: substitute_refs(item, arns) for key, item in value.items()}
+    if isinstance(value, list):
+        return [substitute_refs(item, arns) for item in value]
+    return value
+
+
+def _region_of(instance_arn: str) -> Optional[str]:
+    """Get the region of an ARN (arn:partition:service:region:account:resource)."""
+    parts = instance_arn.split(':')
+    return parts[3] if len(parts) > 5 and parts[3] else None
+
+
+class ResourceResolver:
+    """
+    Resolves resource references with one list sweep per instance and type.
+    
+    Sweeps are cached for the life of the resolver. Concurrent callers
+    needing the same sweep wait for it instead of listing again.
+    """
+    
+    def __init__(self, client_factory: Callable[[Optional[str]], Any] = _default_client_factory):
+        """
+        Initialize the resolver.
+        
+        Args:
+            client_factory: Creates a Connect client for a region
+        """
+        self.client_factory = client_factory
+        self._sweeps: Dict[Tuple[str, str], Dict[str, str]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.api_calls = 0
+    
+    def names(self, instance_arn: str, ref_type: str) -> Dict[str, str]:
+        """
+        Get the name to ARN mapping of one resource type of an instance.
+        
+        Args:
+            instance_arn: Connect instance ARN
+            ref_type: One of REF_TYPES
+        
+        Returns:
+            Dictionary of resource name to ARN
+        """
+        key = (instance_arn, ref_type)
+        
+        with self._lock:
+            if key in self._sweeps:
+                return self._sweeps[key]
+            sweep_lock = self._locks.setdefault(key, threading.Lock())
+        
+        with sweep_lock:
+            with self._lock:
+                if key in self._sweeps:
+                    return self._sweeps[key]
+            
+            operation, summary_key = REF_TYPES[ref_type]
+            logger.info(f"Listing {ref_type} resources of {instance_arn}")
+            client = self.client_factory(_region_of(instance_arn))
+            
+            names: Dict[str, str] = {}
+            for page in client.get_paginator(operation).paginate(InstanceId=instance_arn.rsplit('/', 1)[-1]):
+                for summary in page.get(summary_key, []):
+                    if summary.get('Name'):
+                        names[summary['Name']] = summary['Arn']
+            
+            with self._lock:
+                self._sweeps[key] = names
+                self.api_calls += 1
+            return names
+    
+    def resolve(self, parameter_updates: Dict[str, Any], instance_arn: str) -> Dict[str, Any]:
+        """
+        Replace the references in parameter updates with ARNs.
+        
+        Args:
+            parameter_updates: Parameter updates from a flow configuration
+            instance_arn: Connect instance the references belong to
+        
+        Returns:
+            A copy of the updates with references replaced, or the updates
+            themselves if they contain no references
+        
+        Raises:
+            ValueError: If a reference is invalid or names no existing resource
+        """
+        refs = find_refs(parameter_updates)
+        if not refs:
+            return parameter_updates
+        
+        arns: Dict[Ref, str] = {}
+        missing: List[str] = []
+        for ref_type, name in sorted(refs):
+            arn = self.names(instance_arn, ref_type).get(name)
+            if arn is None:
+                missing.append(f"{ref_type}:{name}")
+            else:
+                arns[(ref_type, name)] = arn
+        
+        if missing:
+            raise ValueError(f"Unknown resource references in {instance_arn}: {', '.join(missing)}")
+        
+        resolved: Dict[str, Any] = substitute_refs(parameter_updates, arns)
+        return resolved
+    
+    def clear(self) -> None:
+        """Forget every sweep."""
+        with self._lock:
+            self._sweeps.clear()
+            self._locks.clear()
+
+
+_default_resolver = ResourceResolver()
+
+
+def get_resource_resolver() -> ResourceResolver:
+    """
+    Get the process-wide resolver shared by all stacks.
+    
+    Returns:
+        The shared ResourceResolver instance
+    """
+    return _default_resolver
@@ -0,0 +1,298 @@
+"""
+Schema validation of flow configuration files.
+
+The schema is compiled once, at import, into a tree of check functions.
+Validating a config walks it a single time and collects every error with
+its JSON path. validate_config_text also reports the line and column of
+each error in the source text.
+"""
+import json
+from json.decoder import scanstring  # type: ignore[attr-defined]
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+
+from .minify import STRIP_MODES
+
+FLOW_TYPES = (
+    'CONTACT_FLOW',
+    'CUSTOMER_QUEUE',
+    'CUSTOMER_HOLD',
+    'CUSTOMER_WHISPER',
+    'AGENT_HOLD',
+    'AGENT_WHISPER',
+    'TRANSFER',
+    'QUEUE_TRANSFER'
+)
+
+_RENDER_OPTIONS = {
+    'strip_metadata': {'enum': STRIP_MODES},
+    'prune_orphan_metadata': {'type': 'boolean'},
+    'prune_unreachable': {'type': 'boolean'}
+}
+
+FLOW_SCHEMA: Dict[str, Any] = {
+    'type': 'object',
+    'required': ['filename', 'name', 'type'],
+    'properties': dict({
+        'filename': {'type': 'string', 'min_length': 1},
+        'name': {'type': 'string', 'min_length': 1},
+        'type': {'enum': FLOW_TYPES},
+        'description': {'type': 'string'},
+        'parameter_updates': {'type': 'object'},
+        'shard': {'type': 'integer', 'minimum': 0}
+    }, **_RENDER_OPTIONS)
+}
+
+CONFIG_SCHEMA: Dict[str, Any] = {
+    'type': 'object',
+    'required': ['instance_name', 'flows'],
+    'properties': dict({
+        'instance_name': {'type': 'string', 'min_length': 1},
+        'flows': {'type': 'array', 'items': FLOW_SCHEMA, 'unique_key': 'name'}
+    }, **_RENDER_OPTIONS)
+}
+
+# JSON path as a tuple of object keys and array indices
+JsonPath = Tuple[Union[str, int], ...]
+_Check = Callable[[Any, JsonPath, List[Dict[str, Any]]], None]
+
+_TYPES = {
+    'object': (dict,),
+    'array': (list,),
+    'string': (str,),
+    'integer': (int,),
+    'boolean': (bool,)
+}
+
+
+class ConfigValidationError(ValueError):
+    """
+    Raised when a configuration file has schema errors.
+    
+    The message lists every error; the errors themselves are in 'errors'.
+    """
+    
+    def __init__(self, filename: str, errors: List[Dict[str, Any]]):
+        self.filename = filename
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} error(s) in {filename}:\n" + '\n'.join(format_error(filename, e) for e in errors)
+        )
+
+
+def format_path(path: JsonPath) -> str:
+    """
+    Format a JSON path, e.g. $.flows[0].type.
+    
+    Args:
+        path: Tuple of object keys and array indices
+    
+    Returns:
+        JSONPath-style string
+    """
+    return '$' + ''.join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path)
+
+
+def format_error(filename: str, error: Dict[str, Any]) -> str:
+    """
+    Format an error as 'file:line:column: path: message'.
+    
+    Args:
+        filename: Name of the config file
+        error: Error from validate_config or validate_config_text
+    
+    Returns:
+        One-line description of the error
+    """
+    location = filename
+    if error.get('line'):
+        location = f"{filename}:{error['line']}:{error['column']}"
+    return f"{location}: {error['path']}: {error['message']}"
+
+
+def _error(errors: List[Dict[str, Any]], path: JsonPath, message: str) -> None:
+    errors.append({'path': format_path(path), 'path_parts': path, 'message': message})
+
+
+def _compile(schema: Dict[str, Any]) -> _Check:
+    """Compile a schema node into a check function."""
+    checks: List[_Check] = []
+    
+    if 'enum' in schema:
+        allowed = frozenset(schema['enum'])
+        expected = ', '.join(schema['enum'])
+        
+        def check_enum(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            if not isinstance(value, str) or value not in allowed:
+                _error(errors, path, f"Invalid value {json.dumps(value)}. Must be one of: {expected}")
+        checks.append(check_enum)
+    
+    if 'min_length' in schema:
+        min_length = schema['min_length']
+        
+        def check_length(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            if len(value) < min_length:
+                _error(errors, path, "Must not be empty")
+        checks.append(check_length)
+    
+    if 'minimum' in schema:
+        minimum = schema['minimum']
+        
+        def check_minimum(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            if value < minimum:
+                _error(errors, path, f"Must be at least {minimum}")
+        checks.append(check_minimum)
+    
+    if 'required' in schema:
+        required = tuple(schema['required'])
+        
+        def check_required(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            for key in required:
+                if key not in value:
+                    _error(errors, path, f"Missing required key '{key}'")
+        checks.append(check_required)
+    
+    if 'properties' in schema:
+        properties = {key: _compile(sub_schema) for key, sub_schema in schema['properties'].items()}
+        
+        def check_properties(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            for key, item in value.items():
+                check = properties.get(key)
+                if check is not None:
+                    check(item, path + (key,), errors)
+        checks.append(check_properties)
+    
+    if 'items' in schema:
+        check_item = _compile(schema['items'])
+        unique_key = schema.get('unique_key')
+        
+        def check_items(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            seen: Dict[Any, int] = {}
+            for idx, item in enumerate(value):
+                check_item(item, path + (idx,), errors)
+                if unique_key and isinstance(item, dict) and isinstance(item.get(unique_key), str):
+                    first = seen.setdefault(item[unique_key], idx)
+                    if first != idx:
+                        _error(errors, path + (idx, unique_key),
+                               f"Duplicate {unique_key} '{item[unique_key]}' (first used at index {first})")
+        checks.append(check_items)
+    
+    if 'type' in schema:
+        type_name = schema['type']
+        types = _TYPES[type_name]
+        
+        def check(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+            # bool is an int subclass, but true is not a valid integer here
+            if not isinstance(value, types) or (isinstance(value, bool) and type_name != 'boolean'):
+                _error(errors, path, f"Must be {'an' if type_name[0] in 'aeiou' else 'a'} {type_name}")
+                return
+            for sub_check in checks:
+                sub_check(value, path, errors)
+        return check
+    
+    def check_all(value: Any, path: JsonPath, errors: List[Dict[str, Any]]) -> None:
+        for sub_check in checks:
+            sub_check(value, path, errors)
+    return check_all
+
+
+_check_config = _compile(CONFIG_SCHEMA)
+
+
+def validate_config(config: Any) -> List[Dict[str, Any]]:
+    """
+    Validate a parsed configuration.
+    
+    Args:
+        config: Parsed configuration file
+    
+    Returns:
+        Every error with its JSON 'path' and 'message'
+    """
+    errors: List[Dict[str, Any]] = []
+    _check_config(config, (), errors)
+    for error in errors:
+        del error['path_parts']
+    return errors
+
+
+def _value_offsets(text: str) -> Dict[JsonPath, int]:
+    """Map the JSON path of every value in valid JSON text to its offset."""
+    decoder = json.JSONDecoder()
+    offsets: Dict[JsonPath, int] = {}
+    whitespace = ' \t\n\r'
+    
+    def skip(pos: int) -> int:
+        while pos < len(text) and text[pos] in whitespace:
+            pos += 1
+        return pos
+    
+    def value(pos: int, path: JsonPath) -> int:
+        pos = skip(pos)
+        offsets[path] = pos
+        
+        if text[pos] == '{':
+            pos = skip(pos + 1)
+            if text[pos] == '}':
+                return pos + 1
+            while True:
+                key, pos = scanstring(text, skip(pos) + 1)
+                pos = value(skip(pos) + 1, path + (key,))
+                pos = skip(pos)
+                if text[pos] == '}':
+                    return pos + 1
+                pos += 1
+        
+        if text[pos] == '[':
+            pos = skip(pos + 1)
+            if text[pos] == ']':
+                return pos + 1
+            idx = 0
+            while True:
+                pos = skip(value(pos, path + (idx,)))
+                idx += 1
+                if text[pos] == ']':
+                    return pos + 1
+                pos += 1
+        
+        _, end = decoder.raw_decode(text, pos)
+        return end
+    
+    value(0, ())
+    return offsets
+
+
+def _line_column(text: str, offset: int) -> Tuple[int, int]:
+    """Convert an offset to a 1-based line and column."""
+    line = text.count('\n', 0, offset) + 1
+    return line, offset - (text.rfind('\n', 0, offset) + 1) + 1
+
+
+def validate_config_text(text: str) -> Tuple[Optional[Any], List[Dict[str, Any]]]:
+    """
+    Parse and validate the text of a configuration file.
+    
+    Args:
+        text: Contents of the configuration file
+    
+    Returns:
+        Tuple of the parsed configuration (None if it is not valid JSON) and
+        every error with its JSON 'path', 'message', 'line' and 'column'
+    """
+    try:
+        config = json.loads(text)
+    except json.JSONDecodeError as e:
+        return None, [{'path': '$', 'message': f"Invalid JSON: {e.msg}", 'line': e.lineno, 'column': e.colno}]
+    
+    errors: List[Dict[str, Any]] = []
+    _check_config(config, (), errors)
+    
+    if errors:
+        # Positions are only needed to report errors, so valid files skip this pass
+        offsets = _value_offsets(text)
+        for error in errors:
+            path = error.pop('path_parts')
+            while path not in offsets:
+                path = path[:-1]
+            error['line'], error['column'] = _line_column(text, offsets[path])
+    
+    return config, errors
@@ -0,0 +1,100 @@
+"""
+Canonical JSON serialization for Amazon Connect flow content.
+
+Flow content is serialized with sorted keys, compact separators and UTF-8
+characters left unescaped, so the same content always produces the same
+bytes and can be hashed and cached. orjson is used when it is installed,
+with the standard library as the fallback. The two only differ in how they
+write floats in exponent notation (1e16 vs 1e+16), so the backend is part
+of the render cache key. Set CONNECT_FLOWS_JSON_BACKEND to 'stdlib' or 'orjson' to force a
+backend ('auto' by default).
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+BACKEND_ENV_VAR = 'CONNECT_FLOWS_JSON_BACKEND'
+
+# Bump when the canonical form changes, so cached output is not reused
+CANONICAL_VERSION = 1
+
+
+def get_backend() -> str:
+    """
+    Get the serialization backend in use.
+    
+    Returns:
+        'orjson' or 'stdlib'
+    
+    Raises:
+        ValueError: If the backend requested through the environment is unknown or unavailable
+    """
+    requested = os.getenv(BACKEND_ENV_VAR, 'auto').lower()
+    
+    if requested == 'auto':
+        return 'orjson' if orjson is not None else 'stdlib'
+    
+    if requested == 'orjson' and orjson is None:
+        raise ValueError(f"{BACKEND_ENV_VAR}=orjson but orjson is not installed")
+    
+    if requested not in ('orjson', 'stdlib'):
+        raise ValueError(f"Invalid {BACKEND_ENV_VAR} '{requested}'. Must be one of: auto, orjson, stdlib")
+    
+    return requested
+
+
+def dumps_flow(content: Any, indent: Optional[int] = None) -> str:
+    """
+    Serialize flow content to canonical JSON.
+    
+    Args:
+        content: Flow content (or any JSON-compatible value)
+        indent: Number of spaces for indentation (None for compact)
+    
+    Returns:
+        The canonical JSON string
+    """
+    if get_backend() == 'orjson' and indent in (None, 2):
+        option = orjson.OPT_SORT_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(content, option=option).decode('utf-8')
+        except (TypeError, orjson.JSONEncodeError) as e:
+            # e.g. integers beyond 64 bits, which the stdlib handles
+            logger.debug(f"orjson could not serialize flow content, using stdlib: {str(e)}")
+    
+    if indent is None:
+        return json.dumps(content, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    
+    return json.dumps(content, sort_keys=True, indent=indent, ensure_ascii=False)
+
+
+def serializer_id() -> str:
+    """
+    Identify the canonical form produced by the current backend.
+    
+    Returns:
+        A string that changes whenever serialized output may change
+    """
+    return f"{get_backend()}-v{CANONICAL_VERSION}"
+
+
+def canonical_hash(content: Any) -> str:
+    """
+    Hash a JSON-compatible value independently of key order and formatting.
+    
+    Args:
+        content: JSON-compatible value
+    
+    Returns:
+        Hex SHA-256 digest of its canonical JSON form
+    """
+    return hashlib.sha256(dumps_flow(content).encode('utf-8')).hexdigest()
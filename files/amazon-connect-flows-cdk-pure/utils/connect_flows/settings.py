@@ -0,0 +1,154 @@
+"""
+Flow settings shared by ConnectFlowStack and the commands that call Connect directly.
+
+Render options and the Connect instance of a config come from the config file
+and CDK context. Keeping their precedence in one place means fast deploy and
+drift detection render the same content as a synth, for the same instance.
+Commands read the context the way the CDK CLI does: cdk.json first, then
+`-c key=value` arguments.
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .instances import CACHE_FILENAME as INSTANCE_CACHE_FILENAME
+from .instances import DEFAULT_TTL_SECONDS, get_instance_lookup
+from .render_cache import DEFAULT_CACHE_DIRNAME
+
+logger = logging.getLogger(__name__)
+
+# Context values the helpers below read
+CONTEXT_KEYS = (
+    'stripMetadata',
+    'pruneOrphanMetadata',
+    'pruneUnreachable',
+    'flowGraphCheck',
+    'connectInstanceName',
+    'connectInstanceArn',
+    'instanceCacheTtl',
+    'flowCacheDir'
+)
+
+
+def parse_context(values: List[str]) -> Dict[str, str]:
+    """
+    Parse key=value context arguments like `cdk -c`.
+    
+    Args:
+        values: Arguments as given on the command line
+    
+    Returns:
+        Context values keyed by name
+    
+    Raises:
+        ValueError: If an argument has no '='
+    """
+    context = {}
+    for value in values:
+        key, separator, item = value.partition('=')
+        if not separator:
+            raise ValueError(f"Context must be key=value: {value}")
+        context[key] = item
+    return context
+
+
+def load_context(project_root: Path, overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Get the CDK context a synth of the project would see.
+    
+    Args:
+        project_root: Directory containing cdk.json
+        overrides: Values given with -c, which win over cdk.json
+    
+    Returns:
+        Context values keyed by name
+    
+    Raises:
+        ValueError: If cdk.json is not valid JSON
+    """
+    context: Dict[str, Any] = {}
+    cdk_json = project_root / 'cdk.json'
+    if cdk_json.exists():
+        try:
+            context.update(json.loads(cdk_json.read_text(encoding='utf-8')).get('context', {}))
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in {cdk_json}: {str(e)}")
+    context.update(overrides or {})
+    return context
+
+
+def _flag(value: Any) -> bool:
+    """Interpret a context flag, which is a string when given with -c."""
+    return str(value).lower() == 'true'
+
+
+def render_options(config: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the FlowRenderer options of a config.
+    
+    Config file values win over context values; flows can still override
+    them with their own settings.
+    
+    Args:
+        config: Flow configuration file contents
+        context: CDK context values
+    
+    Returns:
+        Keyword arguments for FlowRenderer: 'strip_metadata',
+        'prune_orphan_metadata', 'prune_unreachable' and 'graph_check'
+    """
+    return {
+        'strip_metadata': config.get('strip_metadata') or context.get('stripMetadata') or 'none',
+        'prune_orphan_metadata': config.get('prune_orphan_metadata', _flag(context.get('pruneOrphanMetadata'))),
+        'prune_unreachable': config.get('prune_unreachable', _flag(context.get('pruneUnreachable'))),
+        'graph_check': context.get('flowGraphCheck') or 'error'
+    }
+
+
+def instance_name(config: Dict[str, Any], context: Dict[str, Any]) -> Optional[str]:
+    """Get the instance alias of a config; the 'connectInstanceName' context value wins."""
+    return context.get('connectInstanceName') or config.get('instance_name')
+
+
+def resolve_instance_arn(
+    project_root: Path,
+    config: Dict[str, Any],
+    context: Dict[str, Any],
+    region: Optional[str] = None,
+    account: Optional[str] = None
+) -> str:
+    """
+    Get the ARN of a config's Connect instance.
+    
+    The 'connectInstanceArn' context value is used as-is when set. Otherwise
+    the alias is resolved with the shared instance lookup, cached in
+    <flowCacheDir>/instances.json for 'instanceCacheTtl' seconds (default one
+    day, 0 to always call the API).
+    
+    Args:
+        project_root: Project root directory holding the cache directory
+        config: Flow configuration file contents
+        context: CDK context values
+        region: AWS region of the instance (None for the default region)
+        account: AWS account, used to keep accounts apart in the cache
+    
+    Returns:
+        The instance ARN
+    
+    Raises:
+        ValueError: If no alias is configured or no instance has it
+    """
+    override = context.get('connectInstanceArn')
+    if override:
+        return str(override)
+    
+    alias = instance_name(config, context)
+    if not alias:
+        raise ValueError("No instance_name configured; set connectInstanceName or connectInstanceArn")
+    
+    cache_dir = context.get('flowCacheDir') or project_root / DEFAULT_CACHE_DIRNAME
+    ttl = context.get('instanceCacheTtl')
+    ttl = DEFAULT_TTL_SECONDS if ttl is None else float(ttl)
+    lookup = get_instance_lookup(Path(cache_dir) / INSTANCE_CACHE_FILENAME, ttl)
+    return lookup.lookup(alias, region, account)
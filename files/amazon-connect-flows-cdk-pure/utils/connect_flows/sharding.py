@@ -0,0 +1,150 @@
+"""
+Grouping of rendered flows into shards that fit CloudFormation template limits.
+
+Each flow adds one CfnContactFlow and one exported CfnOutput to a template.
+CloudFormation allows 1 MB per template, 500 resources and 200 outputs, so
+shards are bounded by estimated template bytes and by flow count, with
+headroom below each limit.
+
+A flow's shard depends on its name alone: a stable hash of the name picks
+one of a fixed number of shards (jump consistent hashing), unless the flow
+is pinned with the 'shard' config key. Editing, growing, reordering or
+removing flows never moves other flows, so their construct IDs, ARNs and
+export names are stable. A shard that outgrows the size budget is reported
+instead of spilling flows into the next one; pin new flows to a new index to
+add capacity. Changing the shard count moves flows, so it is fixed for the
+life of a stack.
+"""
+import hashlib
+import json
+import logging
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_TEMPLATE_BYTES = 1024 * 1024
+MAX_OUTPUTS = 200
+
+DEFAULT_SHARD_BYTES = 800 * 1024
+DEFAULT_FLOWS_PER_SHARD = 180
+
+# Template bytes of a CfnContactFlow and its CfnOutput, excluding the content
+FLOW_OVERHEAD_BYTES = 1024
+
+
+def estimate_flow_bytes(content: str) -> int:
+    """
+    Estimate the template bytes a rendered flow adds.
+    
+    The content is embedded in the template as a JSON string, so quotes and
+    backslashes are escaped.
+    
+    Args:
+        content: Rendered flow content
+    
+    Returns:
+        Estimated template size contribution in bytes
+    """
+    return len(json.dumps(content)) + FLOW_OVERHEAD_BYTES
+
+
+def shard_for(name: str, shard_count: int) -> int:
+    """
+    Get the shard of a flow from its name.
+    
+    Uses jump consistent hashing (Lamping and Veach) over a SHA-256 of the
+    name, so the result is the same in every process and on every platform.
+    
+    Args:
+        name: Flow name
+        shard_count: Number of shards
+    
+    Returns:
+        Shard index in [0, shard_count)
+    """
+    key = int.from_bytes(hashlib.sha256(name.encode('utf-8')).digest()[:8], 'big')
+    bucket, jump = -1, 0
+    while jump < shard_count:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) % 2 ** 64
+        jump = int((bucket + 1) * (2 ** 31 / ((key >> 33) + 1)))
+    return bucket
+
+
+def plan_shards(
+    flows: List[Dict[str, Any]],
+    shard_count: int,
+    max_bytes: int = DEFAULT_SHARD_BYTES,
+    max_flows: int = DEFAULT_FLOWS_PER_SHARD
+) -> List[List[str]]:
+    """
+    Assign flows to shards.
+    
+    Args:
+        flows: Dictionaries with the flow 'name', estimated 'bytes' and an
+            optional pinned 'shard' index, in configuration order
+        shard_count: Number of shards unpinned flows are hashed into
+        max_bytes: Estimated template bytes allowed per shard
+        max_flows: Flows allowed per shard
+    
+    Returns:
+        Flow names per shard index, in configuration order. Shards may be
+        empty; pins above shard_count add shards.
+    
+    Raises:
+        ValueError: If the bounds or a pin are invalid, or a shard exceeds a
+            CloudFormation template limit
+    """
+    if shard_count <= 0 or max_bytes <= 0 or max_flows <= 0:
+        raise ValueError("shard_count, max_bytes and max_flows must be positive")
+    
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(shard_count)]
+    
+    for flow in flows:
+        pinned: Optional[int] = flow.get('shard')
+        if pinned is None:
+            index = shard_for(flow['name'], shard_count)
+        elif isinstance(pinned, bool) or not isinstance(pinned, int) or pinned < 0:
+            raise ValueError(f"Invalid shard '{pinned}' for flow {flow['name']}")
+        else:
+            index = pinned
+        while len(shards) <= index:
+            shards.append([])
+        shards[index].append(flow)
+    
+    for index, shard in enumerate(shards):
+        exceeded = check_template_limits(shard)
+        if exceeded:
+            raise ValueError(
+                f"Shard {index} would exceed CloudFormation limits ({'; '.join(exceeded)}). "
+                f"Pin some of its flows to a new shard index with the 'shard' config key"
+            )
+        size = sum(flow['bytes'] for flow in shard)
+        if size > max_bytes or len(shard) > max_flows:
+            logger.warning(
+                f"Shard {index} holds {len(shard)} flows and {size} estimated bytes, over the budget of "
+                f"{max_flows} flows and {max_bytes} bytes; pin new flows to a new shard index"
+            )
+    
+    return [[flow['name'] for flow in shard] for shard in shards]
+
+
+def check_template_limits(flows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Check whether flows fit in a single template.
+    
+    Args:
+        flows: Dictionaries with the flow 'name' and estimated 'bytes'
+    
+    Returns:
+        Descriptions of the CloudFormation limits the flows would exceed
+    """
+    exceeded = []
+    total_bytes = sum(flow['bytes'] for flow in flows)
+    
+    if total_bytes > MAX_TEMPLATE_BYTES:
+        exceeded.append(f"estimated template size {total_bytes} bytes exceeds {MAX_TEMPLATE_BYTES}")
+    if len(flows) > MAX_OUTPUTS:
+        exceeded.append(f"{len(flows)} outputs exceed {MAX_OUTPUTS}")
+    
+    return exceeded
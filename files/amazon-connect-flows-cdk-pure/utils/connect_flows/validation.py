@@ -0,0 +1,451 @@
+"""
+Validation of config and flow files, with a result cache and a process pool.
+
+Results are cached in .flowcache/validation.json by file stamp and content
+hash, so only new or changed files are parsed again. The cache is keyed by
+the source of the validation rules as well, so changing a rule revalidates
+everything.
+
+Usage:
+    python -m utils.connect_flows.validation [configs] [flows] [--workers 4] [--format json|junit]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from .graph import analyze_flow
+from .render_cache import DEFAULT_CACHE_DIRNAME
+from .resources import find_refs
+from .schema import format_error, validate_config_text
+
+logger = logging.getLogger(__name__)
+
+KINDS = ('configs', 'flows')
+FORMATS = ('text', 'json', 'junit')
+
+CACHE_FILENAME = 'validation.json'
+
+# Modules whose source defines the validation rules
+RULE_MODULES = ('schema.py', 'validation.py', 'minify.py', 'graph.py', 'resources.py')
+
+
+def rules_hash() -> str:
+    """
+    Hash the source of the validation rules.
+    
+    Returns:
+        Hex SHA-256 digest over RULE_MODULES
+    """
+    digest = hashlib.sha256()
+    for module in RULE_MODULES:
+        digest.update((Path(__file__).parent / module).read_bytes())
+    return digest.hexdigest()
+
+
+def _error(message: str, line: Optional[int] = None, column: Optional[int] = None) -> Dict[str, Any]:
+    error: Dict[str, Any] = {'path': '$', 'message': message}
+    if line:
+        error['line'], error['column'] = line, column
+    return error
+
+
+def validate_config_source(text: str) -> Dict[str, Any]:
+    """
+    Validate the text of a configuration file.
+    
+    Args:
+        text: Contents of the configuration file
+    
+    Returns:
+        Result with 'errors', 'warnings' and the flow filenames the config
+        'references'; malformed resource references are errors as well
+    """
+    config, errors = validate_config_text(text)
+    
+    references = []
+    if isinstance(config, dict) and isinstance(config.get('flows'), list):
+        references = sorted({
+            flow['filename'] for flow in config['flows']
+            if isinstance(flow, dict) and isinstance(flow.get('filename'), str)
+        })
+        for idx, flow in enumerate(config['flows']):
+            try:
+                find_refs(flow.get('parameter_updates') if isinstance(flow, dict) else None)
+            except ValueError as e:
+                errors.append({'path': f"$.flows[{idx}].parameter_updates", 'message': str(e)})
+    
+    return {'errors': errors, 'warnings': [], 'references': references}
+
+
+def validate_flow_source(text: str) -> Dict[str, Any]:
+    """
+    Validate the text of a flow file.
+    
+    Args:
+        text: Contents of the flow file
+    
+    Returns:
+        Result with 'errors' and 'warnings', including the graph checks of
+        utils.connect_flows.graph
+    """
+    try:
+        flow = json.loads(text)
+    except json.JSONDecodeError as e:
+        return {'errors': [_error(f"Invalid JSON: {e.msg}", e.lineno, e.colno)], 'warnings': []}
+    
+    errors = []
+    warnings = []
+    
+    if not isinstance(flow, dict):
+        errors.append(_error("Must be an object"))
+    else:
+        if 'Actions' not in flow:
+            errors.append(_error("Missing 'Actions' key"))
+        if 'Version' not in flow:
+            warnings.append(_error("Missing 'Version' key (optional but recommended)"))
+        if isinstance(flow.get('Actions'), list):
+            graph = analyze_flow(flow)
+            errors.extend(graph['errors'])
+            warnings.extend(graph['warnings'])
+    
+    return {'errors': errors, 'warnings': warnings}
+
+
+_VALIDATORS = {
+    'configs': validate_config_source,
+    'flows': validate_flow_source
+}
+
+
+def _validate_file(task: Tuple[str, str]) -> Tuple[str, Dict[str, Any]]:
+    """Validate one file; runs in worker processes, so it only takes and returns plain data."""
+    kind, path = task
+    data = Path(path).read_bytes()
+    
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        result = {'errors': [_error(f"Not valid UTF-8: {str(e)}")], 'warnings': []}
+    else:
+        result = _VALIDATORS[kind](text)
+    
+    return hashlib.sha256(data).hexdigest(), result
+
+
+class ValidationCache:
+    """
+    Validation results keyed by relative file path.
+    
+    An entry is reused when the file's (mtime_ns, size) stamp is unchanged,
+    or when its content hash is unchanged (e.g. after a git checkout).
+    """
+    
+    def __init__(self, cache_path: Path):
+        """
+        Initialize the cache and load existing entries.
+        
+        Args:
+            cache_path: Path of the cache file
+        """
+        self.cache_path = cache_path
+        self.rules = rules_hash()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.changed = False
+        
+        try:
+            with open(cache_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get('rules') == self.rules:
+                self.entries = cached.get('entries', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable validation cache {cache_path}: {str(e)}")
+    
+    def get(self, key: str, stamp: List[int], path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Look up the result of a file.
+        
+        Args:
+            key: Relative path of the file
+            stamp: Current [mtime_ns, size] of the file
+            path: Path of the file, hashed when only the stamp changed
+        
+        Returns:
+            Cached result, or None if the file must be validated
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        
+        if entry['stamp'] != stamp:
+            if entry['size'] != stamp[1] or hashlib.sha256(path.read_bytes()).hexdigest() != entry['sha256']:
+                return None
+            entry['stamp'] = stamp
+            self.changed = True
+        
+        result: Dict[str, Any] = entry['result']
+        return result
+    
+    def put(self, key: str, kind: str, stamp: List[int], sha256: str, result: Dict[str, Any]) -> None:
+        """Store the result of a file."""
+        self.entries[key] = {'kind': kind, 'stamp': stamp, 'size': stamp[1], 'sha256': sha256, 'result': result}
+        self.changed = True
+    
+    def prune(self, kinds: Sequence[str], keep: Sequence[str]) -> None:
+        """Remove entries of the given kinds whose files are no longer validated."""
+        keep_keys = set(keep)
+        for key in [key for key, entry in self.entries.items() if entry['kind'] in kinds and key not in keep_keys]:
+            del self.entries[key]
+            self.changed = True
+    
+    def save(self) -> None:
+        """Write the cache file if anything changed."""
+        if not self.changed:
+            return
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'rules': self.rules, 'entries': self.entries}, f)
+            os.replace(tmp_name, self.cache_path)
+            self.changed = False
+        except OSError as e:
+            # The cache is an optimization; failing to write it must not fail validation
+            logger.warning(f"Failed to write validation cache {self.cache_path}: {str(e)}")
+
+
+def find_files(project_root: Path, kinds: Sequence[str]) -> List[Tuple[str, Path]]:
+    """
+    Find the files to validate.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        kinds: Kinds of files to find ('configs', 'flows')
+    
+    Returns:
+        (kind, path) pairs, sorted within each kind
+    """
+    roots = {'configs': project_root / 'config' / 'connect_flows', 'flows': project_root / 'flows'}
+    return [(kind, path) for kind in kinds for path in sorted(roots[kind].rglob('*.json'))]
+
+
+def validate_files(
+    project_root: Path,
+    files: List[Tuple[str, Path]],
+    workers: int = 1,
+    cache: Optional[ValidationCache] = None
+) -> List[Dict[str, Any]]:
+    """
+    Validate files, skipping those with a cached result.
+    
+    Args:
+        project_root: Project root, used to name files in results
+        files: (kind, path) pairs from find_files
+        workers: Number of worker processes (1 validates in this process)
+        cache: Optional result cache
+    
+    Returns:
+        One result per file, in input order, with 'file', 'kind', 'valid',
+        'errors', 'warnings', 'cached' and, for configs, 'references'
+    
+    Raises:
+        ValueError: If workers is not positive
+    """
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    
+    results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+    stamps = []
+    pending = []
+    
+    for idx, (kind, path) in enumerate(files):
+        key = path.relative_to(project_root).as_posix()
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        stamps.append(stamp)
+        
+        cached = cache.get(key, stamp, path) if cache else None
+        if cached is not None:
+            results[idx] = dict(cached, file=key, kind=kind, cached=True)
+        else:
+            pending.append(idx)
+    
+    tasks = [(files[idx][0], str(files[idx][1])) for idx in pending]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            outcomes = list(executor.map(_validate_file, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        outcomes = [_validate_file(task) for task in tasks]
+    
+    for idx, (sha256, result) in zip(pending, outcomes):
+        kind, path = files[idx]
+        key = path.relative_to(project_root).as_posix()
+        result['valid'] = not result['errors']
+        if cache:
+            cache.put(key, kind, stamps[idx], sha256, result)
+        results[idx] = dict(result, file=key, kind=kind, cached=False)
+    
+    return [result for result in results if result is not None]
+
+
+def check_references(project_root: Path, results: List[Dict[str, Any]]) -> None:
+    """
+    Report config entries whose flow file doesn't exist.
+    
+    Uses the references recorded while validating configs, so no file is
+    parsed again. Results are updated in place.
+    
+    Args:
+        project_root: Directory containing flows/
+        results: Results from validate_files
+    """
+    flows_dir = project_root / 'flows'
+    for result in results:
+        for filename in result.get('references', []):
+            if not (flows_dir / filename).is_file():
+                result['errors'] = result['errors'] + [_error(f"Flow file not found: flows/{filename}")]
+                result['valid'] = False
+
+
+def run_validation(
+    project_root: Path,
+    kinds: Sequence[str] = KINDS,
+    workers: int = 1,
+    use_cache: bool = True
+) -> List[Dict[str, Any]]:
+    """
+    Find, validate and cross-check the files of a project.
+    
+    Args:
+        project_root: Directory containing flows/ and config/
+        kinds: Kinds of files to validate ('configs', 'flows')
+        workers: Number of worker processes
+        use_cache: Whether to use the result cache
+    
+    Returns:
+        One result per file (see validate_files)
+    """
+    cache = ValidationCache(project_root / DEFAULT_CACHE_DIRNAME / CACHE_FILENAME) if use_cache else None
+    files = find_files(project_root, kinds)
+    
+    results = validate_files(project_root, files, workers, cache)
+    if set(kinds) == set(KINDS):
+        check_references(project_root, results)
+    
+    if cache:
+        cache.prune(kinds, [result['file'] for result in results])
+        cache.save()
+    
+    return results
+
+
+def to_junit(results: List[Dict[str, Any]]) -> str:
+    """
+    Format results as a JUnit XML report, one test case per file.
+    
+    Args:
+        results: Results from run_validation
+    
+    Returns:
+        JUnit XML document
+    """
+    suites = ET.Element('testsuites')
+    
+    for kind in KINDS:
+        kind_results = [result for result in results if result['kind'] == kind]
+        if not kind_results:
+            continue
+        suite = ET.SubElement(suites, 'testsuite', {
+            'name': kind,
+            'tests': str(len(kind_results)),
+            'failures': str(sum(not result['valid'] for result in kind_results))
+        })
+        for result in kind_results:
+            case = ET.SubElement(suite, 'testcase', {'classname': kind, 'name': result['file']})
+            if result['errors']:
+                messages = [format_error(result['file'], error) for error in result['errors']]
+                failure = ET.SubElement(case, 'failure', {'message': messages[0]})
+                failure.text = '\n'.join(messages)
+    
+    return ET.tostring(suites, encoding='unicode')
+
+
+def print_text(results: List[Dict[str, Any]]) -> None:
+    """Print results in the scripts' human-readable format."""
+    for result in results:
+        for error in result['errors']:
+            print(f"❌ {format_error(result['file'], error)}")
+        for warning in result['warnings']:
+            print(f"⚠️  {format_error(result['file'], warning)}")
+        if result['valid']:
+            print(f"✅ {result['file']}: Valid{' (cached)' if result['cached'] else ''}")
+
+
+def main(argv: Optional[List[str]] = None, default_kinds: Sequence[str] = KINDS) -> int:
+    """
+    Command line entry point shared by the validation scripts.
+    
+    Args:
+        argv: Command line arguments (default: sys.argv)
+        default_kinds: Kinds of files to validate when none are given
+    
+    Returns:
+        Exit code: 0 if every file is valid, 1 otherwise
+    """
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Validate flow configs and flow files.")
+    parser.add_argument('kinds', nargs='*', help=f"Kinds of files to validate: {', '.join(KINDS)}")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes (default: %(default)s)")
+    parser.add_argument('--no-cache', action='store_true', help="Validate every file, ignoring cached results")
+    parser.add_argument('--format', choices=FORMATS, default='text')
+    parser.add_argument('--output', type=Path, help="Write the JSON or JUnit report to a file instead of stdout")
+    args = parser.parse_args(argv)
+    
+    unknown = [kind for kind in args.kinds if kind not in KINDS]
+    if unknown:
+        parser.error(f"unknown kinds: {', '.join(unknown)}")
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    kinds = [kind for kind in KINDS if kind in (args.kinds or default_kinds)]
+    results = run_validation(args.project_root, kinds, args.workers, not args.no_cache)
+    valid = bool(results) and all(result['valid'] for result in results)
+    
+    if args.format == 'text':
+        print(f"Validating {len(results)} files ({', '.join(kinds)})...\n")
+        print_text(results)
+        print()
+        if not results:
+            print("❌ No files found")
+        elif valid:
+            cached = sum(result['cached'] for result in results)
+            print(f"✅ All files are valid ({cached} unchanged since the last run)")
+        else:
+            print("❌ Some files have errors")
+    else:
+        if args.format == 'json':
+            report = json.dumps({'valid': valid, 'results': results}, indent=2)
+        else:
+            report = to_junit(results)
+        if args.output:
+            args.output.write_text(report)
+        else:
+            print(report)
+    
+    return 0 if valid else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+Watch flow files and configs and re-render only the flows that changed.
+
+Configs and parsed flow files stay in memory between polls. A changed flow
+file re-renders the flows that use it (found through the dependency index);
+a changed config re-renders only the flow entries whose settings changed.
+Flows are rendered with the settings a synth would use, including the
+context from cdk.json and -c; editing cdk.json re-renders every flow.
+
+Usage:
+    python -m utils.connect_flows.watch --env dev [--env prod] [--interval 0.2] [-c pruneUnreachable=true]
+"""
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Set, Tuple
+
+from .config_loader import ConfigurationLoader
+from .dependency_index import DependencyIndex
+from .flow_cache import FlowCache
+from .minify import STRIP_MODES
+from .render import FlowRenderer
+from .resources import find_refs
+from .serialization import canonical_hash
+from .settings import load_context, parse_context, render_options
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.2
+
+# (config key '<env>/<config filename>', flow name)
+_FlowKey = Tuple[str, str]
+
+
+class FlowWatcher:
+    """
+    Polls the project for changes and re-renders the affected flows.
+    
+    Each poll returns one result per re-rendered or removed flow, with the
+    'environment', 'config', 'flow' name, 'status' ('ok', 'warning', 'error'
+    or 'removed'), a 'message' and the render time in 'ms'. Config files
+    that fail validation produce one 'error' result with no flow name.
+    """
+    
+    def __init__(
+        self,
+        project_root: Path,
+        environments: Optional[List[str]] = None,
+        strip_mode: Optional[str] = None,
+        overrides: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the watcher. The first poll renders every flow.
+        
+        Args:
+            project_root: Directory containing flows/ and config/
+            environments: Environments to watch (default: all)
+            strip_mode: Metadata strip mode for configs that don't set one, instead
+                of the 'stripMetadata' context value
+            overrides: Context values given with -c, which win over cdk.json
+        """
+        self.project_root = Path(project_root)
+        self.flows_dir = self.project_root / 'flows'
+        self.config_root = self.project_root / 'config' / 'connect_flows'
+        self.environments = environments
+        self.overrides = dict(overrides or {})
+        if strip_mode is not None:
+            self.overrides['stripMetadata'] = strip_mode
+        self.context: Dict[str, Any] = {}
+        self._context_stamp: Optional[Tuple[int, int]] = None
+        self.index = DependencyIndex(self.project_root)
+        # A private cache, so parsed flows stay in memory for the whole session
+        self.flow_cache = FlowCache()
+        self._configs: Dict[str, Dict[str, Any]] = {}
+        self._entry_hashes: Dict[_FlowKey, str] = {}
+        self._flow_stamps: Dict[str, Optional[Tuple[int, int]]] = {}
+        self._started = False
+    
+    def _flow_stamp(self, filename: str) -> Optional[Tuple[int, int]]:
+        """Get the (mtime_ns, size) of a flow file, or None if it is missing."""
+        try:
+            stat = (self.flows_dir / filename).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _entry_hash(self, config: Dict[str, Any], flow_config: Dict[str, Any]) -> str:
+        """Hash a flow entry together with the config settings that change its output."""
+        return canonical_hash({'flow': flow_config, 'options': render_options(config, self.context)})
+    
+    def _reload_context(self) -> bool:
+        """Reload the context if cdk.json changed; returns True when it did."""
+        cdk_json = self.project_root / 'cdk.json'
+        try:
+            stat = cdk_json.stat()
+            stamp: Optional[Tuple[int, int]] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if self._started and stamp == self._context_stamp:
+            return False
+        self._context_stamp = stamp
+        self.context = load_context(self.project_root, self.overrides)
+        return True
+    
+    def _split(self, key: str) -> Tuple[str, str]:
+        """Split a config key into environment and config filename."""
+        environment, _, config_filename = key.partition('/')
+        return environment, config_filename
+    
+    def _reload_config(self, key: str, results: List[Dict[str, Any]], pending: Set[_FlowKey]) -> None:
+        """Reload a changed config and queue its changed flow entries."""
+        environment, config_filename = self._split(key)
+        config_path = self.config_root / environment / config_filename
+        
+        if not config_path.exists():
+            for flow_key in [flow_key for flow_key in self._entry_hashes if flow_key[0] == key]:
+                del self._entry_hashes[flow_key]
+                pending.discard(flow_key)
+                results.append(self._result(key, flow_key[1], 'removed', "Config file removed"))
+            self._configs.pop(key, None)
+            return
+        
+        try:
+            config = ConfigurationLoader(config_path.parent).load_config(config_filename)
+        except Exception as e:
+            # Keep the last valid config, so fixing it only re-renders what changed
+            results.append(self._result(key, None, 'error', str(e)))
+            return
+        
+        self._configs[key] = config
+        names = set()
+        
+        for flow_config in config.get('flows', []):
+            flow_key = (key, flow_config['name'])
+            names.add(flow_config['name'])
+            entry_hash = self._entry_hash(config, flow_config)
+            if self._entry_hashes.get(flow_key) != entry_hash:
+                self._entry_hashes[flow_key] = entry_hash
+                pending.add(flow_key)
+            self._flow_stamps.setdefault(flow_config['filename'], self._flow_stamp(flow_config['filename']))
+        
+        for flow_key in [flow_key for flow_key in self._entry_hashes if flow_key[0] == key]:
+            if flow_key[1] not in names:
+                del self._entry_hashes[flow_key]
+                results.append(self._result(key, flow_key[1], 'removed', "Removed from config"))
+    
+    def _changed_flow_files(self) -> List[str]:
+        """Find referenced flow files whose stamp changed since the last poll."""
+        changed = []
+        for filename, stamp in list(self._flow_stamps.items()):
+            current = self._flow_stamp(filename)
+            if current != stamp:
+                self._flow_stamps[filename] = current
+                changed.append(filename)
+        return changed
+    
+    def poll(self) -> List[Dict[str, Any]]:
+        """
+        Check for changes and re-render the affected flows.
+        
+        Returns:
+            Results in config and flow order
+        """
+        results: List[Dict[str, Any]] = []
+        pending: Set[_FlowKey] = set()
+        
+        try:
+            if self._reload_context() and self._started:
+                for flow_key in list(self._entry_hashes):
+                    config = self._configs[flow_key[0]]
+                    flow_config = next(flow for flow in config['flows'] if flow['name'] == flow_key[1])
+                    self._entry_hashes[flow_key] = self._entry_hash(config, flow_config)
+                    pending.add(flow_key)
+        except ValueError as e:
+            # Keep the last valid context until cdk.json is fixed
+            results.append(self._result('/cdk.json', None, 'error', str(e)))
+        
+        changed_configs = self.index.refresh()
+        if not self._started:
+            changed_configs = self.index.configs(self.environments)
+            self._started = True
+        
+        for key in sorted(set(changed_configs)):
+            environment, _ = self._split(key)
+            if self.environments is None or environment in self.environments:
+                self._reload_config(key, results, pending)
+        
+        for filename in self._changed_flow_files():
+            for use in self.index.dependents(filename):
+                key = f"{use['environment']}/{use['config']}"
+                if key in self._configs and (key, use['flow']) in self._entry_hashes:
+                    pending.add((key, use['flow']))
+        
+        for key, flow_name in sorted(pending):
+            results.append(self._render(key, flow_name))
+        
+        return results
+    
+    def _render(self, key: str, flow_name: str) -> Dict[str, Any]:
+        """Render one flow and describe the outcome."""
+        config = self._configs[key]
+        flow_config = next(flow for flow in config['flows'] if flow['name'] == flow_name)
+        start = time.perf_counter()
+        try:
+            renderer = FlowRenderer(self.flows_dir, flow_cache=self.flow_cache, **render_options(config, self.context))
+            flow = renderer.render_flow(flow_config)
+        except Exception as e:
+            return self._result(key, flow_name, 'error', str(e), start)
+        
+        validation = flow['validation']
+        refs = find_refs(flow_config.get('parameter_updates') or {})
+        if refs:
+            return self._result(
+                key, flow_name, 'warning',
+                f"Unresolved references: {', '.join(sorted(f'{kind}:{name}' for kind, name in refs))}", start
+            )
+        if validation.get('failed_updates'):
+            return self._result(
+                key, flow_name, 'warning',
+                f"Failed identifiers: {', '.join(validation['failed_identifiers'])}", start
+            )
+        
+        message = f"{len(flow['content'])} bytes"
+        if validation:
+            message = f"updated {validation['updated_blocks']} blocks, {message}"
+        return self._result(key, flow_name, 'ok', message, start)
+    
+    def _result(
+        self,
+        key: str,
+        flow_name: Optional[str],
+        status: str,
+        message: str,
+        start: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Build a poll result."""
+        environment, config_filename = self._split(key)
+        return {
+            'environment': environment,
+            'config': config_filename,
+            'flow': flow_name,
+            'status': status,
+            'message': message,
+            'ms': (time.perf_counter() - start) * 1000 if start is not None else 0.0
+        }
+    
+    def run(
+        self,
+        callback: Callable[[Dict[str, Any]], None],
+        interval: float = DEFAULT_POLL_INTERVAL,
+        max_polls: Optional[int] = None
+    ) -> None:
+        """
+        Poll until interrupted.
+        
+        Args:
+            callback: Called with every result as soon as its poll finishes
+            interval: Seconds between polls
+            max_polls: Stop after this many polls (default: run forever)
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            for result in self.poll():
+                callback(result)
+            polls += 1
+            time.sleep(interval)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    """
+    Format a watch result as one line.
+    
+    Args:
+        result: Result from FlowWatcher.poll
+    
+    Returns:
+        Human-readable line
+    """
+    icons = {'ok': '✅', 'warning': '⚠️', 'error': '❌', 'removed': '➖'}
+    target = f"{result['environment']}/{result['config']}"
+    if result['flow']:
+        target = f"{target} {result['flow']}"
+    return f"{icons[result['status']]} {target}: {result['message']} ({result['ms']:.1f} ms)"
+
+
+def main() -> None:
+    """Command line entry point."""
+    project_root = Path(__file__).parent.parent.parent
+    
+    parser = argparse.ArgumentParser(description="Re-render flows as their files and configs change.")
+    parser.add_argument('--env', action='append', help="Environment to watch (repeatable, default: all)")
+    parser.add_argument('--project-root', type=Path, default=project_root)
+    parser.add_argument('--interval', type=float, default=DEFAULT_POLL_INTERVAL, help="Seconds between polls")
+    parser.add_argument('--strip-metadata', choices=STRIP_MODES,
+                        help="Metadata strip mode for configs that don't set one (default: stripMetadata context)")
+    parser.add_argument('-c', '--context', action='append', default=[], help="CDK context value as key=value")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    try:
+        overrides = parse_context(args.context)
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+    
+    watcher = FlowWatcher(args.project_root, args.env, args.strip_metadata, overrides)
+    print(f"Watching {args.project_root} (Ctrl+C to stop)")
+    
+    try:
+        watcher.run(lambda result: print(format_result(result), flush=True), args.interval)
+    except KeyboardInterrupt:
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()